@@ -3,14 +3,21 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import copy
+import functools
 import json
 import random
 import mimetypes
+import threading
+import time
 
+from collections import OrderedDict
 from pprint import pformat
 from ansible.module_utils import six
 from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible.module_utils.six.moves import queue
 from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.six.moves.urllib.parse import quote
 from ansible.module_utils.urls import open_url
 from ansible.module_utils.api import basic_auth_argument_spec
 from ansible.module_utils._text import to_native
@@ -331,6 +338,720 @@ class NetAppESeriesModule(object):
         return rc, response
 
 
+def run_concurrently(target, arguments, max_workers=None):
+    """Call target once for each argument tuple using a bounded pool of worker threads.
+
+    :param function target: function to call for each argument tuple.
+    :param list(tuple) arguments: list of argument tuples; each tuple is unpacked as positional arguments for target.
+    :param int max_workers: maximum number of concurrent threads (default: one thread for each argument tuple).
+    :return list: results in the same order as arguments. An exception raised by target is returned in place of its result.
+    """
+    arguments = list(arguments)
+    results = [None] * len(arguments)
+    if max_workers is None or max_workers < 1:
+        max_workers = len(arguments)
+
+    indexes = queue.Queue()
+    for index in range(len(arguments)):
+        indexes.put(index)
+
+    def worker():
+        while True:
+            try:
+                index = indexes.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                results[index] = target(*arguments[index])
+            except Exception as error:
+                results[index] = error
+
+    thread_pool = []
+    for count in range(min(max_workers, len(arguments))):
+        thread = threading.Thread(target=worker)
+        thread_pool.append(thread)
+        thread.start()
+    for thread in thread_pool:
+        thread.join()
+
+    return results
+
+
+def check_concurrency(**concurrency):
+    """Verify that each concurrency option is a positive number.
+
+    :param concurrency: concurrency values keyed by option name.
+    :raise ValueError: when any concurrency is less than one.
+    """
+    invalid = sorted(option for option, value in concurrency.items() if value < 1)
+    if invalid:
+        raise ValueError("Concurrency must be a positive number. %s." % ". ".join("%s [%s]" % (option, concurrency[option]) for option in invalid))
+
+
+def get_list_entry_argument_spec(ansible_options, required=None):
+    """Derive the argument spec for the entries of a list option from the module's argument spec.
+
+    List entries accept the same options as the module but without defaults or requirements so that unspecified entry
+    options fall back to the top-level values (see get_list_entry_options).
+
+    :param dict ansible_options: module argument spec.
+    :param list required: entry options that are required.
+    :return dict: entry argument spec.
+    """
+    options = dict((option, dict((key, value) for key, value in spec.items() if key not in ["default", "required"]))
+                   for option, spec in ansible_options.items())
+    for option in required or []:
+        options[option]["required"] = True
+    return options
+
+
+def get_list_entry_options(params, option, key="name"):
+    """Combine each entry of a list option with the top-level options that the entry does not specify.
+
+    :param dict params: module parameters.
+    :param str option: list option whose entries use get_list_entry_argument_spec.
+    :param str key: entry option whose values must be unique.
+    :return list: options for each entry in list order.
+    :raise ValueError: when entries share the same key value; the message is the comma separated duplicates.
+    """
+    entries = list()
+    for entry in params[option]:
+        options = dict(params)
+        options.update(dict((name, value) for name, value in entry.items() if value is not None))
+        entries.append(options)
+
+    values = [entry[key] for entry in entries]
+    duplicates = sorted(set([value for value in values if values.count(value) > 1]))
+    if duplicates:
+        raise ValueError(", ".join(duplicates))
+    return entries
+
+
+def get_memoize_key(value):
+    """Convert a value into an equivalent hashable value for use as a memoization key.
+
+    Lists and tuples become tuples, dictionaries become tuples of their sorted items and sets become frozensets.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(((get_memoize_key(key), get_memoize_key(entry)) for key, entry in value.items()), key=lambda item: repr(item[0])))
+    if isinstance(value, (list, tuple)):
+        return tuple(get_memoize_key(entry) for entry in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(get_memoize_key(entry) for entry in value)
+    return value
+
+
+def memoize(func=None, maxsize=None):
+    """Memoize the results of an instance method for each distinct set of arguments.
+
+    Results are stored on the instance so each module run has its own cache, and copies are returned so callers may
+    modify them. Exceptions are not cached. When maxsize is specified, the least recently used result is discarded
+    once maxsize results are stored for the method. Use clear_memoized to discard results after changes to the storage
+    system that would alter them.
+
+    Usage: @memoize or @memoize(maxsize=16)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(instance, *args, **kwargs):
+            cache = instance.__dict__.setdefault("_memoized", dict()).setdefault(method.__name__, OrderedDict())
+            key = (get_memoize_key(args), get_memoize_key(kwargs))
+
+            if key in cache:
+                result = cache.pop(key)
+            else:
+                result = method(instance, *args, **kwargs)
+                if maxsize is not None and len(cache) >= maxsize:
+                    cache.popitem(last=False)
+            cache[key] = result
+
+            return copy.deepcopy(result)
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def clear_memoized(instance, *names):
+    """Discard the memoized results of an instance.
+
+    The results are replaced rather than modified so a copy of the instance (copy.copy) that is cleared no longer
+    shares memoized results with the original.
+
+    :param object instance: instance whose memoized results are discarded.
+    :param str names: names of the memoized methods to clear (default: all memoized methods).
+    """
+    cache = instance.__dict__.get("_memoized", dict())
+    instance.__dict__["_memoized"] = dict((name, results) for name, results in cache.items() if names and name not in names)
+
+
+class DeferredFailure(Exception):
+    """Failure raised by DeferredFailureModule.fail_json in place of exiting the module."""
+    def __init__(self, msg, **kwargs):
+        super(DeferredFailure, self).__init__(msg)
+        self.msg = msg
+        self.kwargs = kwargs
+
+
+class DeferredFailureModule(object):
+    """Wrap an AnsibleModule so that fail_json raises DeferredFailure instead of exiting.
+
+    This allows the work for a single item of a batch, often run by run_concurrently worker threads, to fail without
+    terminating the remaining items. All other attributes are passed through to the wrapped module.
+    """
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def fail_json(self, msg, **kwargs):
+        raise DeferredFailure(msg, **kwargs)
+
+
+class ObjectResolver(object):
+    """Resolve storage system objects (volumes, thin volumes and storage pools) by name.
+
+    A lookup first asks the storage system graph for the object reference (graph/xpath-filter) and then retrieves only
+    that object. When the graph filter is unavailable, the object collection is retrieved once and indexed by name for
+    the remaining lookups; call invalidate after making changes so the index is rebuilt.
+
+    :param function request: function that issues a request for a storage-systems relative path and returns the
+                             tuple (status code, response). Failures must raise an exception.
+    :param str ssid: storage system identifier.
+    """
+    OBJECT_TYPES = {"volume": ("volumes", "/volume[label='%s']/volumeRef"),
+                    "thin_volume": ("thin-volumes", "/thinVolume[label='%s']/volumeRef"),
+                    "storage_pool": ("storage-pools", "/volumeGroup[label='%s']/volumeGroupRef")}
+
+    def __init__(self, request, ssid):
+        self.request = request
+        self.ssid = ssid
+        self.indexes = dict()
+        self.xpath_filter_available = True
+        self.lock = threading.Lock()
+
+    def resolve(self, object_type, name):
+        """Retrieve the object definition for the object type with the specified name.
+
+        :param str object_type: type of object (see OBJECT_TYPES).
+        :param str name: object name.
+        :return dict: object definition or None when no object has the name.
+        """
+        collection, xpath = self.OBJECT_TYPES[object_type]
+        if self.xpath_filter_available and object_type not in self.indexes and "'" not in name:
+            try:
+                rc, references = self.request("storage-systems/%s/graph/xpath-filter?query=%s" % (self.ssid, quote(xpath % name)))
+                if not isinstance(references, list) or not all(isinstance(reference, six.string_types) for reference in references):
+                    raise ValueError("Unexpected graph filter response.")
+            except Exception:
+                self.xpath_filter_available = False
+            else:
+                if not references:
+                    return None
+                rc, definition = self.request("storage-systems/%s/%s/%s" % (self.ssid, collection, references[0]))
+                return definition
+
+        return self.get_index(object_type).get(name)
+
+    def get_index(self, object_type):
+        """Retrieve the name index for the object type, retrieving the object collection when it is not indexed."""
+        with self.lock:
+            if object_type not in self.indexes:
+                collection, xpath = self.OBJECT_TYPES[object_type]
+                rc, definitions = self.request("storage-systems/%s/%s" % (self.ssid, collection))
+                self.indexes[object_type] = dict((definition["name"], definition) for definition in definitions)
+            return self.indexes[object_type]
+
+    def invalidate(self, object_type=None):
+        """Discard the name index for the object type or, when object_type is None, all name indexes."""
+        with self.lock:
+            if object_type is None:
+                self.indexes = dict()
+            else:
+                self.indexes.pop(object_type, None)
+
+
+class VolumeProgressTracker(object):
+    """Track the long-lived operations (initialization, expansion, etc) of any number of volumes.
+
+    Waits are driven by the storage system's event long-poll (events?lastKnown=<eventNumber>&wait=1) so changes are
+    noticed as soon as the storage system reports them, and getLongLivedOpsProgress is then retrieved once for all
+    watched volumes. Adaptive polling is used when the events endpoint is unavailable.
+    """
+    MIN_POLL_INTERVAL_SEC = 1
+    MAX_POLL_INTERVAL_SEC = 5
+
+    def __init__(self, instance):
+        """
+        :param NetAppESeriesModule instance: module instance used to issue requests to the storage system.
+        """
+        self.instance = instance
+        self.volumes = dict()
+        self.last_known_event = None
+        self.events_available = True
+
+    def watch(self, volume):
+        """Add a volume to the watched volumes.
+
+        :param dict volume: volume or thin volume definition containing id and, optionally, storageVolumeRef.
+        """
+        references = set([volume["id"]])
+        if volume.get("storageVolumeRef"):
+            references.add(volume["storageVolumeRef"])
+        self.volumes[volume["id"]] = references
+
+    def unwatch(self, volume_id):
+        """Remove a volume from the watched volumes."""
+        self.volumes.pop(volume_id, None)
+
+    def get_progress(self):
+        """Retrieve the long-lived operation progress for every watched volume with a single request.
+
+        :return dict: volume id keyed dictionaries containing action and percent_complete. The action is complete when
+        no operation is in progress for the volume.
+        """
+        rc, operations = self.instance.request("storage-systems/%s/symbol/getLongLivedOpsProgress" % self.instance.ssid, log_request=False)
+
+        volume_ids = dict((reference, volume_id) for volume_id, references in self.volumes.items() for reference in references)
+        progress = dict((volume_id, dict(action="complete", percent_complete=None)) for volume_id in self.volumes.keys())
+        for operation in operations["longLivedOpsProgress"]:
+            if operation["volAction"] is not None:
+                for key in operation.keys():
+                    if isinstance(operation[key], dict) and operation[key].get("volumeRef") in volume_ids:
+                        progress[volume_ids[operation[key]["volumeRef"]]] = dict(action=operation["volAction"],
+                                                                                 percent_complete=operation[key].get("percentComplete"))
+        return progress
+
+    def wait_for_event(self, interval):
+        """Wait up to interval seconds, returning as soon as the storage system reports a new event.
+
+        :param int interval: maximum duration in seconds.
+        :return int: number of seconds accounted for by the wait.
+        """
+        for second in range(interval):
+            if self.events_available:
+                start = time.time()
+                try:
+                    if self.last_known_event is None:
+                        rc, events = self.instance.request("storage-systems/%s/events" % self.instance.ssid, log_request=False)
+                        self.last_known_event = max([int(event["eventNumber"]) for event in events] + [0])
+
+                    rc, events = self.instance.request("storage-systems/%s/events?lastKnown=%s&wait=1" % (self.instance.ssid, self.last_known_event),
+                                                       log_request=False)
+                    event_numbers = [int(event["eventNumber"]) for event in events if int(event["eventNumber"]) > self.last_known_event]
+                    if event_numbers:
+                        self.last_known_event = max(event_numbers)
+                        return second + 1
+
+                    remaining = 1 - (time.time() - start)
+                    if remaining > 0:
+                        time.sleep(remaining)
+                    continue
+                except Exception as error:
+                    self.instance.module.log("Storage system events are unavailable, falling back to polling. Error [%s]." % to_native(error))
+                    self.events_available = False
+
+            time.sleep(interval - second)
+            break
+        return interval
+
+    def wait(self, timeout=None):
+        """Wait until the long-lived operations for every watched volume are complete.
+
+        The progress is retrieved after every new event or, when nothing has been reported, at intervals that grow
+        from MIN_POLL_INTERVAL_SEC to MAX_POLL_INTERVAL_SEC while the progress remains unchanged.
+
+        :param int timeout: maximum duration in seconds; waits indefinitely when None.
+        :return dict: the last progress retrieved (see get_progress). Operations may remain incomplete when timeout expires.
+        """
+        elapsed = 0
+        interval = self.MIN_POLL_INTERVAL_SEC
+        previous_progress = None
+        while True:
+            progress = self.get_progress()
+            incomplete = dict((volume_id, entry) for volume_id, entry in progress.items() if entry["action"] != "complete")
+            if not incomplete or (timeout is not None and elapsed >= timeout):
+                return progress
+
+            for volume_id, entry in incomplete.items():
+                self.instance.module.log("Volume operation, %s, is %s%% complete. Volume [%s]." % (entry["action"], entry["percent_complete"], volume_id))
+
+            interval = self.MIN_POLL_INTERVAL_SEC if progress != previous_progress else min(interval * 2, self.MAX_POLL_INTERVAL_SEC)
+            previous_progress = progress
+            elapsed += self.wait_for_event(interval)
+
+
+class StoragePoolProgressTracker(object):
+    """Track the long-running operations (expansion, raid level migration, etc) of any number of storage pools.
+
+    The action progress of every watched storage pool is retrieved at intervals that grow from MIN_POLL_INTERVAL_SEC
+    to MAX_POLL_INTERVAL_SEC while the progress remains unchanged, and the percentage complete and estimated time to
+    completion of each storage pool's actions are aggregated.
+    """
+    MIN_POLL_INTERVAL_SEC = 1
+    MAX_POLL_INTERVAL_SEC = 30
+
+    def __init__(self, instance):
+        """
+        :param NetAppESeriesModule instance: module instance used to issue requests to the storage system.
+        """
+        self.instance = instance
+        self.storage_pools = dict()
+
+    def watch(self, storage_pool_id, volumes=None, actions=None):
+        """Add a storage pool to the watched storage pools.
+
+        :param str storage_pool_id: storage pool identifier.
+        :param set volumes: volume references whose actions are tracked (default: all volumes in the storage pool).
+        :param list actions: actions that are tracked, for example remappingDce (default: all actions).
+        """
+        self.storage_pools[storage_pool_id] = dict(volumes=set(volumes) if volumes is not None else None,
+                                                   actions=set(actions) if actions is not None else None)
+
+    def unwatch(self, storage_pool_id):
+        """Remove a storage pool from the watched storage pools."""
+        self.storage_pools.pop(storage_pool_id, None)
+
+    def get_storage_pool_progress(self, storage_pool_id):
+        """Retrieve the progress of the actions in progress for a watched storage pool.
+
+        :return dict: in_progress, actions, percent_complete (least complete action) and estimated_time_to_completion
+                      (latest completing action in minutes). Progress that cannot be retrieved is reported as complete.
+        """
+        criteria = self.storage_pools[storage_pool_id]
+        rc, actions_resp = self.instance.request("storage-systems/%s/storage-pools/%s/action-progress" % (self.instance.ssid, storage_pool_id),
+                                                 ignore_errors=True, log_request=False)
+        actions = list()
+        if rc == 200:
+            for action in actions_resp:
+                if action["currentAction"] == "none":
+                    continue
+                if criteria["volumes"] is not None and action["volumeRef"] not in criteria["volumes"]:
+                    continue
+                if criteria["actions"] is not None and action["currentAction"] not in criteria["actions"]:
+                    continue
+                actions.append(dict(volume_ref=action["volumeRef"], action=action["currentAction"],
+                                    percent_complete=action.get("progressPercentage"),
+                                    estimated_time_to_completion=action.get("estimatedTimeToCompletion")))
+        else:
+            self.instance.module.log("Failed to retrieve storage pool action progress. Pool [%s]. Array [%s]." % (storage_pool_id, self.instance.ssid))
+
+        percentages = [action["percent_complete"] for action in actions if action["percent_complete"] is not None]
+        estimates = [action["estimated_time_to_completion"] for action in actions if action["estimated_time_to_completion"] is not None]
+        return dict(in_progress=bool(actions), actions=actions, percent_complete=min(percentages) if percentages else None,
+                    estimated_time_to_completion=max(estimates) if estimates else 0)
+
+    def get_progress(self):
+        """Retrieve the progress of every watched storage pool.
+
+        :return dict: storage pool id keyed progress (see get_storage_pool_progress).
+        """
+        return dict((storage_pool_id, self.get_storage_pool_progress(storage_pool_id)) for storage_pool_id in self.storage_pools.keys())
+
+    @staticmethod
+    def aggregate(progress):
+        """Aggregate the progress of several storage pools.
+
+        :param dict progress: storage pool id keyed progress from get_progress.
+        :return dict: in_progress (storage pools with actions in progress), percent_complete (least complete storage pool)
+                      and estimated_time_to_completion (latest completing storage pool in minutes).
+        """
+        in_progress = [entry for entry in progress.values() if entry["in_progress"]]
+        percentages = [entry["percent_complete"] for entry in in_progress if entry["percent_complete"] is not None]
+        return dict(in_progress=len(in_progress), percent_complete=min(percentages) if percentages else None,
+                    estimated_time_to_completion=max([entry["estimated_time_to_completion"] for entry in in_progress] + [0]))
+
+    def wait(self, timeout=None):
+        """Wait until the actions for every watched storage pool are complete.
+
+        :param int timeout: maximum duration in seconds; waits indefinitely when None.
+        :return dict: the last progress retrieved (see get_progress). Actions may remain in progress when timeout expires.
+        """
+        elapsed = 0
+        interval = self.MIN_POLL_INTERVAL_SEC
+        previous_progress = None
+        while True:
+            progress = self.get_progress()
+            summary = self.aggregate(progress)
+            if not summary["in_progress"] or (timeout is not None and elapsed >= timeout):
+                return progress
+
+            self.instance.module.log("%s storage pool operations are in progress. Least complete [%s%%]. Estimated time to completion [%s minutes]."
+                                     % (summary["in_progress"], summary["percent_complete"], summary["estimated_time_to_completion"]))
+
+            interval = self.MIN_POLL_INTERVAL_SEC if progress != previous_progress else min(interval * 2, self.MAX_POLL_INTERVAL_SEC)
+            if timeout is not None:
+                interval = max(min(interval, timeout - elapsed), 1)
+            previous_progress = progress
+            time.sleep(interval)
+            elapsed += interval
+
+
+class DriveIndex(object):
+    """Index a drive inventory by the attributes used to plan storage pools and report facts.
+
+    The drives are grouped once by media type, interface type, volume group, security and data assurance capability,
+    availability, status and usable capacity so queries are lookups rather than scans of the drive inventory. Query
+    results keep the inventory order.
+    """
+    ATTRIBUTES = ["media_type", "interface_type", "volume_group", "hot_spare", "fde_capable", "fde_enabled",
+                  "da_capable", "available", "optimal", "usable_capacity"]
+
+    def __init__(self, drives):
+        """
+        :param list drives: drive inventory as returned by storage-systems/{id}/drives or the storage system graph.
+        """
+        self.drives = drives
+        self.drives_by_id = dict((drive["id"], drive) for drive in drives)
+        self.groups = dict((attribute, dict()) for attribute in self.ATTRIBUTES)
+        for drive in drives:
+            for attribute, value in self.get_drive_attributes(drive).items():
+                self.groups[attribute].setdefault(value, list()).append(drive)
+
+    @staticmethod
+    def get_drive_attributes(drive):
+        """Determine the indexed attribute values of a drive."""
+        return dict(media_type=drive["driveMediaType"],
+                    interface_type=drive["phyDriveType"],
+                    volume_group=drive["currentVolumeGroupRef"],
+                    hot_spare=drive["hotSpare"],
+                    fde_capable=bool(drive.get("fdeCapable")),
+                    fde_enabled=bool(drive.get("fdeEnabled")),
+                    da_capable=bool((drive.get("protectionInformationCapabilities") or {}).get("protectionInformationCapable")),
+                    available=drive["available"],
+                    optimal=drive["status"] == "optimal",
+                    usable_capacity=int(drive["usableCapacity"]))
+
+    def get_drive(self, drive_id):
+        """Retrieve the drive definition for the drive identifier or None when there is no such drive."""
+        return self.drives_by_id.get(drive_id)
+
+    def get_drives(self, **criteria):
+        """Retrieve the drives matching every criterion.
+
+        :param criteria: indexed attribute values (see ATTRIBUTES), for example available=True, media_type="ssd".
+        :return list: matching drive definitions.
+        """
+        if not criteria:
+            return list(self.drives)
+
+        groups = sorted([self.groups[attribute].get(value, list()) for attribute, value in criteria.items()], key=len)
+        if len(groups) == 1:
+            return list(groups[0])
+
+        drive_ids = set(drive["id"] for drive in groups[1])
+        for group in groups[2:]:
+            drive_ids.intersection_update(drive["id"] for drive in group)
+        return [drive for drive in groups[0] if drive["id"] in drive_ids]
+
+    def get_drive_ids(self, **criteria):
+        """Retrieve the identifiers of the drives matching every criterion (see get_drives)."""
+        return [drive["id"] for drive in self.get_drives(**criteria)]
+
+    def get_available_drive_ids(self, exclude=None):
+        """Retrieve the identifiers of the available, optimal drives that are not excluded.
+
+        :param set exclude: drive identifiers to exclude.
+        """
+        return [drive_id for drive_id in self.get_drive_ids(available=True, optimal=True) if not exclude or drive_id not in exclude]
+
+    def get_volume_group_drives(self, volume_group_ref, include_hot_spares=False):
+        """Retrieve the drives in a volume group.
+
+        :param str volume_group_ref: volume group (storage pool) reference.
+        :param bool include_hot_spares: whether to include hot spares in use by the volume group.
+        """
+        if include_hot_spares:
+            return self.get_drives(volume_group=volume_group_ref)
+        return self.get_drives(volume_group=volume_group_ref, hot_spare=False)
+
+    def get_most_common(self, attribute):
+        """Retrieve the values of an indexed attribute sorted by the most common first.
+
+        :param str attribute: indexed attribute (see ATTRIBUTES).
+        :return list: attribute values; values with the same number of drives are in ascending order.
+        """
+        group = self.groups[attribute]
+        return sorted(sorted(group.keys()), key=lambda value: len(group[value]), reverse=True)
+
+
+class StoragePoolCapacityModel(object):
+    """Estimate storage pool usable capacity from a drive inventory without requests to the storage system.
+
+    The drive inventory is indexed once so any number of candidate drive sets can be evaluated with table lookups.
+    Disk pool capacity follows the storage system's extent and reconstruction reserve calculations; traditional RAID
+    capacity is the data drive capacity and does not include the storage system's metadata overhead.
+    """
+    DEFAULT_DISK_POOL_MINIMUM_DRIVE_COUNT = 11
+    DDP_DRIVE_RESERVED_CAPACITY = 8053063680
+    DDP_EXTENT_SIZE = 536870912
+    DDP_STRIPE_SIZE = 4294967296
+
+    # (maximum drive count, ((maximum extent count, error percent), ...))
+    DDP_ERROR_PERCENT_TABLE = ((36, ((600, 0.40), (1400, 0.35), (6200, 0.20), (50000, 0.15))),
+                               (64, ((600, 0.20), (1400, 0.15), (6200, 0.10), (50000, 0.05))),
+                               (480, ((600, 0.20), (1400, 0.15), (6200, 0.10), (50000, 0.05))))
+
+    # (minimum drive count, reserved drive count) in descending drive count order
+    DDP_RESERVED_DRIVE_COUNT_TABLE = ((256, 8), (192, 7), (128, 6), (64, 4), (32, 3), (12, 2), (11, 1))
+
+    def __init__(self, drives, disk_pool_minimum_drive_count=None):
+        """
+        :param list drives: drive inventory as returned by storage-systems/{id}/drives.
+        :param int disk_pool_minimum_drive_count: storage system's minimum disk pool drive count.
+        """
+        self.disk_pool_minimum_drive_count = disk_pool_minimum_drive_count or self.DEFAULT_DISK_POOL_MINIMUM_DRIVE_COUNT
+        self.available_drives = [drive for drive in drives if drive["available"] and drive["status"] == "optimal"]
+        self.available_drive_capacities = dict((drive["id"], int(drive["usableCapacity"])) for drive in self.available_drives)
+
+    @staticmethod
+    def get_raid_level(raid_level):
+        """Return the raid level the storage system uses in place of raidAll and raid3."""
+        return {"raidAll": "raidDiskPool", "raid3": "raid5"}.get(raid_level, raid_level)
+
+    def get_available_drive_capacities(self, drive_ids=None):
+        """Determine the distinct usable capacities of the available drives.
+
+        :param list drive_ids: drives to consider (default: all available drives).
+        :return list: distinct usable capacities.
+        """
+        if drive_ids:
+            return list(set(self.available_drive_capacities[drive_id] for drive_id in drive_ids if drive_id in self.available_drive_capacities))
+        return list(set(self.available_drive_capacities.values()))
+
+    def is_drive_count_valid(self, raid_level, drive_count):
+        """Determine whether a storage pool can be created with drive_count drives."""
+        raid_level = self.get_raid_level(raid_level)
+        if raid_level == "raidDiskPool":
+            return drive_count >= self.disk_pool_minimum_drive_count
+        if raid_level == "raid0":
+            return drive_count > 0
+        if raid_level == "raid1":
+            return drive_count >= 2 and (drive_count % 2) == 0
+        if raid_level == "raid5":
+            return 3 <= drive_count <= 30
+        if raid_level == "raid6":
+            return 5 <= drive_count <= 30
+        return False
+
+    def get_ddp_error_percent(self, drive_count, extent_count):
+        """Determine the portion of a disk pool reserved for reconstruction.
+
+        :raise ValueError: when the drive or extent count exceeds the error percent table.
+        """
+        for maximum_drive_count, extent_table in self.DDP_ERROR_PERCENT_TABLE:
+            if drive_count <= maximum_drive_count:
+                for maximum_extent_count, error_percent in extent_table:
+                    if extent_count <= maximum_extent_count:
+                        return error_percent
+                break
+        raise ValueError("Drive count exceeded the error percent table.")
+
+    def get_ddp_reserved_drive_count(self, drive_count, reserve_drive_count=None):
+        """Determine the number of drives reserved for reconstruction in a disk pool."""
+        if reserve_drive_count:
+            return reserve_drive_count
+        for minimum_drive_count, reserved_drive_count in self.DDP_RESERVED_DRIVE_COUNT_TABLE:
+            if drive_count >= minimum_drive_count:
+                return reserved_drive_count
+        return 0
+
+    def get_ddp_capacity(self, drive_count, drive_usable_capacity, reserve_drive_count=None):
+        """Determine the usable capacity of a disk pool.
+
+        :param int drive_count: number of drives in the disk pool.
+        :param int drive_usable_capacity: usable capacity of the smallest drive.
+        :param int reserve_drive_count: drives reserved for reconstruction (default: storage system default).
+        :return float: usable capacity in bytes.
+        """
+        drive_data_extents = ((drive_usable_capacity - self.DDP_DRIVE_RESERVED_CAPACITY) / self.DDP_EXTENT_SIZE)
+        maximum_stripe_count = (drive_count * drive_data_extents) / 10
+
+        error_percent = self.get_ddp_error_percent(drive_count, drive_data_extents)
+        error_overhead = (drive_count * drive_data_extents / 10 * error_percent + 10) / 10
+
+        total_stripe_count = maximum_stripe_count - error_overhead
+        stripe_count_per_drive = total_stripe_count / drive_count
+        reserved_stripe_count = self.get_ddp_reserved_drive_count(drive_count, reserve_drive_count) * stripe_count_per_drive
+        available_stripe_count = total_stripe_count - reserved_stripe_count
+
+        return available_stripe_count * self.DDP_STRIPE_SIZE
+
+    def get_capacity(self, raid_level, drive_count, drive_usable_capacity, reserve_drive_count=None):
+        """Determine the usable capacity of a storage pool.
+
+        :return float: usable capacity in bytes.
+        """
+        raid_level = self.get_raid_level(raid_level)
+        if raid_level == "raidDiskPool":
+            return self.get_ddp_capacity(drive_count, drive_usable_capacity, reserve_drive_count)
+
+        data_drive_count = {"raid0": drive_count, "raid1": drive_count // 2, "raid5": drive_count - 1, "raid6": drive_count - 2}
+        return max(data_drive_count.get(raid_level, 0), 0) * drive_usable_capacity
+
+    def evaluate(self, raid_level, drive_sets, existing_drive_count=0, drive_usable_capacity=None, reserve_drive_count=None):
+        """Evaluate the usable capacity of storage pools built from each candidate drive set in a single pass.
+
+        :param str raid_level: storage pool raid level.
+        :param list drive_sets: lists of drive ids.
+        :param int existing_drive_count: drives already in the storage pool when evaluating expansions.
+        :param int drive_usable_capacity: usable drive capacity to use for every drive set (default: smallest available
+                                          drive capacity in each drive set).
+        :param int reserve_drive_count: drives reserved for reconstruction in disk pools.
+        :return list: dictionaries containing drive_count, drive_usable_capacity and usable_capacity for each drive set.
+                      The usable capacity is None when the drive set contains no available drives or exceeds the
+                      disk pool error percent table.
+        """
+        evaluations = list()
+        for drive_set in drive_sets:
+            drive_count = existing_drive_count + len(drive_set)
+            capacity = drive_usable_capacity
+            if capacity is None:
+                capacities = self.get_available_drive_capacities(drive_set)
+                capacity = min(capacities) if capacities else None
+
+            usable_capacity = None
+            if capacity is not None:
+                try:
+                    usable_capacity = self.get_capacity(raid_level, drive_count, capacity, reserve_drive_count)
+                except ValueError:
+                    pass
+            evaluations.append(dict(drive_count=drive_count, drive_usable_capacity=capacity, usable_capacity=usable_capacity))
+        return evaluations
+
+    def plan(self, raid_level, drive_count=None, reserve_drive_count=None):
+        """Determine the usable capacity of a storage pool built from each type of available drive.
+
+        Drives are grouped by media type, interface type and usable capacity.
+
+        :param str raid_level: storage pool raid level.
+        :param int drive_count: number of drives of each type to evaluate (default: all available drives of the type).
+        :param int reserve_drive_count: drives reserved for reconstruction in disk pools.
+        :return list: dictionaries describing each drive type with its available drive count, evaluated drive count
+                      and usable capacity. The usable capacity is None when the drive count is not valid for the raid
+                      level.
+        """
+        drive_types = dict()
+        for drive in self.available_drives:
+            key = (drive["driveMediaType"], drive["phyDriveType"], int(drive["usableCapacity"]))
+            drive_types.update({key: drive_types.get(key, 0) + 1})
+
+        plan = list()
+        for (media_type, interface_type, capacity), available_count in sorted(drive_types.items()):
+            count = drive_count or available_count
+            usable_capacity = None
+            if self.is_drive_count_valid(raid_level, count):
+                try:
+                    usable_capacity = int(self.get_capacity(raid_level, count, capacity, reserve_drive_count))
+                except ValueError:
+                    pass
+            plan.append(dict(drive_media_type=media_type, drive_interface_type=interface_type, drive_usable_capacity=capacity,
+                             available_drive_count=available_count, drive_count=count, usable_capacity=usable_capacity))
+        return plan
+
+
 def create_multipart_formdata(files, fields=None, send_8kb=False):
     """Create the data for a multipart/form request.
 
@@ -95,6 +95,7 @@ import threading
 from time import sleep
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.six.moves import queue
 from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import request
 from ansible.module_utils._text import to_native
 
@@ -118,6 +119,8 @@ class NetAppESeriesDiscover:
     SEARCH_TIMEOUT = 30
     DEFAULT_CONNECTION_TIMEOUT_SEC = 30
     DEFAULT_DISCOVERY_TIMEOUT_SEC = 300
+    MIN_DISCOVERY_POLL_INTERVAL_SEC = 1
+    MAX_DISCOVERY_POLL_INTERVAL_SEC = 5
 
     def __init__(self):
         ansible_options = dict(subnet_mask=dict(type="str", required=True),
@@ -179,22 +182,52 @@ class NetAppESeriesDiscover:
             except Exception as error:
                 pass
 
+    def merge_systems_found(self, worker_systems_found):
+        """Merge the storage systems collected by each worker into systems_found.
+
+        Each worker collects into its own dictionary so no state is shared between threads; dual-controller systems reported by more than one
+        worker have their api urls and addresses combined here.
+        """
+        for systems_found in worker_systems_found:
+            for serial, system in systems_found.items():
+                if serial in self.systems_found:
+                    for key in ["api_urls", "addresses"]:
+                        for value in system[key]:
+                            if value not in self.systems_found[serial][key]:
+                                self.systems_found[serial][key].append(value)
+                else:
+                    self.systems_found.update({serial: system})
+
+    def check_ip_address_worker(self, systems_found, addresses):
+        """Check addresses from the shared queue until it is empty, collecting results in the worker's own systems_found dictionary."""
+        while True:
+            try:
+                address = addresses.get_nowait()
+            except queue.Empty:
+                break
+            self.check_ip_address(systems_found, address)
+
     def no_proxy_discover(self):
         """Discover E-Series storage systems using embedded web services."""
         thread_pool_size = min(multiprocessing.cpu_count() * self.CPU_THREAD_MULTIPLE, self.MAX_THREAD_POOL_SIZE)
         subnet = list(ipaddress.ip_network(u"%s" % self.subnet_mask))
 
-        thread_pool = []
-        search_count = len(subnet)
-        for start in range(0, search_count, thread_pool_size):
-            end = search_count if (search_count - start) < thread_pool_size else start + thread_pool_size
+        addresses = queue.Queue()
+        for address in subnet:
+            addresses.put(address)
 
-            for address in subnet[start:end]:
-                thread = threading.Thread(target=self.check_ip_address, args=(self.systems_found, address))
-                thread_pool.append(thread)
-                thread.start()
-            for thread in thread_pool:
-                thread.join()
+        thread_pool = []
+        worker_systems_found = []
+        for worker in range(min(thread_pool_size, len(subnet))):
+            systems_found = {}
+            worker_systems_found.append(systems_found)
+            thread = threading.Thread(target=self.check_ip_address_worker, args=(systems_found, addresses))
+            thread_pool.append(thread)
+            thread.start()
+        for thread in thread_pool:
+            thread.join()
+
+        self.merge_systems_found(worker_systems_found)
 
     def verify_proxy_service(self):
         """Verify proxy url points to a web services proxy."""
@@ -227,6 +260,34 @@ class NetAppESeriesDiscover:
                                        "proxy_ssid": "",
                                        "proxy_required": False}})
 
+    def process_discovered_system(self, discovered_system, thread_pool, worker_systems_found):
+        """Record a storage system reported by the proxy discovery process.
+
+        Systems with embedded web services are verified in their own thread so verification overlaps the remaining discovery scan. Each thread
+        collects its result in its own dictionary which is appended to worker_systems_found and merged once all threads have completed.
+        """
+        addresses = []
+        for controller in discovered_system["controllers"]:
+            addresses.extend(controller["ipAddresses"])
+
+        # Storage systems with embedded web services.
+        if "https" in discovered_system["supportedManagementPorts"] and self.prefer_embedded:
+
+            systems_found = {}
+            worker_systems_found.append(systems_found)
+            thread = threading.Thread(target=self.test_systems_found,
+                                      args=(systems_found, discovered_system["serialNumber"], discovered_system["label"], addresses))
+            thread_pool.append(thread)
+            thread.start()
+
+        # Storage systems without embedded web services.
+        else:
+            self.systems_found.update({discovered_system["serialNumber"]: {"api_urls": [self.proxy_url],
+                                                                           "label": discovered_system["label"],
+                                                                           "addresses": addresses,
+                                                                           "proxy_ssid": "",
+                                                                           "proxy_required": True}})
+
     def proxy_discover(self):
         """Search for array using it's chassis serial from web services proxy."""
         self.verify_proxy_service()
@@ -238,38 +299,37 @@ class NetAppESeriesDiscover:
                                      data=json.dumps({"startIP": str(subnet[0]), "endIP": str(subnet[-1]),
                                                       "connectionTimeout": self.DEFAULT_CONNECTION_TIMEOUT_SEC}))
 
-            # Wait for discover to complete
+            # Wait for discover to complete while processing partial results as they are reported.
+            thread_pool = []
+            worker_systems_found = []
+            processed_serials = set()
+            poll_interval = self.MIN_DISCOVERY_POLL_INTERVAL_SEC
+            elapsed = 0
             try:
-                for iteration in range(self.DEFAULT_DISCOVERY_TIMEOUT_SEC):
+                while elapsed < self.DEFAULT_DISCOVERY_TIMEOUT_SEC:
                     rc, discovered_systems = request(self.proxy_url + "discovery?requestId=%s" % request_id["requestId"],
                                                      validate_certs=self.proxy_validate_certs,
                                                      force_basic_auth=True, url_username=self.proxy_username, url_password=self.proxy_password)
+
+                    new_systems = [system for system in discovered_systems.get("storageSystems", []) if system["serialNumber"] not in processed_serials]
+                    for discovered_system in new_systems:
+                        processed_serials.add(discovered_system["serialNumber"])
+                        self.process_discovered_system(discovered_system, thread_pool, worker_systems_found)
+
                     if not discovered_systems["discoverProcessRunning"]:
-                        thread_pool = []
-                        for discovered_system in discovered_systems["storageSystems"]:
-                            addresses = []
-                            for controller in discovered_system["controllers"]:
-                                addresses.extend(controller["ipAddresses"])
-
-                            # Storage systems with embedded web services.
-                            if "https" in discovered_system["supportedManagementPorts"] and self.prefer_embedded:
-
-                                thread = threading.Thread(target=self.test_systems_found,
-                                                          args=(self.systems_found, discovered_system["serialNumber"], discovered_system["label"], addresses))
-                                thread_pool.append(thread)
-                                thread.start()
-
-                            # Storage systems without embedded web services.
-                            else:
-                                self.systems_found.update({discovered_system["serialNumber"]: {"api_urls": [self.proxy_url],
-                                                                                               "label": discovered_system["label"],
-                                                                                               "addresses": addresses,
-                                                                                               "proxy_ssid": "",
-                                                                                               "proxy_required": True}})
                         for thread in thread_pool:
                             thread.join()
+                        self.merge_systems_found(worker_systems_found)
                         break
-                    sleep(1)
+
+                    if new_systems:
+                        self.module.log("Discovery in progress. Storage systems found [%s]. Elapsed [%ss]." % (len(processed_serials), elapsed))
+                        poll_interval = self.MIN_DISCOVERY_POLL_INTERVAL_SEC
+                    else:
+                        poll_interval = min(poll_interval * 2, self.MAX_DISCOVERY_POLL_INTERVAL_SEC)
+
+                    sleep(poll_interval)
+                    elapsed += poll_interval
                 else:
                     self.module.fail_json(msg="Timeout waiting for array discovery process. Subnet [%s]" % self.subnet_mask)
             except Exception as error:
@@ -287,11 +347,10 @@ class NetAppESeriesDiscover:
         except Exception as error:
             self.module.fail_json(msg="Failed to ascertain storage systems added to Web Services Proxy.")
 
+        proxy_ssids = dict((system["chassisSerialNumber"], system["id"]) for system in systems)
         for system_key, system_info in self.systems_found.items():
-            if self.systems_found[system_key]["proxy_required"]:
-                for system in systems:
-                    if system_key == system["chassisSerialNumber"]:
-                        self.systems_found[system_key]["proxy_ssid"] = system["id"]
+            if system_info["proxy_required"] and system_key in proxy_ssids:
+                system_info["proxy_ssid"] = proxy_ssids[system_key]
 
     def discover(self):
         """Discover E-Series storage systems."""
@@ -291,7 +291,7 @@ RETURN = """
 """
 
 import re
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, DriveIndex
 try:
     from ansible.module_utils.ansible_release import __version__ as ansible_version
 except ImportError:
@@ -764,6 +764,7 @@ class Facts(NetAppESeriesModule):
                     facts['netapp_hostside_io_interfaces'].append(interface_info)
 
         # Create a dictionary of volume lists keyed by host names
+        drive_index = DriveIndex(array_facts['drive'])
         facts['netapp_volumes_by_initiators'] = dict()
         for mapping in array_facts['storagePoolBundle']['lunMapping']:
             for host in facts['netapp_hosts']:
@@ -846,7 +847,7 @@ class Facts(NetAppESeriesModule):
 
                             # Determine drive count
                             stripe_count = 0
-                            vg_drive_num = sum(1 for d in array_facts['drive'] if d['currentVolumeGroupRef'] == volume['volumeGroupRef'] and not d['hotSpare'])
+                            vg_drive_num = len(drive_index.get_volume_group_drives(volume['volumeGroupRef']))
 
                             if volume['raidLevel'] == "raidDiskPool":
                                 stripe_count = 8
@@ -90,6 +90,36 @@ options:
         type: bool
         required: false
         default: true
+    concurrency:
+        description:
+            - Maximum number of concurrent requests issued to SANtricity Web Services Proxy during each phase of the storage system changes.
+        type: dict
+        required: false
+        suboptions:
+            password:
+                description:
+                    - Maximum number of storage systems that have their admin password state checked and, when required, set concurrently.
+                type: int
+                required: false
+                default: 16
+            add:
+                description:
+                    - Maximum number of storage systems that are added or have their password validated concurrently.
+                type: int
+                required: false
+                default: 8
+            update:
+                description:
+                    - Maximum number of storage systems that are updated concurrently.
+                type: int
+                required: false
+                default: 16
+            remove:
+                description:
+                    - Maximum number of storage systems that are removed concurrently.
+                type: int
+                required: false
+                default: 16
 """
 
 EXAMPLES = """
@@ -150,13 +180,18 @@ msg:
     type: str
     returned: always
     sample: "Storage systems [system1, system2, 1144FG123018, 721716500123, 123540006043, 112123001239] were added."
+system_timings:
+    description: Duration in seconds of each phase performed for each storage system.
+    type: dict
+    returned: on success
+    sample: {"system1": {"password": 0.531, "add": 1.204, "validate_password": 2.318}, "system2": {"update": 0.412}, "021637323454": {"remove": 0.207}}
 """
 import json
-import threading
+import socket
 
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, run_concurrently
 from ansible.module_utils._text import to_native
-from time import sleep
+from time import sleep, time
 
 try:
     import ipaddress
@@ -171,6 +206,12 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
     DEFAULT_GRAPH_DISCOVERY_TIMEOUT = 30
     DEFAULT_PASSWORD_STATE_TIMEOUT = 30
     DEFAULT_DISCOVERY_TIMEOUT_SEC = 300
+    MIN_DISCOVERY_POLL_INTERVAL_SEC = 1
+    MAX_DISCOVERY_POLL_INTERVAL_SEC = 5
+    DEFAULT_VALIDATE_PASSWORD_RETRIES = 5
+    DEFAULT_CONCURRENCY = {"password": 16, "add": 8, "update": 16, "remove": 16}
+    DEFAULT_REACHABILITY_TIMEOUT_SEC = 3
+    DEFAULT_PASSWORD_BOOTSTRAP_TIMEOUT_SEC = 5
 
     def __init__(self):
         ansible_options = dict(add_discovered_systems=dict(type="bool", required=False, default=False),
@@ -178,6 +219,10 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
                                password=dict(type="str", required=False, default="", no_log=True),
                                tags=dict(type="dict", required=False),
                                accept_certificate=dict(type="bool", required=False, default=True),
+                               concurrency=dict(type="dict", required=False, options=dict(password=dict(type="int", required=False, default=16),
+                                                                                          add=dict(type="int", required=False, default=8),
+                                                                                          update=dict(type="int", required=False, default=16),
+                                                                                          remove=dict(type="int", required=False, default=16))),
                                systems=dict(type="list", required=False, default=[], suboptions=dict(ssid=dict(type="str", required=False),
                                                                                                      serial=dict(type="str", required=False),
                                                                                                      addresses=dict(type="list", required=False),
@@ -194,6 +239,15 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
         self.accept_certificate = args["accept_certificate"]
         self.default_password = args["password"]
 
+        self.concurrency = dict(self.DEFAULT_CONCURRENCY)
+        if args["concurrency"]:
+            for phase, max_workers in args["concurrency"].items():
+                if max_workers is not None:
+                    if max_workers < 1:
+                        self.module.fail_json(msg="Concurrency must be a positive number. Phase [%s]. Concurrency [%s]." % (phase, max_workers))
+                    self.concurrency.update({phase: max_workers})
+        self.system_timings = {}
+
         self.default_meta_tags = []
         if "tags" in args and args["tags"]:
             for key in args["tags"].keys():
@@ -208,13 +262,13 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
         self.systems_to_update = []
         self.systems_to_add = []
 
-        self.serial_numbers = []
+        self.serial_numbers = set()
         self.systems = []
         if args["systems"]:
             for system in args["systems"]:
 
                 if isinstance(system, str):     # system is a serial number
-                    self.serial_numbers.append(system)
+                    self.serial_numbers.add(system)
                     self.systems.append({"ssid": system,
                                          "serial": system,
                                          "password": self.default_password,
@@ -240,7 +294,7 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
                         system.update({"password": self.default_password})
 
                     if "serial" in system and system["serial"]:
-                        self.serial_numbers.append(system["serial"])
+                        self.serial_numbers.add(system["serial"])
 
                     # Structure meta tags for Web Services
                     meta_tags = self.default_meta_tags
@@ -273,114 +327,168 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
         # Update default request headers
         self.DEFAULT_HEADERS.update({"x-netapp-password-validate-method": "none"})
 
+    def index_expected_system(self, position, system):
+        """Add an expected storage system and its position in the systems list to the indexes used to match discovered systems."""
+        entry = (position, system)
+        if system["serial"]:
+            self.expected_systems_index["serial"].setdefault(system["serial"], []).append(entry)
+        for address in system["controller_addresses"]:
+            self.expected_systems_index["address"].setdefault(address, []).append(entry)
+
+    def process_discovered_system(self, discovered_system):
+        """Update the expected storage systems with a storage system reported by the proxy discovery process."""
+        # Add all newly discovered systems. This is ignore any supplied systems to prevent any duplicates.
+        if self.add_discovered_systems and discovered_system["serialNumber"] not in self.serial_numbers:
+            system = {"ssid": discovered_system["serialNumber"],
+                      "serial": discovered_system["serialNumber"],
+                      "password": self.default_password,
+                      "password_valid": None,
+                      "password_set": None,
+                      "stored_password_valid": None,
+                      "meta_tags": self.default_meta_tags,
+                      "controller_addresses": [],
+                      "embedded_available": None,
+                      "accept_certificate": False,
+                      "current_info": {},
+                      "changes": {},
+                      "updated_required": False,
+                      "failed": False,
+                      "discovered": False}
+            self.index_expected_system(len(self.systems), system)
+            self.systems.append(system)
+
+        # Update controller_addresses for the first expected system matching either the serial number or all of its controller addresses.
+        candidates = list(self.expected_systems_index["serial"].get(discovered_system["serialNumber"], []))
+        for address in discovered_system["ipAddresses"]:
+            candidates.extend(self.expected_systems_index["address"].get(address, []))
+
+        for position, system in sorted(candidates, key=lambda entry: entry[0]):
+            if not system["discovered"] and (system["serial"] == discovered_system["serialNumber"] or
+                                             (system["controller_addresses"] and
+                                              all([address in discovered_system["ipAddresses"] for address in system["controller_addresses"]]))):
+                system["controller_addresses"] = sorted(discovered_system["ipAddresses"])
+                system["embedded_available"] = "https" in discovered_system["supportedManagementPorts"]
+                system["accept_certificate"] = system["embedded_available"] and self.accept_certificate
+                system["discovered"] = True
+                break
+
     def discover_array(self):
-        """Search for array using the world wide identifier."""
+        """Search for array using the world wide identifier.
+
+        Partial discovery results are processed as they are reported and, unless all discovered systems are to be added, polling stops as soon as
+        every expected storage system has been found.
+        """
         subnet = ipaddress.ip_network(u"%s" % self.subnet_mask)
 
         try:
             rc, request_id = self.request("discovery", method="POST", data={"startIP": str(subnet[0]), "endIP": str(subnet[-1]),
                                                                             "connectionTimeout": self.DEFAULT_CONNECTION_TIMEOUT_SEC})
 
+            self.expected_systems_index = {"serial": {}, "address": {}}
+            for position, system in enumerate(self.systems):
+                self.index_expected_system(position, system)
+
             # Wait for discover to complete
-            discovered_systems = None
+            processed_serials = set()
+            poll_interval = self.MIN_DISCOVERY_POLL_INTERVAL_SEC
+            elapsed = 0
             try:
-                for iteration in range(self.DEFAULT_DISCOVERY_TIMEOUT_SEC):
+                while elapsed < self.DEFAULT_DISCOVERY_TIMEOUT_SEC:
                     rc, discovered_systems = self.request("discovery?requestId=%s" % request_id["requestId"])
+
+                    new_systems = [system for system in discovered_systems.get("storageSystems", []) if system["serialNumber"] not in processed_serials]
+                    for discovered_system in new_systems:
+                        processed_serials.add(discovered_system["serialNumber"])
+                        self.process_discovered_system(discovered_system)
+
                     if not discovered_systems["discoverProcessRunning"]:
                         break
-                    sleep(1)
+                    if self.systems and not self.add_discovered_systems and all([system["discovered"] for system in self.systems]):
+                        self.module.log("All expected storage systems have been discovered. Elapsed [%ss]." % elapsed)
+                        break
+
+                    if new_systems:
+                        self.module.log("Discovery in progress. Storage systems found [%s]. Elapsed [%ss]." % (len(processed_serials), elapsed))
+                        poll_interval = self.MIN_DISCOVERY_POLL_INTERVAL_SEC
+                    else:
+                        poll_interval = min(poll_interval * 2, self.MAX_DISCOVERY_POLL_INTERVAL_SEC)
+
+                    sleep(poll_interval)
+                    elapsed += poll_interval
                 else:
                     self.module.fail_json(msg="Timeout waiting for array discovery process. Subnet [%s]" % self.subnet_mask)
             except Exception as error:
                 self.module.fail_json(msg="Failed to get the discovery results. Error [%s]." % to_native(error))
 
-            if not discovered_systems:
+            if not processed_serials:
                 self.module.warn("Discovery found no systems. IP starting address [%s]. IP ending address: [%s]." % (str(subnet[0]), str(subnet[-1])))
-            else:
-                # Add all newly discovered systems. This is ignore any supplied systems to prevent any duplicates.
-                if self.add_discovered_systems:
-                    for discovered_system in discovered_systems["storageSystems"]:
-                        if discovered_system["serialNumber"] not in self.serial_numbers:
-                            self.systems.append({"ssid": discovered_system["serialNumber"],
-                                                 "serial": discovered_system["serialNumber"],
-                                                 "password": self.default_password,
-                                                 "password_valid": None,
-                                                 "password_set": None,
-                                                 "stored_password_valid": None,
-                                                 "meta_tags": self.default_meta_tags,
-                                                 "controller_addresses": [],
-                                                 "embedded_available": None,
-                                                 "accept_certificate": False,
-                                                 "current_info": {},
-                                                 "changes": {},
-                                                 "updated_required": False,
-                                                 "failed": False,
-                                                 "discovered": False})
-
-                # Update controller_addresses
-                for system in self.systems:
-                    for discovered_system in discovered_systems["storageSystems"]:
-                        if (system["serial"] == discovered_system["serialNumber"] or
-                                (system["controller_addresses"] and
-                                 all([address in discovered_system["ipAddresses"] for address in system["controller_addresses"]]))):
-                            system["controller_addresses"] = sorted(discovered_system["ipAddresses"])
-                            system["embedded_available"] = "https" in discovered_system["supportedManagementPorts"]
-                            system["accept_certificate"] = system["embedded_available"] and self.accept_certificate
-                            system["discovered"] = True
-                            break
-                    else:  # Remove any undiscovered system from the systems list
-
-                        self.undiscovered_systems.append(system["ssid"])
-                        # self.systems.remove(system)
+
+            # Remove any undiscovered system from the systems list
+            for system in self.systems:
+                if not system["discovered"]:
+                    self.undiscovered_systems.append(system["ssid"])
 
         except Exception as error:
             self.module.fail_json(msg="Failed to initiate array discovery. Error [%s]." % to_native(error))
 
     def update_storage_systems_info(self):
-        """Get current web services proxy storage systems."""
+        """Get current web services proxy storage systems.
+
+        The expected storage systems are reconciled against an index of the existing systems in a single pass over each list.
+        """
         try:
             rc, existing_systems = self.request("storage-systems")
+            existing_systems_by_id = dict((existing_system["id"], existing_system) for existing_system in existing_systems)
 
-            # Mark systems for adding or removing
+            # Mark systems for adding
+            expected_ssids = set()
             for system in self.systems:
-                for existing_system in existing_systems:
-                    if system["ssid"] == existing_system["id"]:
-                        system["current_info"] = existing_system
-
-                        if system["current_info"]["passwordStatus"] in ["unknown", "securityLockout"]:
-                            system["failed"] = True
-                            self.module.warn("Skipping storage system [%s] because of current password status [%s]"
-                                             % (system["ssid"], system["current_info"]["passwordStatus"]))
-                        if system["current_info"]["metaTags"]:
-                            system["current_info"]["metaTags"] = sorted(system["current_info"]["metaTags"], key=lambda x: x["key"])
-                        break
-                else:
+                expected_ssids.add(system["ssid"])
+                existing_system = existing_systems_by_id.get(system["ssid"])
+                if existing_system is None:
                     self.systems_to_add.append(system)
+                    continue
+
+                system["current_info"] = existing_system
+                if system["current_info"]["passwordStatus"] in ["unknown", "securityLockout"]:
+                    system["failed"] = True
+                    self.module.warn("Skipping storage system [%s] because of current password status [%s]"
+                                     % (system["ssid"], system["current_info"]["passwordStatus"]))
+                if system["current_info"]["metaTags"]:
+                    system["current_info"]["metaTags"] = sorted(system["current_info"]["metaTags"], key=lambda x: x["key"])
 
             # Mark systems for removing
+            undiscovered_ssids = set(self.undiscovered_systems)
             for existing_system in existing_systems:
-                for system in self.systems:
-                    if existing_system["id"] == system["ssid"]:
-
-                        # Leave existing but undiscovered storage systems alone and throw a warning.
-                        if existing_system["id"] in self.undiscovered_systems:
-                            self.undiscovered_systems.remove(existing_system["id"])
-                            self.module.warn("Expected storage system exists on the proxy but was failed to be discovered. Array [%s]." % existing_system["id"])
-                        break
-                else:
+                if existing_system["id"] not in expected_ssids:
                     self.systems_to_remove.append(existing_system["id"])
+
+                # Leave existing but undiscovered storage systems alone and throw a warning.
+                elif existing_system["id"] in undiscovered_ssids:
+                    undiscovered_ssids.remove(existing_system["id"])
+                    self.undiscovered_systems.remove(existing_system["id"])
+                    self.module.warn("Expected storage system exists on the proxy but was failed to be discovered. Array [%s]." % existing_system["id"])
         except Exception as error:
             self.module.fail_json(msg="Failed to retrieve storage systems. Error [%s]." % to_native(error))
 
+    def is_reachable(self, address, port):
+        """Determine whether a TCP connection can be established to the address and port."""
+        try:
+            connection = socket.create_connection((address, port), timeout=self.DEFAULT_REACHABILITY_TIMEOUT_SEC)
+            connection.close()
+        except Exception:
+            return False
+        return True
+
     def set_password(self, system):
         """Determine whether password has been set and, if it hasn't been set, set it."""
         if system["embedded_available"] and system["controller_addresses"]:
-            for url in ["https://%s:8443/devmgr" % system["controller_addresses"][0],
-                        "https://%s:443/devmgr" % system["controller_addresses"][0],
-                        "http://%s:8080/devmgr" % system["controller_addresses"][0]]:
+            # Each endpoint is probed only when it is reached so the first reachable endpoint is tried without waiting on the rest.
+            for url in ("%s://%s:%s/devmgr" % (protocol, address, port) for address in system["controller_addresses"]
+                        for protocol, port in [("https", 8443), ("https", 443), ("http", 8080)] if self.is_reachable(address, port)):
                 try:
                     rc, response = self._request("%s/utils/login?uid=admin&xsrf=false&onlycheck=true" % url, ignore_errors=True, url_username="admin",
-                                                 url_password="", validate_certs=False)
+                                                 url_password="", validate_certs=False, timeout=self.DEFAULT_PASSWORD_BOOTSTRAP_TIMEOUT_SEC)
 
                     if rc == 200:  # successful login without password
                         system["password_set"] = False
@@ -388,6 +496,7 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
                             try:
                                 rc, storage_system = self._request("%s/v2/storage-systems/1/passwords" % url, method="POST", url_username="admin",
                                                                    headers=self.DEFAULT_HEADERS, url_password="", validate_certs=False,
+                                                                   timeout=self.DEFAULT_PASSWORD_BOOTSTRAP_TIMEOUT_SEC,
                                                                    data=json.dumps({"currentAdminPassword": "", "adminPassword": True,
                                                                                     "newPassword": system["password"]}))
 
@@ -405,6 +514,10 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
                 self.module.warn("Failed to retrieve array password state. Array [%s]." % system["ssid"])
                 system["failed"] = True
 
+    def bootstrap_passwords(self, systems):
+        """Check and, when required, set the admin password for storage systems concurrently."""
+        run_concurrently(self.timed_call, [("password", system["ssid"], self.set_password, system) for system in systems], self.concurrency["password"])
+
     def update_system_changes(self, system):
         """Determine whether storage system configuration changes are required """
         if system["current_info"]:
@@ -435,13 +548,11 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
             if system["accept_certificate"] and not all([controller["certificateStatus"] == "trusted" for controller in system["current_info"]["controllers"]]):
                 system["changes"].update({"acceptCertificate": True})
 
-        if system["id"] not in self.undiscovered_systems and system["changes"]:
+        if system["ssid"] not in self.undiscovered_systems and system["changes"]:
             self.systems_to_update.append(system)
 
     def add_system(self, system):
         """Add basic storage system definition to the web services proxy."""
-        self.set_password(system)
-
         body = {"id": system["ssid"],
                 "controllerAddresses": system["controller_addresses"],
                 "password": system["password"]}
@@ -454,17 +565,28 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
             rc, storage_system = self.request("storage-systems", method="POST", data=body)
         except Exception as error:
             self.module.warn("Failed to add storage system. Array [%s]. Error [%s]" % (system["ssid"], to_native(error)))
-            return  # Skip the password validation.
+            return False  # Skip the password validation.
+        return True
 
-        # Ensure the password is validated
-        for retries in range(5):
-            sleep(1)
-            try:
-                rc, storage_system = self.request("storage-systems/%s/validatePassword" % system["ssid"], method="POST")
+    def validate_password(self, system):
+        """Request web services proxy to validate the storage system's stored password."""
+        rc, storage_system = self.request("storage-systems/%s/validatePassword" % system["ssid"], method="POST")
+
+    def validate_passwords(self, systems):
+        """Ensure the passwords are validated for all newly added storage systems.
+
+        All pending storage systems are polled together each round so a single delay is shared rather than paid for each system.
+        """
+        pending = [(system, None) for system in systems]
+        for retries in range(self.DEFAULT_VALIDATE_PASSWORD_RETRIES):
+            if not pending:
                 break
-            except Exception as error:
-                continue
-        else:
+            sleep(1)
+            results = run_concurrently(self.timed_call, [("validate_password", system["ssid"], self.validate_password, system) for system, error in pending],
+                                       self.concurrency["add"])
+            pending = [(system, result) for (system, error), result in zip(pending, results) if isinstance(result, Exception)]
+
+        for system, error in pending:
             self.module.warn("Failed to validate password status. Array [%s]. Error [%s]" % (system["ssid"], to_native(error)))
 
     def update_system(self, system):
@@ -481,6 +603,15 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
         except Exception as error:
             self.module.warn("Failed to remove storage system. Array [%s]. Error [%s]." % (ssid, to_native(error)))
 
+    def timed_call(self, phase, ssid, target, *args):
+        """Call target and add its duration to the storage system's timing for the phase."""
+        start = time()
+        try:
+            return target(*args)
+        finally:
+            timings = self.system_timings.setdefault(ssid, {})
+            timings.update({phase: round(timings.get(phase, 0) + time() - start, 3)})
+
     def apply(self):
         """Determine whether changes are required and, if necessary, apply them."""
         if self.is_embedded():
@@ -492,14 +623,9 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
             self.update_storage_systems_info()
 
             # Determine whether the storage system requires updating
-            thread_pool = []
             for system in self.systems:
                 if not system["failed"]:
-                    thread = threading.Thread(target=self.update_system_changes, args=(system,))
-                    thread_pool.append(thread)
-                    thread.start()
-            for thread in thread_pool:
-                thread.join()
+                    self.update_system_changes(system)
         else:
             self.update_storage_systems_info()
 
@@ -514,54 +640,35 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
 
             # Remove storage systems
             if self.systems_to_remove:
-                ssids = []
-                thread_pool = []
-                for ssid in self.systems_to_remove:
-                    thread = threading.Thread(target=self.remove_system, args=(ssid,))
-                    thread_pool.append(thread)
-                    thread.start()
-                    ssids.append(ssid)
-                for thread in thread_pool:
-                    thread.join()
+                ssids = list(self.systems_to_remove)
+                run_concurrently(self.timed_call, [("remove", ssid, self.remove_system, ssid) for ssid in ssids], self.concurrency["remove"])
                 if ssids:
                     remove_msg = "system%s removed: %s" % ("s" if len(ssids) > 1 else "", ", ".join(ssids))
 
-            thread_pool = []
-
             # Add storage systems
             if self.systems_to_add:
-                ssids = []
-                for system in self.systems_to_add:
-                    if not system["failed"]:
-                        thread = threading.Thread(target=self.add_system, args=(system,))
-                        thread_pool.append(thread)
-                        thread.start()
-                        ssids.append(system["ssid"])
-                if ssids:
-                    add_msg = "system%s added: %s" % ("s" if len(ssids) > 1 else "", ", ".join(ssids))
+                systems = [system for system in self.systems_to_add if not system["failed"]]
+                self.bootstrap_passwords(systems)
+                results = run_concurrently(self.timed_call, [("add", system["ssid"], self.add_system, system) for system in systems], self.concurrency["add"])
+                self.validate_passwords([system for system, added in zip(systems, results) if added is True])
+                if systems:
+                    add_msg = "system%s added: %s" % ("s" if len(systems) > 1 else "", ", ".join([system["ssid"] for system in systems]))
 
             # Update storage systems
             if self.systems_to_update:
-                ssids = []
-                for system in self.systems_to_update:
-                    if not system["failed"]:
-                        thread = threading.Thread(target=self.update_system, args=(system,))
-                        thread_pool.append(thread)
-                        thread.start()
-                        ssids.append(system["ssid"])
-                if ssids:
-                    update_msg = "system%s updated: %s" % ("s" if len(ssids) > 1 else "", ", ".join(ssids))
-
-            # Wait for storage systems to be added or updated
-            for thread in thread_pool:
-                thread.join()
+                systems = [system for system in self.systems_to_update if not system["failed"]]
+                run_concurrently(self.timed_call, [("update", system["ssid"], self.update_system, system) for system in systems], self.concurrency["update"])
+                if systems:
+                    update_msg = "system%s updated: %s" % ("s" if len(systems) > 1 else "", ", ".join([system["ssid"] for system in systems]))
 
             # Report module actions
             if self.undiscovered_systems:
                 undiscovered_msg = "system%s undiscovered: %s" % ("s " if len(self.undiscovered_systems) > 1 else "", ", ".join(self.undiscovered_systems))
-                self.module.fail_json(msg=(", ".join([msg for msg in [add_msg, update_msg, remove_msg, undiscovered_msg] if msg])), changed=changes_required)
+                self.module.fail_json(msg=(", ".join([msg for msg in [add_msg, update_msg, remove_msg, undiscovered_msg] if msg])), changed=changes_required,
+                                      system_timings=self.system_timings)
 
-            self.module.exit_json(msg=", ".join([msg for msg in [add_msg, update_msg, remove_msg] if msg]), changed=changes_required)
+            self.module.exit_json(msg=", ".join([msg for msg in [add_msg, update_msg, remove_msg] if msg]), changed=changes_required,
+                                  system_timings=self.system_timings)
 
         # Report no changes
         if self.undiscovered_systems:
@@ -26,8 +26,10 @@ options:
   name:
     description:
       - The name of the storage pool to manage
+      - Required unless I(storage_pools) is specified.
+      - Mutually exclusive with I(storage_pools).
     type: str
-    required: true
+    required: false
   criteria_drive_count:
     description:
       - The number of disks to use for building the storage pool.
@@ -124,10 +126,103 @@ options:
     type: bool
     default: true
     required: false
+  storage_pools:
+    description:
+      - List of storage pools to manage in a single task.
+      - The drives, storage pools and volumes are retrieved once and each storage pool is planned against the same drive
+        inventory. Drives chosen for one storage pool are not considered for the others; existing storage pools are
+        planned first followed by new storage pools in descending order of I(criteria_drive_count) so the largest
+        storage pools have the first choice of tray and drawer loss protected drives.
+      - Storage pools with I(state=absent) are removed before the other storage pools are planned so their drives can
+        be used. In check mode the drives of storage pools to be removed are not considered available.
+      - Available secured drives are erased once for all storage pools before any storage pool is created or expanded.
+      - Storage pools are then created or changed concurrently.
+      - Each entry accepts the storage pool options above; any option not specified in an entry defaults to the task's
+        value for that option.
+      - Mutually exclusive with I(name).
+    type: list
+    elements: dict
+    required: false
+    suboptions:
+      state:
+        description: Whether the specified storage pool should exist or not.
+        type: str
+        choices: ["present", "absent"]
+      name:
+        description: The name of the storage pool to manage.
+        type: str
+        required: true
+      criteria_drive_count:
+        description: The number of disks to use for building the storage pool.
+        type: int
+      criteria_min_usable_capacity:
+        description: The minimum size of the storage pool (in size_unit).
+        type: float
+      criteria_drive_type:
+        description: The type of disk (hdd or ssd) to use when searching for candidates to use.
+        type: str
+        choices: ["hdd","ssd"]
+      criteria_size_unit:
+        description: The unit used to interpret size parameters
+        type: str
+        choices: ["bytes", "b", "kb", "mb", "gb", "tb", "pb", "eb", "zb", "yb"]
+      criteria_drive_min_size:
+        description: The minimum individual drive size (in size_unit) to consider when choosing drives for the storage pool.
+        type: float
+      criteria_drive_interface_type:
+        description: The interface type to use when selecting drives for the storage pool.
+        type: str
+        choices: ["sas", "sas4k", "fibre", "fibre520b", "scsi", "sata", "pata"]
+      criteria_drive_require_da:
+        description: Ensures the storage pool will be created with only data assurance (DA) capable drives.
+        type: bool
+      criteria_drive_require_fde:
+        description: Whether full disk encryption ability is required for drives to be added to the storage pool
+        type: bool
+      raid_level:
+        description: The RAID level of the storage pool to be created.
+        type: str
+        choices: ["raidAll", "raid0", "raid1", "raid3", "raid5", "raid6", "raidDiskPool"]
+      secure_pool:
+        description: Enables security at rest feature on the storage pool.
+        type: bool
+      reserve_drive_count:
+        description: Set the number of drives reserved by the storage pool for reconstruction operations.
+        type: int
+      remove_volumes:
+        description: Prior to removing a storage pool, delete all volumes in the pool.
+        type: bool
+      erase_secured_drives:
+        description: Whether to erase the drives of a removed storage pool or the available secured drives.
+        type: bool
+  concurrency:
+    description:
+      - Maximum number of storage pools from I(storage_pools) that will be changed at the same time.
+    type: int
+    default: 4
+    required: false
+  wait_for_completion:
+    description:
+      - Whether to wait for the storage pool operations started by the task, such as expansions and raid level
+        migrations, to complete.
+      - The progress of the operations is returned in I(progress).
+    type: bool
+    default: false
+    required: false
+  wait_for_completion_timeout:
+    description:
+      - Maximum number of seconds to wait for the storage pool operations to complete when I(wait_for_completion=true).
+      - Also bounds the wait for each traditional volume group expansion step to complete before the next is submitted,
+        which is 3600 seconds when not specified.
+      - Waits indefinitely for the storage pool operations when not specified.
+    type: int
+    required: false
 notes:
-  - The expansion operations are non-blocking due to the time consuming nature of expanding volume groups
-  - Traditional volume groups (raid0, raid1, raid5, raid6) are performed in steps dictated by the storage array. Each
-    required step will be attempted until the request fails which is likely because of the required expansion time.
+  - The final expansion operation is non-blocking due to the time consuming nature of expanding volume groups unless
+    I(wait_for_completion=true)
+  - Traditional volume groups (raid0, raid1, raid5, raid6) are expanded in steps dictated by the storage array. Each
+    step is submitted as soon as the previous expansion completes so the module waits for every step except the last.
+    The task fails with the expansion progress when a step does not complete within I(wait_for_completion_timeout).
   - raidUnsupported will be treated as raid0, raidAll as raidDiskPool and raid3 as raid5.
   - Tray loss protection and drawer loss protection will be chosen if at all possible.
 """
@@ -141,6 +236,24 @@ EXAMPLES = """
     api_username: "{{ netapp_api_username }}"
     api_password: "{{ netapp_api_password }}"
     validate_certs: "{{ netapp_api_validate_certs }}"
+
+- name: Define the storage array's storage pools in a single task
+  na_santricity_storagepool:
+    ssid: "{{ ssid }}"
+    api_url: "{{ netapp_api_url }}"
+    api_username: "{{ netapp_api_username }}"
+    api_password: "{{ netapp_api_password }}"
+    validate_certs: "{{ netapp_api_validate_certs }}"
+    raid_level: raid6
+    criteria_drive_count: 12
+    storage_pools:
+      - name: vg_data1
+      - name: vg_data2
+      - name: ddp_archive
+        raid_level: raidDiskPool
+        criteria_drive_count: 24
+      - name: vg_old
+        state: absent
 """
 RETURN = """
 msg:
@@ -148,50 +261,59 @@ msg:
     returned: success
     type: str
     sample: Json facts for the pool that was created.
+capacity_plan:
+    description:
+        - Estimated usable capacity in bytes of a storage pool with the specified raid level built from each type of
+          available drive.
+        - I(criteria_drive_count) drives of each type are evaluated, or every available drive of the type when
+          I(criteria_drive_count) is not specified.
+        - The usable capacity is null when the drive count is not valid for the raid level. The standard disk pool minimum
+          of 11 drives is assumed.
+    returned: check mode when I(state=="present") and I(storage_pools) is not specified
+    type: list
+    sample: [{"drive_media_type": "hdd", "drive_interface_type": "sas", "drive_usable_capacity": 299463129088,
+              "available_drive_count": 12, "drive_count": 12, "usable_capacity": 2176777306112}]
+progress:
+    description:
+        - Progress of the storage pool operations once the wait completes or I(wait_for_completion_timeout) expires.
+        - Percentage complete is for the least complete operation and the estimated time to completion, in minutes, is
+          for the latest completing operation.
+    returned: when I(wait_for_completion=true) and changes were applied
+    type: dict
+    sample: {"in_progress": false, "actions": [], "percent_complete": null, "estimated_time_to_completion": 0}
+storage_pools:
+    description:
+        - Results for each storage pool when I(storage_pools) is specified, including the drives chosen for new storage
+          pools and expansions and, when I(wait_for_completion=true), the progress of their operations.
+    returned: when I(storage_pools) is specified
+    type: list
+    sample: [{"name": "vg_data1", "changed": true, "failed": false, "msg": "Storage pool [vg_data1] was created.",
+              "drives": ["010000005000C500551ED1FF0000000000000000", "010000005000C500551E7F2B0000000000000000"]}]
 """
-import functools
-from itertools import groupby
-from time import sleep
+import copy
+
+from collections import OrderedDict
 
 from pprint import pformat
 from ansible.module_utils._text import to_native
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
-
-
-def get_most_common_elements(iterator):
-    """Returns a generator containing a descending list of most common elements."""
-    if not isinstance(iterator, list):
-        raise TypeError("iterator must be a list.")
-
-    grouped = [(key, len(list(group))) for key, group in groupby(sorted(iterator))]
-    return sorted(grouped, key=lambda x: x[1], reverse=True)
-
-
-def memoize(func):
-    """Generic memoizer for any function with any number of arguments including zero."""
-
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        class MemoizeFuncArgs(dict):
-            def __missing__(self, _key):
-                self[_key] = func(*args, **kwargs)
-                return self[_key]
-
-        key = str((args, kwargs)) if args and kwargs else "no_argument_response"
-        return MemoizeFuncArgs().__getitem__(key)
-
-    return wrapper
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, DeferredFailure, DeferredFailureModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import DriveIndex, StoragePoolCapacityModel, StoragePoolProgressTracker
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import check_concurrency, clear_memoized, memoize, run_concurrently
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import get_list_entry_argument_spec, get_list_entry_options
 
 
 class NetAppESeriesStoragePool(NetAppESeriesModule):
-    EXPANSION_TIMEOUT_SEC = 10
+    CANDIDATE_REQUEST_CONCURRENCY = 4
+    DEFAULT_CONCURRENCY = 4
+    REPROVISION_CONCURRENCY = 8
+    EXPANSION_STEP_TIMEOUT_SEC = 3600
     DEFAULT_DISK_POOL_MINIMUM_DISK_COUNT = 11
 
     def __init__(self):
         version = "02.00.0000.0000"
         ansible_options = dict(
             state=dict(choices=["present", "absent"], default="present", type="str"),
-            name=dict(required=True, type="str"),
+            name=dict(type="str"),
             criteria_size_unit=dict(choices=["bytes", "b", "kb", "mb", "gb", "tb", "pb", "eb", "zb", "yb"],
                                     default="gb", type="str"),
             criteria_drive_count=dict(type="int"),
@@ -209,70 +331,110 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             reserve_drive_count=dict(type="int"),
             remove_volumes=dict(type="bool", default=True))
 
-        required_if = [["state", "present", ["raid_level"]]]
+        storage_pool_options = get_list_entry_argument_spec(ansible_options, required=["name"])
+        ansible_options.update(dict(storage_pools=dict(type="list", elements="dict", options=storage_pool_options, required=False),
+                                    concurrency=dict(type="int", default=self.DEFAULT_CONCURRENCY, required=False),
+                                    wait_for_completion=dict(type="bool", default=False, required=False),
+                                    wait_for_completion_timeout=dict(type="int", required=False)))
+
+        mutually_exclusive = [["name", "storage_pools"]]
+        required_one_of = [["name", "storage_pools"]]
         super(NetAppESeriesStoragePool, self).__init__(ansible_options=ansible_options,
                                                        web_services_version=version,
                                                        supports_check_mode=True,
-                                                       required_if=required_if)
+                                                       mutually_exclusive=mutually_exclusive,
+                                                       required_one_of=required_one_of)
 
         args = self.module.params
-        self.state = args["state"]
         self.ssid = args["ssid"]
-        self.name = args["name"]
-        self.criteria_drive_count = args["criteria_drive_count"]
-        self.criteria_min_usable_capacity = args["criteria_min_usable_capacity"]
-        self.criteria_size_unit = args["criteria_size_unit"]
-        self.criteria_drive_min_size = args["criteria_drive_min_size"]
-        self.criteria_drive_type = args["criteria_drive_type"]
-        self.criteria_drive_interface_type = args["criteria_drive_interface_type"]
-        self.criteria_drive_require_fde = args["criteria_drive_require_fde"]
-        self.criteria_drive_require_da = args["criteria_drive_require_da"]
-        self.raid_level = args["raid_level"]
-        self.erase_secured_drives = args["erase_secured_drives"]
-        self.secure_pool = args["secure_pool"]
-        self.reserve_drive_count = args["reserve_drive_count"]
-        self.remove_volumes = args["remove_volumes"]
+        self.concurrency = args["concurrency"]
+        self.wait_for_completion = args["wait_for_completion"]
+        self.wait_for_completion_timeout = args["wait_for_completion_timeout"]
+        try:
+            check_concurrency(concurrency=self.concurrency)
+        except ValueError as error:
+            self.module.fail_json(msg="%s Array [%s]." % (to_native(error), self.ssid))
+
+        self.storage_pools = None
+        if args["storage_pools"] is None:
+            self.set_storage_pool_spec(self.get_storage_pool_spec(args))
+        else:
+            try:
+                entries = get_list_entry_options(args, "storage_pools")
+            except ValueError as error:
+                self.module.fail_json(msg="Storage pool names must be unique. Duplicates [%s]. Array [%s]." % (to_native(error), self.ssid))
+            self.storage_pools = [self.get_storage_pool_spec(options) for options in entries]
+
         self.pool_detail = None
+        self.snapshot = dict()
+        self.claimed_drives = set()
+
+    def get_storage_pool_spec(self, options):
+        """Normalize storage pool options into the attributes used to reconcile a single storage pool.
+
+        :param dict options: storage pool options keyed by the module's option names.
+        :return dict: storage pool attributes keyed by NetAppESeriesStoragePool member name.
+        """
+        spec = dict(state=options["state"],
+                    name=options["name"],
+                    criteria_drive_count=options["criteria_drive_count"],
+                    criteria_min_usable_capacity=options["criteria_min_usable_capacity"],
+                    criteria_size_unit=options["criteria_size_unit"],
+                    criteria_drive_min_size=options["criteria_drive_min_size"],
+                    criteria_drive_type=options["criteria_drive_type"],
+                    criteria_drive_interface_type=options["criteria_drive_interface_type"],
+                    criteria_drive_require_fde=options["criteria_drive_require_fde"],
+                    criteria_drive_require_da=options["criteria_drive_require_da"],
+                    raid_level=options["raid_level"],
+                    erase_secured_drives=options["erase_secured_drives"],
+                    secure_pool=options["secure_pool"],
+                    reserve_drive_count=options["reserve_drive_count"],
+                    remove_volumes=options["remove_volumes"])
+
+        if spec["state"] == "present" and not spec["raid_level"]:
+            self.module.fail_json(msg="raid_level is required when state is present. Storage pool [%s]. Array [%s]." % (spec["name"], self.ssid))
 
         # Change all sizes to be measured in bytes
-        if self.criteria_min_usable_capacity:
-            self.criteria_min_usable_capacity = int(self.criteria_min_usable_capacity *
-                                                    self.SIZE_UNIT_MAP[self.criteria_size_unit])
-        if self.criteria_drive_min_size:
-            self.criteria_drive_min_size = int(self.criteria_drive_min_size *
-                                               self.SIZE_UNIT_MAP[self.criteria_size_unit])
-        self.criteria_size_unit = "bytes"
+        if spec["criteria_min_usable_capacity"]:
+            spec["criteria_min_usable_capacity"] = int(spec["criteria_min_usable_capacity"] *
+                                                       self.SIZE_UNIT_MAP[spec["criteria_size_unit"]])
+        if spec["criteria_drive_min_size"]:
+            spec["criteria_drive_min_size"] = int(spec["criteria_drive_min_size"] *
+                                                  self.SIZE_UNIT_MAP[spec["criteria_size_unit"]])
+        spec["criteria_size_unit"] = "bytes"
 
         # Adjust unused raid level option to reflect documentation
-        if self.raid_level == "raidAll":
-            self.raid_level = "raidDiskPool"
-        if self.raid_level == "raid3":
-            self.raid_level = "raid5"
+        if spec["raid_level"] == "raidAll":
+            spec["raid_level"] = "raidDiskPool"
+        if spec["raid_level"] == "raid3":
+            spec["raid_level"] = "raid5"
+
+        return spec
+
+    def set_storage_pool_spec(self, spec):
+        """Assign the normalized storage pool attributes from get_storage_pool_spec to this instance."""
+        for key, value in spec.items():
+            setattr(self, key, value)
 
     @property
-    @memoize
     def available_drives(self):
-        """Determine the list of available drives"""
-        return [drive["id"] for drive in self.drives if drive["available"] and drive["status"] == "optimal"]
+        """Determine the list of available drives that have not been chosen for another storage pool."""
+        return self.drive_index.get_available_drive_ids(exclude=self.claimed_drives)
 
     @property
-    @memoize
     def available_drive_types(self):
         """Determine the types of available drives sorted by the most common first."""
-        types = [drive["driveMediaType"] for drive in self.drives]
-        return [entry[0] for entry in get_most_common_elements(types)]
+        return self.drive_index.get_most_common("media_type")
 
     @property
-    @memoize
     def available_drive_interface_types(self):
         """Determine the types of available drives."""
-        interfaces = [drive["phyDriveType"] for drive in self.drives]
-        return [entry[0] for entry in get_most_common_elements(interfaces)]
+        return self.drive_index.get_most_common("interface_type")
 
     @property
     def storage_pool_drives(self):
         """Retrieve list of drives found in storage pool."""
-        return [drive for drive in self.drives if drive["currentVolumeGroupRef"] == self.pool_detail["id"] and not drive["hotSpare"]]
+        return self.drive_index.get_volume_group_drives(self.pool_detail["id"])
 
     @property
     def expandable_drive_count(self):
@@ -282,7 +444,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             return len(self.available_drives)
 
         try:
-            rc, capabilities = self.request("storage-systems/%s/capabilities" % self.ssid)
+            capabilities = self.get_snapshot("capabilities")
         except Exception as error:
             self.module.fail_json(msg="Failed to fetch maximum expandable drive count. Array id [%s].  Error[%s]."
                                       % (self.ssid, to_native(error)))
@@ -292,40 +454,67 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
     @property
     def disk_pool_drive_minimum(self):
         """Provide the storage array's minimum disk pool drive count."""
-        rc, attr = self.request("storage-systems/%s/symbol/getSystemAttributeDefaults" % self.ssid, ignore_errors=True)
+        if "disk_pool_drive_minimum" not in self.snapshot:
+            rc, attr = self.request("storage-systems/%s/symbol/getSystemAttributeDefaults" % self.ssid, ignore_errors=True)
 
-        # Standard minimum is 11 drives but some allow 10 drives. 10 will be the default
-        if (rc != 200 or "minimumDriveCount" not in attr["defaults"]["diskPoolDefaultAttributes"].keys() or
-                attr["defaults"]["diskPoolDefaultAttributes"]["minimumDriveCount"] == 0):
-            return self.DEFAULT_DISK_POOL_MINIMUM_DISK_COUNT
+            # Standard minimum is 11 drives but some allow 10 drives. 10 will be the default
+            if (rc != 200 or "minimumDriveCount" not in attr["defaults"]["diskPoolDefaultAttributes"].keys() or
+                    attr["defaults"]["diskPoolDefaultAttributes"]["minimumDriveCount"] == 0):
+                self.snapshot["disk_pool_drive_minimum"] = self.DEFAULT_DISK_POOL_MINIMUM_DISK_COUNT
+            else:
+                self.snapshot["disk_pool_drive_minimum"] = attr["defaults"]["diskPoolDefaultAttributes"]["minimumDriveCount"]
 
-        return attr["defaults"]["diskPoolDefaultAttributes"]["minimumDriveCount"]
+        return self.snapshot["disk_pool_drive_minimum"]
 
     def get_available_drive_capacities(self, drive_id_list=None):
         """Determine the list of available drive capacities."""
-        if drive_id_list:
-            available_drive_capacities = set([int(drive["usableCapacity"]) for drive in self.drives
-                                              if drive["id"] in drive_id_list and drive["available"] and
-                                              drive["status"] == "optimal"])
-        else:
-            available_drive_capacities = set([int(drive["usableCapacity"]) for drive in self.drives
-                                              if drive["available"] and drive["status"] == "optimal"])
-
+        available_drive_capacities = self.capacity_model.get_available_drive_capacities(drive_id_list)
         self.module.log("available drive capacities: %s" % available_drive_capacities)
-        return list(available_drive_capacities)
+        return available_drive_capacities
+
+    def get_snapshot(self, collection):
+        """Retrieve a storage system collection once for the module run.
+
+        The collection is retrieved again only after invalidate_snapshot is called following changes to the storage system.
+
+        :param str collection: storage system collection (drives, storage-pools, volumes or capabilities).
+        :return list: collection entries.
+        """
+        if collection not in self.snapshot:
+            rc, self.snapshot[collection] = self.request("storage-systems/%s/%s" % (self.ssid, collection))
+        return self.snapshot[collection]
+
+    def invalidate_snapshot(self):
+        """Discard the retrieved storage system collections, the capacity model and memoized results after changes to the storage system."""
+        self.snapshot = dict()
+        clear_memoized(self)
 
     @property
     def drives(self):
         """Retrieve list of drives found in storage pool."""
         drives = None
         try:
-            rc, drives = self.request("storage-systems/%s/drives" % self.ssid)
+            drives = self.get_snapshot("drives")
         except Exception as error:
             self.module.fail_json(msg="Failed to fetch disk drives. Array id [%s].  Error[%s]."
                                       % (self.ssid, to_native(error)))
 
         return drives
 
+    @property
+    def drive_index(self):
+        """Drive inventory index, built once for each retrieval of the drives."""
+        if "drive_index" not in self.snapshot:
+            self.snapshot["drive_index"] = DriveIndex(self.drives)
+        return self.snapshot["drive_index"]
+
+    @property
+    def capacity_model(self):
+        """Capacity model for the drive inventory, built once for each retrieval of the drives."""
+        if "capacity_model" not in self.snapshot:
+            self.snapshot["capacity_model"] = StoragePoolCapacityModel(self.drives)
+        return self.snapshot["capacity_model"]
+
     def is_drive_count_valid(self, drive_count):
         """Validate drive count criteria is met."""
         if self.criteria_drive_count and drive_count < self.criteria_drive_count:
@@ -348,7 +537,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         """Retrieve storage pool information."""
         storage_pools_resp = None
         try:
-            rc, storage_pools_resp = self.request("storage-systems/%s/storage-pools" % self.ssid)
+            storage_pools_resp = self.get_snapshot("storage-pools")
         except Exception as err:
             self.module.fail_json(msg="Failed to get storage pools. Array id [%s]. Error[%s]. State[%s]."
                                       % (self.ssid, to_native(err), self.state))
@@ -361,7 +550,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         """Retrieve list of volumes associated with storage pool."""
         volumes_resp = None
         try:
-            rc, volumes_resp = self.request("storage-systems/%s/volumes" % self.ssid)
+            volumes_resp = self.get_snapshot("volumes")
         except Exception as err:
             self.module.fail_json(msg="Failed to get storage pools. Array id [%s]. Error[%s]. State[%s]."
                                       % (self.ssid, to_native(err), self.state))
@@ -372,62 +561,6 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
 
     def get_ddp_capacity(self, expansion_drive_list):
         """Return the total usable capacity based on the additional drives."""
-
-        def get_ddp_error_percent(_drive_count, _extent_count):
-            """Determine the space reserved for reconstruction"""
-            if _drive_count <= 36:
-                if _extent_count <= 600:
-                    return 0.40
-                elif _extent_count <= 1400:
-                    return 0.35
-                elif _extent_count <= 6200:
-                    return 0.20
-                elif _extent_count <= 50000:
-                    return 0.15
-            elif _drive_count <= 64:
-                if _extent_count <= 600:
-                    return 0.20
-                elif _extent_count <= 1400:
-                    return 0.15
-                elif _extent_count <= 6200:
-                    return 0.10
-                elif _extent_count <= 50000:
-                    return 0.05
-            elif _drive_count <= 480:
-                if _extent_count <= 600:
-                    return 0.20
-                elif _extent_count <= 1400:
-                    return 0.15
-                elif _extent_count <= 6200:
-                    return 0.10
-                elif _extent_count <= 50000:
-                    return 0.05
-
-            self.module.fail_json(msg="Drive count exceeded the error percent table. Array[%s]" % self.ssid)
-
-        def get_ddp_reserved_drive_count(_disk_count):
-            """Determine the number of reserved drive."""
-            reserve_count = 0
-
-            if self.reserve_drive_count:
-                reserve_count = self.reserve_drive_count
-            elif _disk_count >= 256:
-                reserve_count = 8
-            elif _disk_count >= 192:
-                reserve_count = 7
-            elif _disk_count >= 128:
-                reserve_count = 6
-            elif _disk_count >= 64:
-                reserve_count = 4
-            elif _disk_count >= 32:
-                reserve_count = 3
-            elif _disk_count >= 12:
-                reserve_count = 2
-            elif _disk_count == 11:
-                reserve_count = 1
-
-            return reserve_count
-
         if self.pool_detail:
             drive_count = len(self.storage_pool_drives) + len(expansion_drive_list)
         else:
@@ -435,61 +568,64 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
 
         drive_usable_capacity = min(min(self.get_available_drive_capacities()),
                                     min(self.get_available_drive_capacities(expansion_drive_list)))
-        drive_data_extents = ((drive_usable_capacity - 8053063680) / 536870912)
-        maximum_stripe_count = (drive_count * drive_data_extents) / 10
-
-        error_percent = get_ddp_error_percent(drive_count, drive_data_extents)
-        error_overhead = (drive_count * drive_data_extents / 10 * error_percent + 10) / 10
+        try:
+            return self.capacity_model.get_ddp_capacity(drive_count, drive_usable_capacity, self.reserve_drive_count)
+        except ValueError:
+            self.module.fail_json(msg="Drive count exceeded the error percent table. Array[%s]" % self.ssid)
 
-        total_stripe_count = maximum_stripe_count - error_overhead
-        stripe_count_per_drive = total_stripe_count / drive_count
-        reserved_stripe_count = get_ddp_reserved_drive_count(drive_count) * stripe_count_per_drive
-        available_stripe_count = total_stripe_count - reserved_stripe_count
+    def get_capacity_plan(self):
+        """Determine the usable capacity of a storage pool built from each type of available drive.
 
-        return available_stripe_count * 4294967296
+        The criteria_drive_count drives of each type are evaluated, or every available drive of the type when no drive
+        count is specified. The plan is determined from the retrieved drives without further requests.
+        """
+        return self.capacity_model.plan(self.raid_level, self.criteria_drive_count, self.reserve_drive_count)
 
     @memoize
     def get_candidate_drives(self):
         """Retrieve set of drives candidates for creating a new storage pool."""
 
         def get_candidate_drive_request():
-            """Perform request for new volume creation."""
+            """Perform requests for new volume creation concurrently for each drive interface and media type."""
 
             candidates_list = list()
             drive_types = [self.criteria_drive_type] if self.criteria_drive_type else self.available_drive_types
             interface_types = [self.criteria_drive_interface_type] \
                 if self.criteria_drive_interface_type else self.available_drive_interface_types
-
-            for interface_type in interface_types:
-                for drive_type in drive_types:
-                    candidates = None
-                    volume_candidate_request_data = dict(
-                        type="diskPool" if self.raid_level == "raidDiskPool" else "traditional",
-                        diskPoolVolumeCandidateRequestData=dict(
-                            reconstructionReservedDriveCount=65535))
-                    candidate_selection_type = dict(
-                        candidateSelectionType="count",
-                        driveRefList=dict(driveRef=self.available_drives))
-                    criteria = dict(raidLevel=self.raid_level,
-                                    phyDriveType=interface_type,
-                                    dssPreallocEnabled=False,
-                                    securityType="capable" if self.criteria_drive_require_fde else "none",
-                                    driveMediaType=drive_type,
-                                    onlyProtectionInformationCapable=True if self.criteria_drive_require_da else False,
-                                    volumeCandidateRequestData=volume_candidate_request_data,
-                                    allocateReserveSpace=False,
-                                    securityLevel="fde" if self.criteria_drive_require_fde else "none",
-                                    candidateSelectionType=candidate_selection_type)
-
-                    try:
-                        rc, candidates = self.request("storage-systems/%s/symbol/getVolumeCandidates?verboseError"
-                                                      "Response=true" % self.ssid, data=criteria, method="POST")
-                    except Exception as error:
-                        self.module.fail_json(msg="Failed to retrieve volume candidates. Array [%s]. Error [%s]."
-                                                  % (self.ssid, to_native(error)))
-
-                    if candidates:
-                        candidates_list.extend(candidates["volumeCandidate"])
+            available_drives = self.available_drives
+
+            def request_candidates(interface_type, drive_type):
+                """Retrieve the volume candidates for a drive interface and media type."""
+                volume_candidate_request_data = dict(
+                    type="diskPool" if self.raid_level == "raidDiskPool" else "traditional",
+                    diskPoolVolumeCandidateRequestData=dict(
+                        reconstructionReservedDriveCount=65535))
+                candidate_selection_type = dict(
+                    candidateSelectionType="count",
+                    driveRefList=dict(driveRef=available_drives))
+                criteria = dict(raidLevel=self.raid_level,
+                                phyDriveType=interface_type,
+                                dssPreallocEnabled=False,
+                                securityType="capable" if self.criteria_drive_require_fde else "none",
+                                driveMediaType=drive_type,
+                                onlyProtectionInformationCapable=True if self.criteria_drive_require_da else False,
+                                volumeCandidateRequestData=volume_candidate_request_data,
+                                allocateReserveSpace=False,
+                                securityLevel="fde" if self.criteria_drive_require_fde else "none",
+                                candidateSelectionType=candidate_selection_type)
+
+                rc, candidates = self.request("storage-systems/%s/symbol/getVolumeCandidates?verboseError"
+                                              "Response=true" % self.ssid, data=criteria, method="POST")
+                return candidates
+
+            # Results are merged in interface and media type order so the ranking below is deterministic.
+            arguments = [(interface_type, drive_type) for interface_type in interface_types for drive_type in drive_types]
+            for candidates in run_concurrently(request_candidates, arguments, self.CANDIDATE_REQUEST_CONCURRENCY):
+                if isinstance(candidates, Exception):
+                    self.module.fail_json(msg="Failed to retrieve volume candidates. Array [%s]. Error [%s]."
+                                              % (self.ssid, to_native(candidates)))
+                if candidates:
+                    candidates_list.extend(candidates["volumeCandidate"])
 
             if candidates_list:
                 def candidate_sort_function(entry):
@@ -505,19 +641,28 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             return candidates_list
 
         # Determine the appropriate candidate list
-        for candidate in get_candidate_drive_request():
+        # disk pool usable capacity is based on the smallest available drive, consistent with get_ddp_capacity for expansions
+        candidates = get_candidate_drive_request()
+        available_drive_capacities = self.get_available_drive_capacities()
+        evaluations = self.capacity_model.evaluate(self.raid_level, [candidate["driveRefList"]["driveRef"] for candidate in candidates],
+                                                   drive_usable_capacity=min(available_drive_capacities) if available_drive_capacities else None,
+                                                   reserve_drive_count=self.reserve_drive_count)
+
+        for candidate, evaluation in zip(candidates, evaluations):
 
             # Evaluate candidates for required drive count, collective drive usable capacity and minimum drive size
             if self.criteria_drive_count:
                 if self.criteria_drive_count != int(candidate["driveCount"]):
                     continue
             if self.criteria_min_usable_capacity:
-                if ((self.raid_level == "raidDiskPool" and self.criteria_min_usable_capacity >
-                     self.get_ddp_capacity(candidate["driveRefList"]["driveRef"])) or
+                if self.raid_level == "raidDiskPool" and evaluation["usable_capacity"] is None:
+                    self.module.fail_json(msg="Drive count exceeded the error percent table. Array[%s]" % self.ssid)
+                if ((self.raid_level == "raidDiskPool" and self.criteria_min_usable_capacity > evaluation["usable_capacity"]) or
                         self.criteria_min_usable_capacity > int(candidate["usableSize"])):
                     continue
             if self.criteria_drive_min_size:
-                if self.criteria_drive_min_size > min(self.get_available_drive_capacities(candidate["driveRefList"]["driveRef"])):
+                candidate_drive_capacities = self.get_available_drive_capacities(candidate["driveRefList"]["driveRef"])
+                if not candidate_drive_capacities or self.criteria_drive_min_size > min(candidate_drive_capacities):
                     continue
 
             return candidate
@@ -570,6 +715,10 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         if required_additional_drives > 0 or required_additional_capacity > 0:
             for candidate in get_expansion_candidate_drive_request():
 
+                # Drives chosen for other storage pools in the storage pools list are not considered.
+                if self.claimed_drives.intersection(candidate["drives"]):
+                    continue
+
                 if self.criteria_drive_min_size:
                     if self.criteria_drive_min_size > min(self.get_available_drive_capacities(candidate["drives"])):
                         continue
@@ -651,27 +800,48 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                 except Exception as error:
                     self.module.fail_json(msg="Failed to set reserve drive count for disk pool. Disk Pool [%s]."
                                               " Array [%s]." % (self.pool_detail["id"], self.ssid))
+                self.invalidate_snapshot()
 
         return changed
 
     def erase_all_available_secured_drives(self, check_mode=False):
         """Erase all available drives that have encryption at rest feature enabled."""
-        changed = False
-        drives_list = list()
-        for drive in self.drives:
-            if drive["available"] and drive["fdeEnabled"]:
-                changed = True
-                drives_list.append(drive["id"])
+        drives_list = self.drive_index.get_drive_ids(available=True, fde_enabled=True)
+        changed = bool(drives_list)
 
         if drives_list and not check_mode:
-            try:
-                rc, resp = self.request("storage-systems/%s/symbol/reprovisionDrive?verboseErrorResponse=true"
-                                        % self.ssid, method="POST", data=dict(driveRef=drives_list))
-            except Exception as error:
-                self.module.fail_json(msg="Failed to erase all secured drives. Array [%s]" % self.ssid)
+            errors = self.reprovision_drives(drives_list)
+            self.invalidate_snapshot()
+            if errors:
+                self.module.fail_json(msg="Failed to erase all secured drives. Array [%s]. Drives [%s]. Error [%s]."
+                                          % (self.ssid, ", ".join(sorted(errors.keys())), "; ".join(sorted(set(errors.values())))))
 
         return changed
 
+    def reprovision_drives(self, drives):
+        """Erase secured drives with a single reprovisionDrive request.
+
+        When the request fails, each drive is erased with its own request (at most REPROVISION_CONCURRENCY at a time) so
+        that the drives which cannot be erased are identified.
+
+        :param list drives: drive references to erase.
+        :return dict: errors keyed by the references of the drives that could not be erased.
+        """
+        url = "storage-systems/%s/symbol/reprovisionDrive?verboseErrorResponse=true" % self.ssid
+        try:
+            rc, resp = self.request(url, method="POST", data=dict(driveRef=drives))
+            return dict()
+        except Exception as error:
+            if len(drives) == 1:
+                return {drives[0]: to_native(error)}
+            self.module.log("Failed to erase secured drives together, erasing each drive. Array [%s]. Error [%s]." % (self.ssid, to_native(error)))
+
+        def reprovision_drive(drive):
+            rc, resp = self.request(url, method="POST", data=dict(driveRef=[drive]))
+
+        outcomes = run_concurrently(reprovision_drive, [(drive,) for drive in drives], self.REPROVISION_CONCURRENCY)
+        return dict((drive, to_native(outcome)) for drive, outcome in zip(drives, outcomes) if isinstance(outcome, Exception))
+
     def create_storage_pool(self):
         """Create new storage pool."""
         url = "storage-systems/%s/symbol/createVolumeGroup?verboseErrorResponse=true" % self.ssid
@@ -699,11 +869,16 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                                       % (self.ssid, to_native(error)))
 
         # Update drive and storage pool information
+        self.invalidate_snapshot()
         self.pool_detail = self.storage_pool
 
-    def delete_storage_pool(self):
-        """Delete storage pool."""
-        storage_pool_drives = [drive["id"] for drive in self.storage_pool_drives if drive["fdeEnabled"]]
+    def delete_storage_pool(self, erase_secured_drives=True):
+        """Delete storage pool.
+
+        :param bool erase_secured_drives: whether the storage pool's secured drives are erased when I(erase_secured_drives)
+                                          is specified; False when they are erased together for the storage pools list.
+        """
+        storage_pool_drives = self.drive_index.get_drive_ids(volume_group=self.pool_detail["id"], hot_spare=False, fde_enabled=True)
         try:
             delete_volumes_parameter = "?delete-volumes=true" if self.remove_volumes else ""
             rc, resp = self.request("storage-systems/%s/storage-pools/%s%s"
@@ -711,14 +886,13 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         except Exception as error:
             self.module.fail_json(msg="Failed to delete storage pool. Pool id [%s]. Array id [%s].  Error[%s]."
                                       % (self.pool_detail["id"], self.ssid, to_native(error)))
+        self.invalidate_snapshot()
 
-        if storage_pool_drives and self.erase_secured_drives:
-            try:
-                rc, resp = self.request("storage-systems/%s/symbol/reprovisionDrive?verboseErrorResponse=true"
-                                        % self.ssid, method="POST", data=dict(driveRef=storage_pool_drives))
-            except Exception as error:
-                self.module.fail_json(msg="Failed to erase drives prior to creating new storage pool. Array [%s]."
-                                          " Error [%s]." % (self.ssid, to_native(error)))
+        if storage_pool_drives and self.erase_secured_drives and erase_secured_drives:
+            errors = self.reprovision_drives(storage_pool_drives)
+            if errors:
+                self.module.fail_json(msg="Failed to erase drives prior to creating new storage pool. Array [%s]. Drives [%s]."
+                                          " Error [%s]." % (self.ssid, ", ".join(sorted(errors.keys())), "; ".join(sorted(set(errors.values())))))
 
     def secure_storage_pool(self, check_mode=False):
         """Enable security on an existing storage pool"""
@@ -737,6 +911,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             except Exception as error:
                 self.module.fail_json(msg="Failed to secure storage pool. Pool id [%s]. Array [%s]. Error"
                                           " [%s]." % (self.pool_detail["id"], self.ssid, to_native(error)))
+            self.invalidate_snapshot()
 
         self.pool_detail = self.storage_pool
         return needs_secure_pool
@@ -756,33 +931,59 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             except Exception as error:
                 self.module.fail_json(msg="Failed to change the raid level of storage pool. Array id [%s]."
                                           "  Error[%s]." % (self.ssid, to_native(error)))
+            self.invalidate_snapshot()
 
         self.pool_detail = self.storage_pool
         return needs_migration
 
-    def expand_storage_pool(self, check_mode=False):
-        """Add drives to existing storage pool.
+    def get_expansion_plan(self):
+        """Determine the drive subsets required to expand the storage pool in submission order.
 
-        :return bool: whether drives were required to be added to satisfy the specified criteria."""
+        :return list(list): drive reference lists that are each submitted in a single expansion request.
+        """
         expansion_candidate_list = self.get_expansion_candidate_drives()
-        changed_required = bool(expansion_candidate_list)
-        estimated_completion_time = 0.0
+        expandable_drive_count = self.expandable_drive_count if expansion_candidate_list else 0
 
         # build expandable groupings of traditional raid candidate
-        required_expansion_candidate_list = list()
+        expansion_plan = list()
         while expansion_candidate_list:
             subset = list()
-            while expansion_candidate_list and len(subset) < self.expandable_drive_count:
+            while expansion_candidate_list and len(subset) < expandable_drive_count:
                 subset.extend(expansion_candidate_list.pop()["drives"])
-            required_expansion_candidate_list.append(subset)
+            expansion_plan.insert(0, subset)
 
-        if required_expansion_candidate_list and not check_mode:
+        return expansion_plan
+
+    def expand_storage_pool(self, check_mode=False):
+        """Add drives to existing storage pool.
+
+        The drive subsets are determined once and each is submitted as soon as the storage pool has completed any
+        expansion in progress. Each wait is bounded by I(wait_for_completion_timeout), or EXPANSION_STEP_TIMEOUT_SEC when
+        not specified. The final expansion is not waited on unless I(wait_for_completion) is specified.
+
+        :return bool, float: whether drives were required to be added to satisfy the specified criteria and the
+                             estimated minutes until the final expansion completes."""
+        expansion_plan = self.get_expansion_plan()
+        changed_required = bool(expansion_plan)
+        estimated_completion_time = 0.0
+
+        if expansion_plan and not check_mode:
             url = "storage-systems/%s/symbol/startVolumeGroupExpansion?verboseErrorResponse=true" % self.ssid
             if self.raid_level == "raidDiskPool":
                 url = "storage-systems/%s/symbol/startDiskPoolExpansion?verboseErrorResponse=true" % self.ssid
 
-            while required_expansion_candidate_list:
-                candidate_drives_list = required_expansion_candidate_list.pop()
+            storage_pool_volumes = set(self.storage_pool_volumes)
+            tracker = StoragePoolProgressTracker(self)
+            tracker.watch(self.pool_detail["id"], storage_pool_volumes, ["remappingDce"])
+            timeout = self.EXPANSION_STEP_TIMEOUT_SEC if self.wait_for_completion_timeout is None else self.wait_for_completion_timeout
+            for step, candidate_drives_list in enumerate(expansion_plan):
+                progress = tracker.wait(timeout)[self.pool_detail["id"]]
+                if progress["in_progress"]:
+                    self.module.fail_json(msg="Timed out waiting for the storage pool expansion to complete before adding drives. Step [%s of %s]."
+                                              " Percent complete [%s]. Estimated time to completion [%s minutes]. Pool id [%s]. Array id [%s]."
+                                              % (step + 1, len(expansion_plan), progress["percent_complete"], progress["estimated_time_to_completion"],
+                                                 self.pool_detail["id"], self.ssid), progress=progress)
+
                 request_body = dict(volumeGroupRef=self.pool_detail["volumeGroupRef"],
                                     driveRef=candidate_drives_list)
                 try:
@@ -792,7 +993,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                                                     % (self.ssid, self.pool_detail["id"]), ignore_errors=True)
                     if rc == 200 and actions_resp:
                         actions = [action["currentAction"] for action in actions_resp
-                                   if action["volumeRef"] in self.storage_pool_volumes]
+                                   if action["volumeRef"] in storage_pool_volumes]
                         self.module.fail_json(msg="Failed to add drives to the storage pool possibly because of actions"
                                                   " in progress. Actions [%s]. Pool id [%s]. Array id [%s]. Error[%s]."
                                                   % (", ".join(actions), self.pool_detail["id"], self.ssid,
@@ -800,27 +1001,18 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
 
                     self.module.fail_json(msg="Failed to add drives to storage pool. Pool id [%s]. Array id [%s]."
                                               "  Error[%s]." % (self.pool_detail["id"], self.ssid, to_native(error)))
+                self.invalidate_snapshot()
+                self.module.log("Submitted storage pool expansion %s of %s. Pool [%s]. Array [%s]."
+                                % (step + 1, len(expansion_plan), self.pool_detail["id"], self.ssid))
 
-                # Wait for expansion completion unless it is the last request in the candidate list
-                if required_expansion_candidate_list:
-                    for dummy in range(self.EXPANSION_TIMEOUT_SEC):
-                        rc, actions_resp = self.request("storage-systems/%s/storage-pools/%s/action-progress"
-                                                        % (self.ssid, self.pool_detail["id"]), ignore_errors=True)
-                        if rc == 200:
-                            for action in actions_resp:
-                                if (action["volumeRef"] in self.storage_pool_volumes and
-                                        action["currentAction"] == "remappingDce"):
-                                    sleep(1)
-                                    estimated_completion_time = action["estimatedTimeToCompletion"]
-                                    break
-                            else:
-                                estimated_completion_time = 0.0
-                                break
+            estimated_completion_time = tracker.get_progress()[self.pool_detail["id"]]["estimated_time_to_completion"]
 
         return changed_required, estimated_completion_time
 
-    def apply(self):
-        """Apply requested state to storage array."""
+    def determine_change(self):
+        """Determine whether changes are required for the storage pool to satisfy the specified criteria.
+
+        :return bool: whether changes are required."""
         changed = False
 
         if self.state == "present":
@@ -871,50 +1063,220 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         elif self.state == "present":
             changed = True
 
-        # Apply changes to storage array
+        return changed
+
+    def apply_change(self, erase_secured_drives=True):
+        """Apply the changes required for the storage pool to satisfy the specified criteria.
+
+        :param bool erase_secured_drives: whether secured drives are erased when I(erase_secured_drives) is specified;
+                                          False when they are erased together for the storage pools list.
+        :return str: message describing the applied changes."""
         msg = "No changes were required for the storage pool [%s]."
-        if changed and not self.module.check_mode:
-            if self.state == "present":
-                if self.erase_secured_drives:
-                    self.erase_all_available_secured_drives()
-
-                if self.pool_detail:
-                    change_list = list()
-
-                    # Expansion needs to occur before raid level migration to account for any sizing needs.
-                    expanded, estimated_completion_time = self.expand_storage_pool()
-                    if expanded:
-                        change_list.append("expanded")
-                    if self.migrate_raid_level():
-                        change_list.append("raid migration")
-                    if self.secure_storage_pool():
-                        change_list.append("secured")
-                    if self.set_reserve_drive_count():
-                        change_list.append("adjusted reserve drive count")
-
-                    if change_list:
-                        msg = "Following changes have been applied to the storage pool [%s]: " + ", ".join(change_list)
-
-                    if expanded:
-                        msg += "\nThe expansion operation will complete in an estimated %s minutes."\
-                               % estimated_completion_time
-                else:
-                    self.create_storage_pool()
-                    msg = "Storage pool [%s] was created."
+        if self.state == "present":
+            if self.erase_secured_drives and erase_secured_drives:
+                self.erase_all_available_secured_drives()
+
+            if self.pool_detail:
+                change_list = list()
+
+                # Expansion needs to occur before raid level migration to account for any sizing needs.
+                expanded, estimated_completion_time = self.expand_storage_pool()
+                if expanded:
+                    change_list.append("expanded")
+                if self.migrate_raid_level():
+                    change_list.append("raid migration")
+                if self.secure_storage_pool():
+                    change_list.append("secured")
+                if self.set_reserve_drive_count():
+                    change_list.append("adjusted reserve drive count")
+
+                if change_list:
+                    msg = "Following changes have been applied to the storage pool [%s]: " + ", ".join(change_list)
+
+                if expanded:
+                    msg += "\nThe expansion operation will complete in an estimated %s minutes."\
+                           % estimated_completion_time
+            else:
+                self.create_storage_pool()
+                msg = "Storage pool [%s] was created."
+
+                if self.secure_storage_pool():
+                    msg = "Storage pool [%s] was created and secured."
+                if self.set_reserve_drive_count():
+                    msg += " Adjusted reserve drive count."
+
+        elif self.pool_detail:
+            self.delete_storage_pool(erase_secured_drives)
+            msg = "Storage pool [%s] removed."
+
+        return msg % self.name
+
+    def wait_for_storage_pools(self, storage_pool_ids):
+        """Wait for the operations in progress for the storage pools to complete.
+
+        :param list storage_pool_ids: storage pool identifiers.
+        :return dict: storage pool id keyed progress (see StoragePoolProgressTracker.get_storage_pool_progress).
+        """
+        tracker = StoragePoolProgressTracker(self)
+        for storage_pool_id in storage_pool_ids:
+            tracker.watch(storage_pool_id)
+
+        self.module.log("Waiting for storage pool operations to complete.")
+        try:
+            progress = tracker.wait(self.wait_for_completion_timeout)
+        except Exception as error:
+            self.module.fail_json(msg="Failed to get storage pool operation progress. Array [%s]. Error[%s]." % (self.ssid, to_native(error)))
+        self.module.log("Storage pool operations are complete.")
+        return progress
+
+    def get_storage_pool_context(self, spec):
+        """Create a copy of this instance that reconciles a single storage pool from the storage pools list.
+
+        The copy shares the retrieved storage system collections but not memoized results. Failures within the copy
+        raise DeferredFailure so that the remaining storage pools are unaffected."""
+        context = copy.copy(self)
+        context.module = DeferredFailureModule(self.module)
+        context.set_storage_pool_spec(spec)
+        context.claimed_drives = set()
+        clear_memoized(context)
+        return context
+
+    def plan_storage_pool(self, context, claimed_drives):
+        """Determine the changes required for a storage pool and the drives it requires.
+
+        :param NetAppESeriesStoragePool context: storage pool context.
+        :param set claimed_drives: drives already chosen for other storage pools.
+        :return bool, list: whether changes are required and the drives chosen for a new storage pool or expansion.
+        """
+        context.claimed_drives = set(claimed_drives)
+        changed = context.determine_change()
+
+        drives = list()
+        if changed and context.state == "present":
+            if context.pool_detail:
+                for subset in context.get_expansion_plan():
+                    drives.extend(subset)
+            else:
+                drives = list(context.get_candidate_drives()["driveRefList"]["driveRef"])
+        return changed, drives
+
+    def apply_contexts(self, contexts, results, erase_secured_drives=True):
+        """Apply the changes for each storage pool context concurrently and record the outcomes in results."""
+        outcomes = run_concurrently(NetAppESeriesStoragePool.apply_change, [(context, erase_secured_drives) for context in contexts], self.concurrency)
+        for context, outcome in zip(contexts, outcomes):
+            if isinstance(outcome, Exception):
+                results[context.name].update(dict(failed=True, msg=outcome.msg if isinstance(outcome, DeferredFailure) else to_native(outcome)))
+            else:
+                results[context.name]["msg"] = outcome
 
-                    if self.secure_storage_pool():
-                        msg = "Storage pool [%s] was created and secured."
-                    if self.set_reserve_drive_count():
-                        msg += " Adjusted reserve drive count."
+    def apply_storage_pools(self):
+        """Reconcile every storage pool in the storage pools list against a single drive inventory.
 
-            elif self.pool_detail:
-                self.delete_storage_pool()
-                msg = "Storage pool [%s] removed."
+        :raise AnsibleExitJson when all storage pools are successfully reconciled.
+        :raise AnsibleFailJson when any storage pool fails to be reconciled.
+        """
+        results = OrderedDict((spec["name"], dict(name=spec["name"], changed=False, failed=False, msg=None, drives=list()))
+                              for spec in self.storage_pools)
+        change = False
+
+        # Storage pools are removed first so their drives are available to the remaining storage pools.
+        removals = list()
+        for spec in [spec for spec in self.storage_pools if spec["state"] == "absent"]:
+            context = self.get_storage_pool_context(spec)
+            try:
+                results[context.name]["changed"] = self.plan_storage_pool(context, set())[0]
+            except DeferredFailure as error:
+                results[context.name].update(dict(failed=True, msg=error.msg))
+                continue
+            results[context.name]["msg"] = "Storage pool [%s] does not exist." % context.name
+            if results[context.name]["changed"]:
+                change = True
+                removals.append(context)
+
+        if removals and not self.module.check_mode:
+            secured_drives = dict((context.name, context.drive_index.get_drive_ids(volume_group=context.pool_detail["id"], hot_spare=False, fde_enabled=True))
+                                  for context in removals if context.erase_secured_drives)
+            self.apply_contexts(removals, results, erase_secured_drives=False)
+
+            # The secured drives of every removed storage pool are erased together.
+            drives = dict((drive, name) for name, drive_list in secured_drives.items() if not results[name]["failed"] for drive in drive_list)
+            if drives:
+                errors = self.reprovision_drives(list(drives.keys()))
+                for name in sorted(set([drives[drive] for drive in errors.keys()])):
+                    failed = sorted([drive for drive in errors.keys() if drives[drive] == name])
+                    results[name].update(dict(failed=True, msg="Failed to erase drives of removed storage pool [%s]. Drives [%s]. Error [%s]. Array [%s]."
+                                                               % (name, ", ".join(failed), "; ".join(sorted(set(errors[drive] for drive in failed))),
+                                                                  self.ssid)))
+            self.invalidate_snapshot()
+
+        # Existing storage pools are limited to their expansion candidates so they choose drives first, followed by new
+        # storage pools with the largest first to give them the best tray and drawer loss protection.
+        contexts = [self.get_storage_pool_context(spec) for spec in self.storage_pools if spec["state"] == "present"]
+        existing = set()
+        if contexts:
+            try:
+                existing = set([storage_pool["name"] for storage_pool in self.get_snapshot("storage-pools")])
+            except Exception as error:
+                self.module.fail_json(msg="Failed to get storage pools. Array id [%s]. Error[%s]." % (self.ssid, to_native(error)))
+        claimed_drives = set()
+        changed_contexts = list()
+        for context in sorted(contexts, key=lambda entry: (entry.name not in existing, -(entry.criteria_drive_count or 0))):
+            try:
+                changed, drives = self.plan_storage_pool(context, claimed_drives)
+            except DeferredFailure as error:
+                results[context.name].update(dict(failed=True, msg=error.msg))
+                continue
+
+            claimed_drives.update(drives)
+            results[context.name].update(dict(changed=changed, drives=drives, msg="Storage pool [%s] exists." % context.name))
+            if changed:
+                change = True
+                changed_contexts.append(context)
+
+        if changed_contexts and not self.module.check_mode:
+            erase_secured_drives = [context for context in changed_contexts if context.erase_secured_drives]
+            if erase_secured_drives:
+                self.erase_all_available_secured_drives()
+            self.apply_contexts([context for context in contexts if context in changed_contexts], results, erase_secured_drives=False)
+
+            if self.wait_for_completion:
+                waiting = dict((context.pool_detail["id"], context.name) for context in changed_contexts
+                               if not results[context.name]["failed"] and context.pool_detail)
+                for storage_pool_id, progress in self.wait_for_storage_pools(list(waiting.keys())).items():
+                    results[waiting[storage_pool_id]]["progress"] = progress
+
+        results = list(results.values())
+        failed = [result["name"] for result in results if result["failed"]]
+        if failed:
+            self.module.fail_json(msg="Failed to reconcile storage pools [%s]. Array [%s]." % (", ".join(failed), self.ssid), changed=change,
+                                  storage_pools=results)
+
+        self.module.exit_json(msg="Reconciled %s storage pools." % len(results), changed=change, storage_pools=results)
+
+    def apply(self):
+        """Apply requested state to storage array."""
+        if self.storage_pools is not None:
+            self.apply_storage_pools()
+
+        changed = self.determine_change()
+
+        # Apply changes to storage array
+        msg = "No changes were required for the storage pool [%s]." % self.name
+        progress = None
+        if changed and not self.module.check_mode:
+            msg = self.apply_change()
+            if self.wait_for_completion and self.state == "present":
+                progress = self.wait_for_storage_pools([self.pool_detail["id"]])[self.pool_detail["id"]]
 
         self.pool_detail = self.storage_pool
         self.module.log(pformat(self.pool_detail))
-        self.module.log(msg % self.name)
-        self.module.exit_json(msg=msg % self.name, changed=changed, **self.pool_detail)
+        self.module.log(msg)
+
+        if self.module.check_mode and self.state == "present":
+            self.module.exit_json(msg=msg, changed=changed, capacity_plan=self.get_capacity_plan(), **self.pool_detail)
+        if progress is not None:
+            self.module.exit_json(msg=msg, changed=changed, progress=progress, **self.pool_detail)
+        self.module.exit_json(msg=msg, changed=changed, **self.pool_detail)
 
 
 def main():
@@ -27,8 +27,10 @@ options:
     name:
         description:
             - The name of the volume to manage.
+            - Required unless I(volumes) is specified.
+            - Mutually exclusive with I(volumes).
         type: str
-        required: true
+        required: false
     storage_pool_name:
         description:
             - Required only when requested I(state=="present").
@@ -49,7 +51,7 @@ options:
             - Maximum virtual volume size of a thin provisioned volume is 256tb; however other OS-level restrictions may
               exist.
         type: float
-        required: true
+        required: false
     segment_size_kb:
         description:
             - Segment size of the volume
@@ -193,6 +195,129 @@ options:
     wait_for_initialization:
         description:
             - Forces the module to wait for expansion operations to complete before continuing.
+            - When false, handles for the submitted operations are returned in I(operations) so their progress can be
+              determined later with M(na_santricity_volume_progress).
+        type: bool
+        default: false
+        required: false
+    volumes:
+        description:
+            - List of volumes to manage in a single task.
+            - The storage array state is retrieved once and then each volume is reconciled concurrently.
+            - The capacity required by every volume creation and expansion, including initial thin volume repositories,
+              is allocated against each storage pool's free capacity before any change is applied. Volumes that cannot
+              be accommodated together are not changed and a warning is issued when thin volume repositories could not
+              all grow to I(thin_volume_max_repo_size).
+            - Each entry accepts the volume options above; any option not specified in an entry defaults to the task's
+              value for that option.
+            - Mutually exclusive with I(name).
+        type: list
+        elements: dict
+        required: false
+        suboptions:
+            state:
+                description: Whether the specified volume should exist.
+                type: str
+                choices: ["present", "absent"]
+            name:
+                description: The name of the volume to manage.
+                type: str
+                required: true
+            storage_pool_name:
+                description: Name of the storage pool wherein the volume should reside.
+                type: str
+            size_unit:
+                description: The unit used to interpret the size parameter.
+                type: str
+                choices: ["bytes", "b", "kb", "mb", "gb", "tb", "pb", "eb", "zb", "yb"]
+            size:
+                description: Size of the volume in I(size_unit).
+                type: float
+            segment_size_kb:
+                description: Segment size of the volume in kibibytes.
+                type: int
+            thin_provision:
+                description: Whether the volume should be thin provisioned.
+                type: bool
+            thin_volume_repo_size:
+                description: Allocated space for the thin provisioned repository in I(size_unit).
+                type: int
+            thin_volume_max_repo_size:
+                description: Maximum amount the thin volume repository will be allowed to grow.
+                type: float
+            thin_volume_expansion_policy:
+                description: The thin volume expansion policy.
+                type: str
+                choices: ["automatic", "manual"]
+            thin_volume_growth_alert_threshold:
+                description: The thin provision repository utilization threshold (in percent).
+                type: int
+            owning_controller:
+                description: Specifies which controller will be the primary owner of the volume.
+                type: str
+                choices: ["A", "B"]
+            ssd_cache_enabled:
+                description: Whether an existing SSD cache should be enabled on the volume.
+                type: bool
+            data_assurance_enabled:
+                description: Whether data assurance (DA) should be enabled for the volume.
+                type: bool
+            read_cache_enable:
+                description: Whether read caching should be enabled for the volume.
+                type: bool
+            read_ahead_enable:
+                description: Whether automatic cache read-ahead is enabled.
+                type: bool
+            write_cache_enable:
+                description: Whether write-back caching should be enabled for the volume.
+                type: bool
+            cache_without_batteries:
+                description: Whether caching should be used without battery backup.
+                type: bool
+            workload_name:
+                description: Label for the workload defined by the metadata.
+                type: str
+            workload_metadata:
+                description: Dictionary containing meta data for the workload.
+                type: dict
+                aliases:
+                    - metadata
+            volume_metadata:
+                description: Dictionary containing metadata for the volume itself.
+                type: dict
+            wait_for_initialization:
+                description: Forces the module to wait for expansion operations to complete before continuing.
+                type: bool
+    concurrency:
+        description:
+            - Maximum number of volumes from I(volumes) that will be reconciled at the same time.
+        type: int
+        default: 8
+        required: false
+    expansion_concurrency:
+        description:
+            - Maximum number of volume expansions from I(volumes) in progress at the same time in each storage pool.
+            - Further expansions are submitted as expansions in the storage pool complete.
+            - The free capacity of each storage pool is verified for all of its expansions before any volume is changed.
+        type: int
+        default: 2
+        required: false
+    expansion_timeout:
+        description:
+            - Maximum number of seconds to wait for an expansion from I(volumes) in progress to complete before the next queued
+              expansion in the storage pool can be submitted.
+            - The module fails with the progress of each expansion in progress when the timeout expires.
+        type: int
+        default: 3600
+        required: false
+    delete_dependencies:
+        description:
+            - Whether objects that depend on volumes from I(volumes) with I(state=absent) are deleted along with the volumes.
+            - Dependent objects are lun mappings, volume copy pairs, asynchronous mirror group memberships, snapshot volumes and
+              snapshot groups.
+            - The dependencies are determined from a single retrieval of the storage system graph and deleted before their
+              volumes, concurrently where the dependencies allow.
+            - When false, volumes with dependent objects are not deleted and are reported as failed.
         type: bool
         default: false
         required: false
@@ -272,6 +397,23 @@ EXAMPLES = """
     validate_certs: true
     state: absent
     name: volume
+
+- name: Create several volumes with shared defaults
+  na_santricity_volume:
+    ssid: "1"
+    api_url: "https://192.168.1.100:8443/devmgr/v2"
+    api_username: "admin"
+    api_password: "adminpass"
+    validate_certs: true
+    storage_pool_name: storage_pool
+    size: 100
+    size_unit: gb
+    volumes:
+      - name: volume1
+      - name: volume2
+        size: 200
+      - name: volume3
+        state: absent
 """
 RETURN = """
 msg:
@@ -279,11 +421,55 @@ msg:
     type: str
     returned: always
     sample: "Standard volume [workload_vol_1] has been created."
+plan:
+    description:
+        - Change plan for the volume; determined without contacting the storage array once the volume, storage pool and
+          workload tag details are retrieved.
+        - I(action) is create, update, delete or null. I(create), I(update), I(expand) and I(delete) contain the request
+          path and body for each required step or are null.
+        - Property changes for a volume that is to be created are determined from the created volume.
+    type: dict
+    returned: when I(name) is specified and the volume details could be retrieved
+    sample: {"name": "volume1", "action": "update", "create": null, "delete": null,
+             "update": null, "expand": {"path": "storage-systems/1/volumes/02000000600A098000A4B9D1000037315D494C6F/expand",
+                                        "body": {"sizeUnit": "bytes", "expansionSize": 214748364800}}}
+volumes:
+    description:
+        - Result for each volume when I(volumes) is specified.
+        - Each result contains the volume's change plan which has the same structure as I(plan). The plan for a volume that
+          is to be deleted also lists the dependent objects to delete.
+    type: list
+    returned: when I(volumes) is specified
+    sample: [{"name": "volume1", "changed": true, "failed": false, "msg": "Volume [volume1] has been created.",
+              "plan": {"name": "volume1", "action": "create", "update": null, "expand": null, "delete": null,
+                       "create": {"path": "storage-systems/1/volumes", "body": {"name": "volume1", "poolId": "04000000600A098000A4B9D10000",
+                                                                               "sizeUnit": "bytes", "size": 107374182400, "segSize": 128,
+                                                                               "dataAssuranceEnabled": false}}}}]
+operations:
+    description:
+        - Handles for the volume creations and expansions submitted but not waited on.
+        - Provide the handles to M(na_santricity_volume_progress) to determine the progress of every operation with a single
+          request to the storage system.
+    type: list
+    returned: on success
+    sample: [{"ssid": "1", "volume_ref": "02000000600A098000A4B9D1000037315D494C6F", "name": "volume1", "action": "create",
+              "start_time": 1760745600}]
+deleted_objects:
+    description: Objects deleted for volumes from I(volumes) with I(state=absent), in deletion order, with the time each deletion took.
+    type: list
+    returned: when I(volumes) is specified
+    sample: [{"type": "lun_mapping", "id": "880000006D039EA0000000000000000000000000", "volume": "volume3", "failed": false, "seconds": 0.412},
+             {"type": "volume", "id": "02000000600A098000A4B9D1000037315D494C6F", "volume": "volume3", "failed": false, "seconds": 1.208}]
 """
 
+import copy
 import time
+from collections import OrderedDict
 
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, DeferredFailure, DeferredFailureModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import ObjectResolver, VolumeProgressTracker, run_concurrently
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import check_concurrency, get_list_entry_argument_spec
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import get_list_entry_options
 from ansible.module_utils._text import to_native
 
 
@@ -292,11 +478,14 @@ class NetAppESeriesVolume(NetAppESeriesModule):
     MAXIMUM_VOLUME_METADATA_KEY_LENGTH = 14
     MAXIMUM_VOLUME_METADATA_VALUE_LENGTH = 240
     MAXIMUM_VOLUME_METADATA_VALUE_SEGMENT_LENGTH = 60
+    DEFAULT_CONCURRENCY = 8
+    DEFAULT_EXPANSION_CONCURRENCY = 2
+    DEFAULT_EXPANSION_TIMEOUT_SEC = 3600
 
     def __init__(self):
         ansible_options = dict(
             state=dict(choices=["present", "absent"], default="present"),
-            name=dict(required=True, type="str"),
+            name=dict(type="str"),
             storage_pool_name=dict(type="str"),
             size_unit=dict(default="gb", choices=["bytes", "b", "kb", "mb", "gb", "tb", "pb", "eb", "zb", "yb"], type="str"),
             size=dict(type="float"),
@@ -318,63 +507,114 @@ class NetAppESeriesVolume(NetAppESeriesModule):
             volume_metadata=dict(type="dict", require=False),
             wait_for_initialization=dict(type="bool", default=False))
 
-        required_if = [
-            ["state", "present", ["storage_pool_name", "size"]],
-            ["thin_provision", "true", ["thin_volume_repo_size"]]
-        ]
+        volume_options = get_list_entry_argument_spec(ansible_options, required=["name"])
+        ansible_options.update(dict(volumes=dict(type="list", elements="dict", options=volume_options, required=False),
+                                    concurrency=dict(type="int", default=self.DEFAULT_CONCURRENCY, required=False),
+                                    expansion_concurrency=dict(type="int", default=self.DEFAULT_EXPANSION_CONCURRENCY, required=False),
+                                    expansion_timeout=dict(type="int", default=self.DEFAULT_EXPANSION_TIMEOUT_SEC, required=False),
+                                    delete_dependencies=dict(type="bool", default=False, required=False)))
+
+        mutually_exclusive = [["name", "volumes"]]
+        required_one_of = [["name", "volumes"]]
+        required_if = [["thin_provision", "true", ["thin_volume_repo_size"]]]
 
         super(NetAppESeriesVolume, self).__init__(ansible_options=ansible_options,
                                                   web_services_version="02.00.0000.0000",
                                                   supports_check_mode=True,
-                                                  required_if=required_if)
+                                                  mutually_exclusive=mutually_exclusive,
+                                                  required_if=required_if,
+                                                  required_one_of=required_one_of)
 
         args = self.module.params
-        self.state = args["state"]
-        self.name = args["name"]
-        self.storage_pool_name = args["storage_pool_name"]
-        self.size_unit = args["size_unit"]
-        self.segment_size_kb = args["segment_size_kb"]
-        if args["size"]:
-            self.size_b = self.convert_to_aligned_bytes(args["size"])
-
-        self.owning_controller_id = None
-        if args["owning_controller"]:
-            self.owning_controller_id = "070000000000000000000001" if args["owning_controller"] == "A" else "070000000000000000000002"
-
-        self.read_cache_enable = args["read_cache_enable"]
-        self.read_ahead_enable = args["read_ahead_enable"]
-        self.write_cache_enable = args["write_cache_enable"]
-        self.ssd_cache_enabled = args["ssd_cache_enabled"]
-        self.cache_without_batteries = args["cache_without_batteries"]
-        self.data_assurance_enabled = args["data_assurance_enabled"]
-
-        self.thin_provision = args["thin_provision"]
-        self.thin_volume_expansion_policy = args["thin_volume_expansion_policy"]
-        self.thin_volume_growth_alert_threshold = int(args["thin_volume_growth_alert_threshold"])
-        self.thin_volume_repo_size_b = None
-        self.thin_volume_max_repo_size_b = None
-
-        if args["thin_volume_repo_size"]:
-            self.thin_volume_repo_size_b = self.convert_to_aligned_bytes(args["thin_volume_repo_size"])
-        if args["thin_volume_max_repo_size"]:
-            self.thin_volume_max_repo_size_b = self.convert_to_aligned_bytes(args["thin_volume_max_repo_size"])
-
-        self.workload_name = args["workload_name"]
-        self.wait_for_initialization = args["wait_for_initialization"]
+        self.concurrency = args["concurrency"]
+        self.expansion_concurrency = args["expansion_concurrency"]
+        self.expansion_timeout = args["expansion_timeout"]
+        self.delete_dependencies = args["delete_dependencies"]
+        try:
+            check_concurrency(concurrency=self.concurrency, expansion_concurrency=self.expansion_concurrency)
+        except ValueError as error:
+            self.module.fail_json(msg="%s Array [%s]." % (to_native(error), self.ssid))
+
+        self.volumes = None
+        if args["volumes"] is None:
+            self.set_volume_spec(self.get_volume_spec(args))
+        else:
+            try:
+                entries = get_list_entry_options(args, "volumes")
+            except ValueError as error:
+                self.module.fail_json(msg="Volume names must be unique. Duplicates [%s]. Array [%s]." % (to_native(error), self.ssid))
+            self.volumes = [self.get_volume_spec(options, list_entry=True) for options in entries]
+
+        self.volume_detail = None
+        self.pool_detail = None
+        self.workload_id = None
+        self.workload_tags = None
+        self.workload_reconciled = False
+        self.expansion_pending = False
+        self.plan = None
+        self.operation = None
+        self.resolver = ObjectResolver(self.request, self.ssid)
+
+    def get_volume_spec(self, options, list_entry=False):
+        """Normalize volume options into the attributes used to reconcile a single volume.
+
+        :param dict options: volume options keyed by the module's volume option names.
+        :param bool list_entry: whether the options are for a volumes list entry, which the module's required_if does not check.
+        :return dict: volume attributes keyed by NetAppESeriesVolume member name.
+        """
+        spec = dict(state=options["state"],
+                    name=options["name"],
+                    storage_pool_name=options["storage_pool_name"],
+                    size_unit=options["size_unit"],
+                    segment_size_kb=options["segment_size_kb"],
+                    size_b=None,
+                    owning_controller_id=None,
+                    read_cache_enable=options["read_cache_enable"],
+                    read_ahead_enable=options["read_ahead_enable"],
+                    write_cache_enable=options["write_cache_enable"],
+                    ssd_cache_enabled=options["ssd_cache_enabled"],
+                    cache_without_batteries=options["cache_without_batteries"],
+                    data_assurance_enabled=options["data_assurance_enabled"],
+                    thin_provision=options["thin_provision"],
+                    thin_volume_expansion_policy=options["thin_volume_expansion_policy"],
+                    thin_volume_growth_alert_threshold=int(options["thin_volume_growth_alert_threshold"]),
+                    thin_volume_repo_size_b=None,
+                    thin_volume_max_repo_size_b=None,
+                    workload_name=options["workload_name"],
+                    wait_for_initialization=options["wait_for_initialization"],
+                    metadata=[],
+                    volume_metadata=[])
+
+        if not spec["name"]:
+            self.module.fail_json(msg="Volume name must be specified. Array [%s]." % self.ssid)
+
+        if spec["state"] == "present" and (not spec["storage_pool_name"] or options["size"] is None):
+            self.module.fail_json(msg="Both storage_pool_name and size are required when state is present. Volume [%s]. Array [%s]."
+                                      % (spec["name"], self.ssid))
+
+        if options["size"]:
+            spec["size_b"] = self.convert_to_aligned_bytes(options["size"], spec["size_unit"], spec["segment_size_kb"])
+
+        if options["owning_controller"]:
+            spec["owning_controller_id"] = "070000000000000000000001" if options["owning_controller"] == "A" else "070000000000000000000002"
+
+        if options["thin_volume_repo_size"]:
+            spec["thin_volume_repo_size_b"] = self.convert_to_aligned_bytes(options["thin_volume_repo_size"], spec["size_unit"], spec["segment_size_kb"])
+        if options["thin_volume_max_repo_size"]:
+            spec["thin_volume_max_repo_size_b"] = self.convert_to_aligned_bytes(options["thin_volume_max_repo_size"], spec["size_unit"],
+                                                                                spec["segment_size_kb"])
 
         # convert metadata to a list of dictionaries containing the keys "key" and "value" corresponding to
         #   each of the workload attributes dictionary entries
-        self.metadata = []
-        if self.state == "present" and args["workload_metadata"]:
-            if not self.workload_name:
+        if spec["state"] == "present" and options["workload_metadata"]:
+            if not spec["workload_name"]:
                 self.module.fail_json(msg="When metadata is specified then the name for the workload must be specified. Array [%s]." % self.ssid)
 
-            for key, value in args["workload_metadata"].items():
-                self.metadata.append({"key": key, "value": value})
+            for key, value in options["workload_metadata"].items():
+                spec["metadata"].append({"key": key, "value": value})
 
-        self.volume_metadata = []
-        if self.state == "present" and args["volume_metadata"]:
-            for key, value in args["volume_metadata"].items():
+        if spec["state"] == "present" and options["volume_metadata"]:
+            for key, value in options["volume_metadata"].items():
                 key, value = str(key), str(value)
 
                 if len(key) > self.MAXIMUM_VOLUME_METADATA_KEY_LENGTH:
@@ -388,122 +628,125 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                 if value:
                     for index, start in enumerate(range(0, len(value), self.MAXIMUM_VOLUME_METADATA_VALUE_SEGMENT_LENGTH)):
                         if len(value) > start + self.MAXIMUM_VOLUME_METADATA_VALUE_SEGMENT_LENGTH:
-                            self.volume_metadata.append({"key": "%s~%s" % (key, str(index)), "value": value[start:start + self.MAXIMUM_VOLUME_METADATA_VALUE_SEGMENT_LENGTH]})
+                            spec["volume_metadata"].append({"key": "%s~%s" % (key, str(index)),
+                                                            "value": value[start:start + self.MAXIMUM_VOLUME_METADATA_VALUE_SEGMENT_LENGTH]})
                         else:
-                            self.volume_metadata.append({"key": "%s~%s" % (key, str(index)), "value": value[start:len(value)]})
+                            spec["volume_metadata"].append({"key": "%s~%s" % (key, str(index)), "value": value[start:len(value)]})
                 else:
-                    self.volume_metadata.append({"key": "%s~0" % key, "value": ""})
+                    spec["volume_metadata"].append({"key": "%s~0" % key, "value": ""})
+
+        if spec["state"] == "present" and spec["thin_provision"]:
+            if list_entry and not spec["thin_volume_repo_size_b"]:
+                self.module.fail_json(msg="thin_volume_repo_size is required when thin_provision is true. Volume [%s]. Array [%s]."
+                                          % (spec["name"], self.ssid))
 
-        if self.state == "present" and self.thin_provision:
-            if not self.thin_volume_max_repo_size_b:
-                self.thin_volume_max_repo_size_b = self.size_b
+            if not spec["thin_volume_max_repo_size_b"]:
+                spec["thin_volume_max_repo_size_b"] = spec["size_b"]
 
-            if not self.thin_volume_expansion_policy:
-                self.thin_volume_expansion_policy = "automatic"
+            if not spec["thin_volume_expansion_policy"]:
+                spec["thin_volume_expansion_policy"] = "automatic"
 
-            if self.size_b > 256 * 1024 ** 4:
+            if spec["size_b"] > 256 * 1024 ** 4:
                 self.module.fail_json(msg="Thin provisioned volumes must be less than or equal to 256tb is size."
-                                          " Attempted size [%sg]" % (self.size_b * 1024 ** 3))
+                                          " Attempted size [%sg]" % (spec["size_b"] * 1024 ** 3))
 
-            if (self.thin_volume_repo_size_b and self.thin_volume_max_repo_size_b and
-                    self.thin_volume_repo_size_b > self.thin_volume_max_repo_size_b):
+            if (spec["thin_volume_repo_size_b"] and spec["thin_volume_max_repo_size_b"] and
+                    spec["thin_volume_repo_size_b"] > spec["thin_volume_max_repo_size_b"]):
                 self.module.fail_json(msg="The initial size of the thin volume must not be larger than the maximum"
                                           " repository size. Array [%s]." % self.ssid)
 
-            if self.thin_volume_growth_alert_threshold < 10 or self.thin_volume_growth_alert_threshold > 99:
+            if spec["thin_volume_growth_alert_threshold"] < 10 or spec["thin_volume_growth_alert_threshold"] > 99:
                 self.module.fail_json(msg="thin_volume_growth_alert_threshold must be between or equal to 10 and 99."
                                           "thin_volume_growth_alert_threshold [%s]. Array [%s]."
-                                          % (self.thin_volume_growth_alert_threshold, self.ssid))
+                                          % (spec["thin_volume_growth_alert_threshold"], self.ssid))
+        return spec
 
-        self.volume_detail = None
-        self.pool_detail = None
-        self.workload_id = None
+    def set_volume_spec(self, spec):
+        """Assign the normalized volume attributes from get_volume_spec to this instance."""
+        for key, value in spec.items():
+            setattr(self, key, value)
 
-    def convert_to_aligned_bytes(self, size):
+    def convert_to_aligned_bytes(self, size, size_unit=None, segment_size_kb=None):
         """Convert size to the truncated byte size that aligns on the segment size."""
-        size_bytes = int(size * self.SIZE_UNIT_MAP[self.size_unit])
-        segment_size_bytes = int(self.segment_size_kb * self.SIZE_UNIT_MAP["kb"])
+        if size_unit is None:
+            size_unit = self.size_unit
+        if segment_size_kb is None:
+            segment_size_kb = self.segment_size_kb
+
+        size_bytes = int(size * self.SIZE_UNIT_MAP[size_unit])
+        segment_size_bytes = int(segment_size_kb * self.SIZE_UNIT_MAP["kb"])
         segment_count = int(size_bytes / segment_size_bytes)
         return segment_count * segment_size_bytes
 
     def get_volume(self):
         """Retrieve volume details from storage array."""
-        volumes = list()
-        thin_volumes = list()
+        volume_detail = None
         try:
-            rc, volumes = self.request("storage-systems/%s/volumes" % self.ssid)
+            volume_detail = self.resolver.resolve("volume", self.name)
         except Exception as err:
             self.module.fail_json(msg="Failed to obtain list of thick volumes.  Array Id [%s]. Error[%s]."
                                       % (self.ssid, to_native(err)))
-        try:
-            rc, thin_volumes = self.request("storage-systems/%s/thin-volumes" % self.ssid)
-        except Exception as err:
-            self.module.fail_json(msg="Failed to obtain list of thin volumes.  Array Id [%s]. Error[%s]."
-                                      % (self.ssid, to_native(err)))
+        if not volume_detail:
+            try:
+                volume_detail = self.resolver.resolve("thin_volume", self.name)
+            except Exception as err:
+                self.module.fail_json(msg="Failed to obtain list of thin volumes.  Array Id [%s]. Error[%s]."
+                                          % (self.ssid, to_native(err)))
 
-        volume_detail = [volume for volume in volumes + thin_volumes if volume["name"] == self.name]
-        return volume_detail[0] if volume_detail else dict()
+        return volume_detail if volume_detail else dict()
 
-    def wait_for_volume_availability(self, retries=VOLUME_CREATION_BLOCKING_TIMEOUT_SEC / 5):
+    def wait_for_volume_availability(self, timeout=VOLUME_CREATION_BLOCKING_TIMEOUT_SEC):
         """Waits until volume becomes available.
 
-        :raises AnsibleFailJson when retries are exhausted.
+        The volume is looked up again after each new storage system event or, when no events are reported, at
+        increasing intervals.
+
+        :raises AnsibleFailJson when the timeout expires.
         """
-        if retries == 0:
-            self.module.fail_json(msg="Timed out waiting for the volume %s to become available. Array [%s]."
-                                      % (self.name, self.ssid))
-        if not self.get_volume():
-            time.sleep(5)
-            self.wait_for_volume_availability(retries=retries - 1)
+        tracker = VolumeProgressTracker(self)
+        elapsed = 0
+        interval = tracker.MIN_POLL_INTERVAL_SEC
+        while not self.get_volume():
+            self.resolver.invalidate()
+            if elapsed >= timeout:
+                self.module.fail_json(msg="Timed out waiting for the volume %s to become available. Array [%s]."
+                                          % (self.name, self.ssid))
+
+            waited = tracker.wait_for_event(interval)
+            interval = tracker.MIN_POLL_INTERVAL_SEC if waited < interval else min(interval * 2, tracker.MAX_POLL_INTERVAL_SEC)
+            elapsed += waited
 
     def wait_for_volume_action(self, timeout=None):
         """Waits until volume action is complete is complete.
         :param: int timeout: Wait duration measured in seconds. Waits indefinitely when None.
         """
-        action = "unknown"
-        percent_complete = None
-        while action != "complete":
-            time.sleep(5)
+        tracker = VolumeProgressTracker(self)
+        tracker.watch(self.volume_detail)
 
-            try:
-                rc, operations = self.request("storage-systems/%s/symbol/getLongLivedOpsProgress" % self.ssid)
-
-                # Search long lived operations for volume
-                action = "complete"
-                for operation in operations["longLivedOpsProgress"]:
-                    if operation["volAction"] is not None:
-                        for key in operation.keys():
-                            if (operation[key] is not None and "volumeRef" in operation[key] and
-                                    (operation[key]["volumeRef"] == self.volume_detail["id"] or
-                                     ("storageVolumeRef" in self.volume_detail and operation[key]["volumeRef"] == self.volume_detail["storageVolumeRef"]))):
-                                action = operation["volAction"]
-                                percent_complete = operation["init"]["percentComplete"]
-            except Exception as err:
-                self.module.fail_json(msg="Failed to get volume expansion progress. Volume [%s]. Array Id [%s]."
-                                          " Error[%s]." % (self.name, self.ssid, to_native(err)))
-
-            if timeout is not None:
-                if timeout <= 0:
-                    self.module.warn("Expansion action, %s, failed to complete during the allotted time. Time remaining"
-                                     " [%s]. Array Id [%s]." % (action, percent_complete, self.ssid))
-                    self.module.fail_json(msg="Expansion action failed to complete. Time remaining [%s]. Array Id [%s]." % (percent_complete, self.ssid))
-                if timeout:
-                    timeout -= 5
-
-            self.module.log("Expansion action, %s, is %s complete." % (action, percent_complete))
+        try:
+            progress = tracker.wait(timeout)
+        except Exception as err:
+            self.module.fail_json(msg="Failed to get volume expansion progress. Volume [%s]. Array Id [%s]."
+                                      " Error[%s]." % (self.name, self.ssid, to_native(err)))
+
+        incomplete = [entry for entry in progress.values() if entry["action"] != "complete"]
+        if incomplete:
+            self.module.warn("Expansion action, %s, failed to complete during the allotted time. Time remaining"
+                             " [%s]. Array Id [%s]." % (incomplete[0]["action"], incomplete[0]["percent_complete"], self.ssid))
+            self.module.fail_json(msg="Expansion action failed to complete. Time remaining [%s]. Array Id [%s]."
+                                      % (incomplete[0]["percent_complete"], self.ssid))
         self.module.log("Expansion action is complete.")
 
     def get_storage_pool(self):
         """Retrieve storage pool details from the storage array."""
-        storage_pools = list()
+        pool_detail = None
         try:
-            rc, storage_pools = self.request("storage-systems/%s/storage-pools" % self.ssid)
+            pool_detail = self.resolver.resolve("storage_pool", self.storage_pool_name) if self.storage_pool_name else None
         except Exception as err:
             self.module.fail_json(msg="Failed to obtain list of storage pools.  Array Id [%s]. Error[%s]."
                                       % (self.ssid, to_native(err)))
 
-        pool_detail = [storage_pool for storage_pool in storage_pools if storage_pool["name"] == self.storage_pool_name]
-        return pool_detail[0] if pool_detail else dict()
+        return pool_detail if pool_detail else dict()
 
     def check_storage_pool_sufficiency(self):
         """Perform a series of checks as to the sufficiency of the storage pool for the volume."""
@@ -530,88 +773,119 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                 self.module.fail_json(msg="Not enough storage pool free space available for the volume's needs."
                                           " Array [%s]." % self.ssid)
 
-    def update_workload_tags(self, check_mode=False):
-        """Check the status of the workload tag and update storage array definitions if necessary.
-
-        When the workload attributes are not provided but an existing workload tag name is, then the attributes will be
-        used.
+    def get_workload_tags(self):
+        """Retrieve the storage array workload tags once for the module run.
 
-        :return bool: Whether changes were required to be made."""
-        change_required = False
-        workload_tags = None
-        request_body = None
-        ansible_profile_id = None
-
-        if self.workload_name:
+        :return list: storage array workload tags."""
+        if self.workload_tags is None:
             try:
                 rc, workload_tags = self.request("storage-systems/%s/workloads" % self.ssid)
+                self.workload_tags = list(workload_tags)
             except Exception as error:
                 self.module.fail_json(msg="Failed to retrieve storage array workload tags. Array [%s]" % self.ssid)
+        return self.workload_tags
+
+    def reconcile_workloads(self, workloads, workload_tags, check_mode=False):
+        """Reconcile workload tag definitions with the storage array workload tags in a single pass.
+
+        When the workload attributes are not provided but an existing workload tag name is, then the attributes will be
+        used. Workload tags that are created or updated are reflected in workload_tags so they need not be retrieved again.
 
-            ansible_profile_id = "Other_1"
-            request_body = dict(name=self.workload_name,
+        :param dict workloads: workload attribute lists keyed by workload name; None when no attributes are specified.
+        :param list workload_tags: storage array workload tags.
+        :param bool check_mode: only determine whether changes are required.
+        :return tuple: whether changes were required and workload tag ids keyed by workload name (None when the workload
+                       tag has yet to be created)."""
+        change_required = False
+        ansible_profile_id = "Other_1"
+        tags = dict((tag["name"], tag) for tag in workload_tags)
+        workload_ids = dict()
+
+        for workload_name, metadata in workloads.items():
+            request_body = dict(name=workload_name,
                                 profileId=ansible_profile_id,
                                 workloadInstanceIndex=None,
                                 isValid=True)
+            workload_attributes = (metadata or []) + [dict(key="profileId", value=ansible_profile_id)]
+            tag = tags.get(workload_name)
+
+            if tag:
+                workload_ids[workload_name] = tag["id"]
 
-            # evaluate and update storage array when needed
-            for tag in workload_tags:
-                if tag["name"] == self.workload_name:
-                    self.workload_id = tag["id"]
-
-                    if not self.metadata:
-                        break
-
-                    # Determine if core attributes (everything but profileId) is the same
-                    metadata_set = set(tuple(sorted(attr.items())) for attr in self.metadata)
-                    tag_set = set(tuple(sorted(attr.items()))
-                                  for attr in tag["workloadAttributes"] if attr["key"] != "profileId")
-                    if metadata_set != tag_set:
-                        self.module.log("Workload tag change is required!")
-                        change_required = True
-
-                    # only perform the required action when check_mode==False
-                    if change_required and not check_mode:
-                        self.metadata.append(dict(key="profileId", value=ansible_profile_id))
-                        request_body.update(dict(isNewWorkloadInstance=False,
-                                                 isWorkloadDataInitialized=True,
-                                                 isWorkloadCardDataToBeReset=True,
-                                                 workloadAttributes=self.metadata))
-                        try:
-                            rc, resp = self.request("storage-systems/%s/workloads/%s" % (self.ssid, tag["id"]),
-                                                    data=request_body, method="POST")
-                        except Exception as error:
-                            self.module.fail_json(msg="Failed to create new workload tag. Array [%s]. Error [%s]"
-                                                      % (self.ssid, to_native(error)))
-                        self.module.log("Workload tag [%s] required change." % self.workload_name)
-                    break
+                # Determine if core attributes (everything but profileId) is the same
+                metadata_set = set(tuple(sorted(attr.items())) for attr in metadata or [])
+                tag_set = set(tuple(sorted(attr.items())) for attr in tag["workloadAttributes"] if attr["key"] != "profileId")
+                if not metadata or metadata_set == tag_set:
+                    continue
+
+                self.module.log("Workload tag change is required!")
+                change_required = True
+
+                # only perform the required action when check_mode==False
+                if not check_mode:
+                    request_body.update(dict(isNewWorkloadInstance=False,
+                                             isWorkloadDataInitialized=True,
+                                             isWorkloadCardDataToBeReset=True,
+                                             workloadAttributes=workload_attributes))
+                    try:
+                        rc, resp = self.request("storage-systems/%s/workloads/%s" % (self.ssid, tag["id"]), data=request_body, method="POST")
+                    except Exception as error:
+                        self.module.fail_json(msg="Failed to create new workload tag. Array [%s]. Error [%s]" % (self.ssid, to_native(error)))
+                    workload_tags[workload_tags.index(tag)] = dict(tag, workloadAttributes=workload_attributes)
+                    self.module.log("Workload tag [%s] required change." % workload_name)
 
             # existing workload tag not found so create new workload tag
             else:
-                change_required = True
+                workload_ids[workload_name] = None
                 self.module.log("Workload tag creation is required!")
+                change_required = True
 
-                if change_required and not check_mode:
-                    if self.metadata:
-                        self.metadata.append(dict(key="profileId", value=ansible_profile_id))
-                    else:
-                        self.metadata = [dict(key="profileId", value=ansible_profile_id)]
-
+                if not check_mode:
                     request_body.update(dict(isNewWorkloadInstance=True,
                                              isWorkloadDataInitialized=False,
                                              isWorkloadCardDataToBeReset=False,
-                                             workloadAttributes=self.metadata))
+                                             workloadAttributes=workload_attributes))
                     try:
-                        rc, resp = self.request("storage-systems/%s/workloads" % self.ssid,
-                                                method="POST", data=request_body)
-                        self.workload_id = resp["id"]
+                        rc, resp = self.request("storage-systems/%s/workloads" % self.ssid, method="POST", data=request_body)
+                        workload_ids[workload_name] = resp["id"]
                     except Exception as error:
-                        self.module.fail_json(msg="Failed to create new workload tag. Array [%s]. Error [%s]"
-                                                  % (self.ssid, to_native(error)))
-                self.module.log("Workload tag [%s] was added." % self.workload_name)
+                        self.module.fail_json(msg="Failed to create new workload tag. Array [%s]. Error [%s]" % (self.ssid, to_native(error)))
+                    workload_tags.append(dict(id=workload_ids[workload_name], name=workload_name, workloadAttributes=workload_attributes))
+                    self.module.log("Workload tag [%s] was added." % workload_name)
+
+        return change_required, workload_ids
+
+    def get_operation_handle(self, action):
+        """Describe a submitted volume operation so its progress can be determined by na_santricity_volume_progress.
+
+        :param str action: submitted operation (create or expand).
+        :return dict: operation handle."""
+        return dict(ssid=self.ssid, volume_ref=self.volume_detail.get("id"), name=self.name, action=action, start_time=int(time.time()))
+
+    def update_workload_tags(self, check_mode=False, workload_tags=None):
+        """Check the status of the workload tag and update storage array definitions if necessary.
+
+        :param bool check_mode: only determine whether changes are required.
+        :param list workload_tags: storage array workload tags; retrieved from the storage array when not provided.
+        :return bool: Whether changes were required to be made."""
+        if not self.workload_name:
+            return False
 
+        change_required, workload_ids = self.reconcile_workloads({self.workload_name: self.metadata},
+                                                                 self.get_workload_tags() if workload_tags is None else workload_tags, check_mode)
+        self.workload_id = workload_ids[self.workload_name]
         return change_required
 
+    def get_volume_meta_tags(self):
+        """Determine the volume meta tags for the volume metadata and workload tag.
+
+        :return list: volume meta tags."""
+        meta_tags = list(self.volume_metadata)
+        if self.workload_name:
+            meta_tags.extend([{"key": "workloadId", "value": self.workload_id},
+                              {"key": "volumeTypeId", "value": "volume"}])
+        return meta_tags
+
     def get_volume_property_changes(self):
         """Retrieve the volume update request body when change(s) are required.
 
@@ -639,21 +913,11 @@ class NetAppESeriesVolume(NetAppESeriesModule):
             change = True
             request_body.update(dict(owningControllerId=self.owning_controller_id))
 
-        # volume meta tags
-        request_body["metaTags"].extend(self.volume_metadata)
-        for entry in self.volume_metadata:
-            if entry not in self.volume_detail["metadata"]:
-                change = True
-
-        if self.workload_name:
-            request_body["metaTags"].extend([{"key": "workloadId", "value": self.workload_id},
-                                             {"key": "volumeTypeId", "value": "volume"}])
-
-            if ({"key": "workloadId", "value": self.workload_id} not in self.volume_detail["metadata"] or
-                    {"key": "volumeTypeId", "value": "volume"} not in self.volume_detail["metadata"]):
-                change = True
-
-        if len(self.volume_detail["metadata"]) != len(request_body["metaTags"]):
+        # volume meta tags; the update request replaces all of the volume's meta tags
+        request_body["metaTags"] = self.get_volume_meta_tags()
+        expected_tags = set((tag["key"], tag["value"]) for tag in request_body["metaTags"])
+        current_tags = set((tag["key"], tag["value"]) for tag in self.volume_detail["metadata"])
+        if len(self.volume_detail["metadata"]) != len(request_body["metaTags"]) or expected_tags != current_tags:
             change = True
 
         # thick/thin volume specific properties
@@ -713,13 +977,20 @@ class NetAppESeriesVolume(NetAppESeriesModule):
 
         return request_body
 
-    def create_volume(self):
-        """Create thick/thin volume according to the specified criteria."""
-        body = dict(name=self.name, poolId=self.pool_detail["id"], sizeUnit="bytes",
+    def get_create_volume_request(self):
+        """Determine the request required to create the thick/thin volume according to the specified criteria.
+
+        :return tuple: request path and request body."""
+        body = dict(name=self.name, poolId=self.pool_detail.get("id"), sizeUnit="bytes",
                     dataAssuranceEnabled=self.data_assurance_enabled)
 
-        if self.volume_metadata:
-            body.update({"metaTags": self.volume_metadata})
+        # Properties accepted by the creation request are included so they do not require a subsequent update request.
+        meta_tags = self.get_volume_meta_tags()
+        if meta_tags:
+            body.update({"metaTags": meta_tags})
+
+        if self.owning_controller_id:
+            body.update(dict(owningControllerId=self.owning_controller_id))
 
         if self.thin_provision:
             body.update(dict(virtualSize=self.size_b,
@@ -727,8 +998,22 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                              maximumRepositorySize=self.thin_volume_max_repo_size_b,
                              expansionPolicy=self.thin_volume_expansion_policy,
                              growthAlertThreshold=self.thin_volume_growth_alert_threshold))
+            return "storage-systems/%s/thin-volumes" % self.ssid, body
+
+        body.update(dict(size=self.size_b, segSize=self.segment_size_kb))
+        return "storage-systems/%s/volumes" % self.ssid, body
+
+    def create_volume(self, request_body=None):
+        """Create thick/thin volume according to the specified criteria.
+
+        :param dict request_body: planned creation request body; determined when not provided."""
+        path, body = self.get_create_volume_request()
+        if request_body is not None:
+            body = request_body
+
+        if self.thin_provision:
             try:
-                rc, volume = self.request("storage-systems/%s/thin-volumes" % self.ssid, data=body, method="POST")
+                rc, volume = self.request(path, data=body, method="POST")
             except Exception as error:
                 self.module.fail_json(msg="Failed to create thin volume.  Volume [%s].  Array Id [%s]. Error[%s]."
                                           % (self.name, self.ssid, to_native(error)))
@@ -736,25 +1021,31 @@ class NetAppESeriesVolume(NetAppESeriesModule):
             self.module.log("New thin volume created [%s]." % self.name)
 
         else:
-            body.update(dict(size=self.size_b, segSize=self.segment_size_kb))
             try:
-                rc, volume = self.request("storage-systems/%s/volumes" % self.ssid, data=body, method="POST")
+                rc, volume = self.request(path, data=body, method="POST")
             except Exception as error:
                 self.module.fail_json(msg="Failed to create volume.  Volume [%s].  Array Id [%s]. Error[%s]."
                                           % (self.name, self.ssid, to_native(error)))
 
             self.module.log("New volume created [%s]." % self.name)
 
-    def update_volume_properties(self):
+        # The creation response describes the new volume so it does not need to be retrieved again.
+        self.resolver.invalidate()
+        self.volume_detail = volume if isinstance(volume, dict) and "id" in volume else dict()
+
+    def update_volume_properties(self, request_body=None):
         """Update existing thin-volume or volume properties.
 
+        :param dict request_body: planned update request body; determined when not provided.
         :raise AnsibleFailJson when either thick/thin volume update request fails.
         :return bool: whether update was applied
         """
-        self.wait_for_volume_availability()
-        self.volume_detail = self.get_volume()
+        if not self.volume_detail:
+            self.wait_for_volume_availability()
+            self.volume_detail = self.get_volume()
 
-        request_body = self.get_volume_property_changes()
+        if request_body is None:
+            request_body = self.get_volume_property_changes()
 
         if request_body:
             if self.thin_provision:
@@ -774,12 +1065,14 @@ class NetAppESeriesVolume(NetAppESeriesModule):
             return True
         return False
 
-    def expand_volume(self):
+    def expand_volume(self, request_body=None):
         """Expand the storage specifications for the existing thick/thin volume.
 
+        :param dict request_body: planned expansion request body; determined when not provided.
         :raise AnsibleFailJson when a thick/thin volume expansion request fails.
         """
-        request_body = self.get_expand_volume_changes()
+        if request_body is None:
+            request_body = self.get_expand_volume_changes()
         if request_body:
             if self.volume_detail["thinProvisioned"]:
                 try:
@@ -820,71 +1113,559 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                                           % (self.name, self.ssid, to_native(error)))
             self.module.log("Volume deleted [%s]." % self.name)
 
-    def apply(self):
-        """Determine and apply any changes necessary to satisfy the specified criteria.
+        self.resolver.invalidate()
 
-        :raise AnsibleExitJson when completes successfully"""
-        change = False
-        msg = None
+    def plan_volume(self):
+        """Determine the requests required for the volume to satisfy the specified criteria.
 
-        self.volume_detail = self.get_volume()
-        self.pool_detail = self.get_storage_pool()
+        The plan is determined from the volume and storage pool details alone so the storage array is not contacted.
 
-        # Determine whether changes need to be applied to existing workload tags
-        if self.state == 'present' and self.update_workload_tags(check_mode=True):
-            change = True
+        :return dict: change plan containing the action (create, update, delete or None) and the request for each step."""
+        plan = dict(name=self.name, action=None, create=None, update=None, expand=None, delete=None)
 
-        # Determine if any changes need to be applied
         if self.volume_detail:
+            volume_path = "storage-systems/%s/%s/%s" % (self.ssid, "thin-volumes" if self.volume_detail["thinProvisioned"] else "volumes",
+                                                        self.volume_detail["id"])
             if self.state == 'absent':
-                change = True
+                plan.update(dict(action="delete", delete=dict(path=volume_path)))
 
             elif self.state == 'present':
-                if self.get_expand_volume_changes() or self.get_volume_property_changes():
-                    change = True
+                expand_request_body = self.get_expand_volume_changes()
+                update_request_body = self.get_volume_property_changes()
+                if expand_request_body:
+                    plan.update(dict(action="update", expand=dict(path=volume_path + "/expand", body=expand_request_body)))
+                if update_request_body:
+                    plan.update(dict(action="update", update=dict(path="storage-systems/%s/%s/%s" % (self.ssid, "thin-volumes" if self.thin_provision
+                                                                                                     else "volumes", self.volume_detail["id"]),
+                                                                  body=update_request_body)))
 
         elif self.state == 'present':
+            if self.thin_provision and not self.thin_volume_repo_size_b:
+                self.module.fail_json(msg="thin_volume_repo_size is required to create a thin volume. Volume [%s]. Array [%s]." % (self.name, self.ssid))
             if self.thin_provision and (self.thin_volume_repo_size_b < 4 * 1024 ** 3 or
                                         self.thin_volume_repo_size_b > 256 * 1024 ** 3 or
                                         self.thin_volume_repo_size_b % (4 * 1024 ** 3) != 0):
                 self.module.fail_json(msg="The initial thin volume repository size must be between 4gb and 256gb in"
                                           " increments of 4gb. Attempted size [%sg]."
                                           % (self.thin_volume_repo_size_b * 1024 ** 3))
+
+            # Property changes for a new volume are determined from the volume that the creation request returns.
+            path, body = self.get_create_volume_request()
+            plan.update(dict(action="create", create=dict(path=path, body=body)))
+
+        return plan
+
+    def determine_change(self):
+        """Determine whether any changes are required for the volume to satisfy the specified criteria.
+
+        The change plan is retained so that apply_change can execute it without determining it again.
+
+        :return bool: whether changes are required."""
+        change = False
+
+        # Determine whether changes need to be applied to existing workload tags
+        if self.state == 'present' and not self.workload_reconciled and self.update_workload_tags(check_mode=True):
+            change = True
+
+        # Determine if any changes need to be applied
+        self.plan = self.plan_volume()
+        if self.plan["action"]:
             change = True
 
         self.module.log("Update required: [%s]." % change)
+        return change
+
+    def apply_change(self):
+        """Apply the change plan for the volume to satisfy the specified criteria.
+
+        :return str: message describing the changes applied."""
+        msg = None
+        if self.plan is None:
+            self.plan = self.plan_volume()
+
+        if self.state == 'present':
+            if not self.workload_reconciled and self.update_workload_tags():
+                msg = "Workload tag change occurred."
+
+                # A newly created workload tag id is only known once created so the plan's meta tags must be determined again.
+                self.plan = self.plan_volume()
+
+            if self.plan["action"] == "create":
+                self.check_storage_pool_sufficiency()
+                self.create_volume(self.plan["create"]["body"])
+                self.update_volume_properties()
+                self.operation = self.get_operation_handle("create")
+                msg = msg[:-1] + " and volume [%s] was created." if msg else "Volume [%s] has been created."
+            else:
+                if self.plan["update"] and self.update_volume_properties(self.plan["update"]["body"]):
+                    msg = "Volume [%s] properties were updated."
+
+                if self.plan["expand"]:
+                    # Volumes from the volumes list are expanded by expand_volumes once all volumes have been updated.
+                    if self.volumes is None:
+                        self.expand_volume(self.plan["expand"]["body"])
+                        self.operation = self.get_operation_handle("expand")
+                    else:
+                        self.expansion_pending = True
+                    msg = msg[:-1] + " and was expanded." if msg else "Volume [%s] was expanded."
+
+            # Volumes from the volumes list are waited on together once all volumes have been reconciled.
+            if self.wait_for_initialization and self.volumes is None:
+                self.module.log("Waiting for volume operation to complete.")
+                self.wait_for_volume_action()
+                self.operation = None
+
+        elif self.state == 'absent':
+            self.delete_volume()
+            msg = "Volume [%s] has been deleted."
+
+        return msg % self.name if msg and "%s" in msg else msg
+
+    def reconcile_volume(self):
+        """Determine and apply any changes necessary for the volume to satisfy the specified criteria.
+
+        :return tuple: whether a change was required and the message describing the volume state."""
+        change = self.determine_change()
 
-        # Apply any necessary changes
         if change and not self.module.check_mode:
-            if self.state == 'present':
-                if self.update_workload_tags():
-                    msg = "Workload tag change occurred."
-
-                if not self.volume_detail:
-                    self.check_storage_pool_sufficiency()
-                    self.create_volume()
-                    self.update_volume_properties()
-                    msg = msg[:-1] + " and volume [%s] was created." if msg else "Volume [%s] has been created."
+            msg = self.apply_change()
+        else:
+            msg = ("Volume [%s] does not exist." if self.state == 'absent' else "Volume [%s] exists.") % self.name
+
+        return change, msg
+
+    def get_array_state(self):
+        """Retrieve the volumes, storage pools and workload tags required to reconcile all specified volumes.
+
+        :return dict: volumes and storage pools keyed by name, the list of workload tags and the storage system graph when
+                      volumes are to be deleted."""
+        volumes = list()
+        thin_volumes = list()
+        storage_pools = list()
+        try:
+            rc, volumes = self.request("storage-systems/%s/volumes" % self.ssid)
+            rc, thin_volumes = self.request("storage-systems/%s/thin-volumes" % self.ssid)
+        except Exception as err:
+            self.module.fail_json(msg="Failed to obtain list of volumes. Array Id [%s]. Error[%s]." % (self.ssid, to_native(err)))
+        try:
+            rc, storage_pools = self.request("storage-systems/%s/storage-pools" % self.ssid)
+        except Exception as err:
+            self.module.fail_json(msg="Failed to obtain list of storage pools. Array Id [%s]. Error[%s]." % (self.ssid, to_native(err)))
+
+        workload_tags = list()
+        if [volume for volume in self.volumes if volume["state"] == "present" and volume["workload_name"]]:
+            workload_tags = self.get_workload_tags()
+
+        # The storage system graph describes the objects that depend on volumes which are to be deleted.
+        graph = dict()
+        volume_names = set([volume["name"] for volume in volumes + thin_volumes])
+        if [volume for volume in self.volumes if volume["state"] == "absent" and volume["name"] in volume_names]:
+            try:
+                rc, graph = self.request("storage-systems/%s/graph" % self.ssid)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to retrieve storage system graph. Array [%s]. Error[%s]." % (self.ssid, to_native(error)))
+
+        return dict(volumes=dict((volume["name"], volume) for volume in volumes + thin_volumes),
+                    storage_pools=dict((storage_pool["name"], storage_pool) for storage_pool in storage_pools),
+                    workload_tags=workload_tags,
+                    graph=graph)
+
+    def get_volume_context(self, spec, array_state):
+        """Create a copy of this instance that reconciles a single volume from the volumes list.
+
+        Failures within the copy raise DeferredFailure so that the remaining volumes are unaffected."""
+        context = copy.copy(self)
+        context.module = DeferredFailureModule(self.module)
+        context.set_volume_spec(spec)
+        context.volume_detail = array_state["volumes"].get(spec["name"], dict())
+        context.pool_detail = array_state["storage_pools"].get(spec["storage_pool_name"], dict())
+        return context
+
+    def plan_workload_tags(self, contexts, workload_tags):
+        """Determine the workload tag changes for every workload referenced by the volume contexts.
+
+        Volume contexts that share a workload name use the attributes of the first volume that specifies the workload.
+
+        :return tuple: whether any workload tag changes are required and the workload definitions keyed by workload name."""
+        workloads = OrderedDict()
+        for context in contexts:
+            if context.state == "present" and context.workload_name:
+                if context.workload_name not in workloads:
+                    workloads[context.workload_name] = context.metadata
+                elif context.metadata and context.metadata != workloads[context.workload_name]:
+                    self.module.warn("Volume [%s] workload [%s] metadata differs from an earlier volume; the earlier definition is used."
+                                     % (context.name, context.workload_name))
+        if not workloads:
+            return False, workloads
+
+        change, workload_ids = self.reconcile_workloads(workloads, workload_tags, check_mode=True)
+        for context in contexts:
+            if context.state == "present" and context.workload_name:
+                context.workload_id = workload_ids[context.workload_name]
+                context.workload_reconciled = True
+
+        return change, workloads
+
+    def check_capacity(self, contexts, array_state, deletions=None):
+        """Allocate the capacity required by all volume creations and expansions against each storage pool's free capacity.
+
+        Thick volume capacity, initial thin volume repository capacity and manual thin volume repository growth must fit
+        within the free capacity of the storage pool together, including the capacity released by volumes being deleted.
+        Thin volume repositories with the automatic expansion policy may grow to their maximum repository size so a
+        warning is issued when the storage pool cannot accommodate that growth for all of its thin volumes.
+
+        :param list deletions: volume contexts whose volumes will be deleted before any volume is created or expanded.
+        :return dict: message keyed by the name of each volume whose storage pool lacks the required free capacity.
+        """
+        storage_pools = dict((storage_pool["id"], storage_pool) for storage_pool in array_state["storage_pools"].values())
+        free_space = dict((storage_pool_id, int(storage_pool["freeSpace"])) for storage_pool_id, storage_pool in storage_pools.items())
+        required = dict()
+        repository_growth = dict()
+
+        for context in deletions or []:
+            if context.volume_detail.get("volumeGroupRef") in free_space:
+                released = context.volume_detail["currentProvisionedCapacity" if context.volume_detail["thinProvisioned"] else "totalSizeInBytes"]
+                free_space[context.volume_detail["volumeGroupRef"]] += int(released)
+
+        for volume in array_state["volumes"].values():
+            if volume.get("thinProvisioned") and volume.get("expansionPolicy") == "automatic" and volume.get("volumeGroupRef") in storage_pools:
+                repository_growth.setdefault(volume["volumeGroupRef"], 0)
+                repository_growth[volume["volumeGroupRef"]] += int(volume["provisionedCapacityQuota"]) - int(volume["currentProvisionedCapacity"])
+
+        for context in contexts:
+            if context.state != "present":
+                continue
+
+            increase = 0
+            growth = 0
+            if context.volume_detail:
+                storage_pool_id = context.volume_detail.get("volumeGroupRef")
+                if not context.volume_detail["thinProvisioned"]:
+                    increase = context.size_b - int(context.volume_detail["capacity"])
+                elif context.volume_detail["expansionPolicy"] == "manual" and context.thin_volume_repo_size_b:
+                    increase = context.thin_volume_repo_size_b - int(context.volume_detail["currentProvisionedCapacity"])
+                elif context.thin_volume_max_repo_size_b:
+                    growth = context.thin_volume_max_repo_size_b - int(context.volume_detail["provisionedCapacityQuota"])
+            else:
+                storage_pool_id = context.pool_detail.get("id")
+                if not context.thin_provision:
+                    increase = context.size_b
                 else:
-                    if self.update_volume_properties():
-                        msg = "Volume [%s] properties were updated."
+                    increase = context.thin_volume_repo_size_b
+                    if context.thin_volume_expansion_policy == "automatic":
+                        growth = context.thin_volume_max_repo_size_b - context.thin_volume_repo_size_b
+
+            if storage_pool_id in storage_pools:
+                if increase > 0:
+                    required.setdefault(storage_pool_id, []).append((context.name, increase))
+                if growth > 0:
+                    repository_growth.setdefault(storage_pool_id, 0)
+                    repository_growth[storage_pool_id] += growth
+
+        failures = dict()
+        for storage_pool_id, allocations in required.items():
+            storage_pool = storage_pools[storage_pool_id]
+            total = sum([increase for name, increase in allocations])
+            if total > free_space[storage_pool_id]:
+                for name, increase in allocations:
+                    failures[name] = ("Not enough storage pool free space available for all volume creations and expansions. Storage pool [%s]."
+                                      " Required [%s]. Available [%s]. Array [%s]." % (storage_pool["name"], total, free_space[storage_pool_id], self.ssid))
+            elif repository_growth.get(storage_pool_id, 0) > free_space[storage_pool_id] - total:
+                self.module.warn("Storage pool [%s] cannot accommodate every thin volume repository growing to its maximum repository size."
+                                 " Potential growth [%s]. Available [%s]. Array [%s]."
+                                 % (storage_pool["name"], repository_growth[storage_pool_id], free_space[storage_pool_id] - total, self.ssid))
+        return failures
+
+    def expand_volumes(self, contexts, results):
+        """Expand volumes from the volumes list while limiting the number of expansions in progress in each storage pool.
+
+        Expansions are submitted until expansion_concurrency expansions are in progress in a storage pool. Further
+        expansions are submitted as those complete, which is determined by a single progress tracker for all volumes.
+        The final expansions are not waited on unless wait_for_initialization is specified.
+
+        :raises AnsibleFailJson when no expansion in progress completes within expansion_timeout seconds while expansions
+        remain queued. The progress of each expansion in progress is included in its volume's results.
+        """
+        pending = dict()
+        for context in contexts:
+            pending.setdefault(context.volume_detail.get("volumeGroupRef", context.storage_pool_name), []).append(context)
+        expanding = dict((storage_pool, []) for storage_pool in pending.keys())
+
+        tracker = VolumeProgressTracker(self)
+        elapsed = 0
+        interval = tracker.MIN_POLL_INTERVAL_SEC
+        while True:
+            for storage_pool, queued in pending.items():
+                while queued and len(expanding[storage_pool]) < self.expansion_concurrency:
+                    context = queued.pop(0)
+                    try:
+                        context.expand_volume(context.plan["expand"]["body"])
+                        context.operation = context.get_operation_handle("expand")
+                    except DeferredFailure as error:
+                        results[context.name].update(dict(failed=True, msg=error.msg))
+                    else:
+                        tracker.watch(context.volume_detail)
+                        expanding[storage_pool].append(context)
 
-                    if self.get_expand_volume_changes():
-                        self.expand_volume()
-                        msg = msg[:-1] + " and was expanded." if msg else "Volume [%s] was expanded."
+            if not [queued for queued in pending.values() if queued]:
+                break
 
-                if self.wait_for_initialization:
-                    self.module.log("Waiting for volume operation to complete.")
-                    self.wait_for_volume_action()
+            try:
+                progress = tracker.get_progress()
+            except Exception as error:
+                self.module.fail_json(msg="Failed to get volume expansion progress. Array [%s]. Error[%s]." % (self.ssid, to_native(error)),
+                                      changed=True, volumes=list(results.values()))
+
+            completed = False
+            for storage_pool, expanding_contexts in expanding.items():
+                for context in list(expanding_contexts):
+                    if progress[context.volume_detail["id"]]["action"] == "complete":
+                        tracker.unwatch(context.volume_detail["id"])
+                        expanding_contexts.remove(context)
+                        completed = True
+
+            if completed:
+                elapsed = 0
+            elif elapsed >= self.expansion_timeout:
+                for expanding_contexts in expanding.values():
+                    for context in expanding_contexts:
+                        results[context.name]["progress"] = progress[context.volume_detail["id"]]
+                queued_names = [context.name for queued in pending.values() for context in queued]
+                self.module.fail_json(msg="Timed out waiting for volume expansions to complete before submitting the queued expansions. Queued [%s]."
+                                          " Array [%s]." % (", ".join(queued_names), self.ssid), changed=True, volumes=list(results.values()))
+            else:
+                elapsed += tracker.wait_for_event(interval)
+            interval = tracker.MIN_POLL_INTERVAL_SEC if completed else min(interval * 2, tracker.MAX_POLL_INTERVAL_SEC)
 
-            elif self.state == 'absent':
-                self.delete_volume()
-                msg = "Volume [%s] has been deleted."
+    def get_deletion_plan(self, contexts, graph):
+        """Determine the objects to delete for the volumes from the storage system graph.
 
-        else:
-            msg = "Volume [%s] does not exist." if self.state == 'absent' else "Volume [%s] exists."
+        Objects that depend on a volume (lun mappings, volume copy pairs, asynchronous mirror group memberships, snapshot
+        volumes and snapshot groups) must be deleted before the volume, and snapshot volumes before snapshot groups.
+
+        :return OrderedDict: deletion tasks keyed by (object type, object reference). Each task contains the REST path,
+        the name of the volume being deleted and the set of task keys that must complete first.
+        """
+        volume_names = dict((context.volume_detail["id"], context.name) for context in contexts)
+        tasks = OrderedDict()
+
+        def add_task(object_type, reference, path, volume_id):
+            key = (object_type, reference)
+            if key not in tasks:
+                tasks[key] = dict(type=object_type, id=reference, path="storage-systems/%s/%s" % (self.ssid, path), volume=volume_names[volume_id],
+                                  requires=set())
+            return key
+
+        for context in contexts:
+            add_task("volume", context.volume_detail["id"], "%s/%s" % ("thin-volumes" if context.volume_detail.get("thinProvisioned") else "volumes",
+                                                                       context.volume_detail["id"]), context.volume_detail["id"])
+
+        volume_bundle = graph.get("highLevelVolBundle", {})
+        for mapping in graph.get("storagePoolBundle", {}).get("lunMapping", []):
+            if mapping["volumeRef"] in volume_names:
+                key = add_task("lun_mapping", mapping["lunMappingRef"], "volume-mappings/%s" % mapping["lunMappingRef"], mapping["volumeRef"])
+                tasks[("volume", mapping["volumeRef"])]["requires"].add(key)
+
+        for copy_pair in graph.get("volumeCopy", []):
+            for volume_id in [copy_pair["sourceVolume"], copy_pair["targetVolume"]]:
+                if volume_id in volume_names:
+                    key = add_task("volume_copy_pair", copy_pair["volcopyRef"], "volume-copy-jobs/%s" % copy_pair["volcopyRef"], volume_id)
+                    tasks[("volume", volume_id)]["requires"].add(key)
+
+        for member in volume_bundle.get("asyncMirrorGroupMember", []):
+            if member["localVolumeRef"] in volume_names:
+                key = add_task("mirror_group_member", member["memberRef"], "async-mirrors/%s/pairs/%s" % (member["mirrorGroup"], member["memberRef"]),
+                               member["localVolumeRef"])
+                tasks[("volume", member["localVolumeRef"])]["requires"].add(key)
+
+        snapshot_volumes = dict()
+        for view in volume_bundle.get("pitView", []):
+            if view["baseVol"] in volume_names:
+                key = add_task("snapshot_volume", view["viewRef"], "snapshot-volumes/%s" % view["viewRef"], view["baseVol"])
+                tasks[("volume", view["baseVol"])]["requires"].add(key)
+                snapshot_volumes.setdefault(view["baseVol"], set()).add(key)
+
+        for group in volume_bundle.get("pitGroup", []):
+            if group["baseVolume"] in volume_names:
+                key = add_task("snapshot_group", group["pitGroupRef"], "snapshot-groups/%s" % group["pitGroupRef"], group["baseVolume"])
+                tasks[key]["requires"].update(snapshot_volumes.get(group["baseVolume"], set()))
+                tasks[("volume", group["baseVolume"])]["requires"].add(key)
+
+        return tasks
+
+    def delete_object(self, task):
+        """Delete the storage system object described by the deletion task.
+
+        :return float: duration of the deletion in seconds.
+        """
+        start = time.time()
+        rc, resp = self.request(task["path"], method="DELETE")
+        return time.time() - start
+
+    def delete_volumes(self, tasks, results):
+        """Delete the volumes and their dependent objects in dependency order.
+
+        Each round deletes, concurrently, every object whose dependencies have been deleted. When a deletion fails, the
+        remaining objects for the same volume are skipped.
+
+        :return list: deleted object details including the time taken by each deletion.
+        """
+        deleted_objects = list()
+        remaining = OrderedDict(tasks)
+        while remaining:
+            ready = [key for key, task in remaining.items() if not task["requires"] & set(remaining.keys())]
+            outcomes = run_concurrently(self.delete_object, [(remaining[key],) for key in ready], self.concurrency)
+            for key, outcome in zip(ready, outcomes):
+                task = remaining.pop(key)
+                deleted_object = dict(type=task["type"], id=task["id"], volume=task["volume"], failed=isinstance(outcome, Exception),
+                                      seconds=None if isinstance(outcome, Exception) else round(outcome, 3))
+                deleted_objects.append(deleted_object)
+
+                if deleted_object["failed"]:
+                    results[task["volume"]].update(dict(failed=True, msg="Failed to delete %s [%s] for volume [%s]. Array Id [%s]. Error[%s]."
+                                                                         % (task["type"], task["id"], task["volume"], self.ssid, to_native(outcome))))
+                    for skipped_key in [skipped_key for skipped_key, skipped in remaining.items() if skipped["volume"] == task["volume"]]:
+                        remaining.pop(skipped_key)
+                elif task["type"] == "volume":
+                    results[task["volume"]]["msg"] = "Volume [%s] has been deleted." % task["volume"]
+        return deleted_objects
+
+    def plan_volumes(self, array_state):
+        """Determine the change plan for every volume in the volumes list from a snapshot of the storage array state.
+
+        Planning does not contact the storage array so the complete plan, including the capacity required by all
+        expansions and the objects to delete, is known before any change is applied.
+
+        :return dict: whether changes are required, the volume contexts to change, the workload definitions, the deletion
+                      tasks and the results for each volume including its plan.
+        """
+        contexts = [self.get_volume_context(spec, array_state) for spec in self.volumes]
+        workload_change, workloads = self.plan_workload_tags(contexts, array_state["workload_tags"])
+        change = workload_change
+
+        results = OrderedDict((context.name, dict(name=context.name, changed=False, failed=False, msg=None, plan=None)) for context in contexts)
+        changed_contexts = list()
+        for context in contexts:
+            try:
+                results[context.name]["changed"] = context.determine_change()
+            except DeferredFailure as error:
+                results[context.name].update(dict(failed=True, msg=error.msg))
+                continue
+
+            results[context.name]["plan"] = context.plan
+            if results[context.name]["changed"]:
+                change = True
+                changed_contexts.append(context)
+            results[context.name]["msg"] = ("Volume [%s] does not exist." if context.state == "absent" else "Volume [%s] exists.") % context.name
+
+        # Storage pool requirements of each volume creation are verified before any volume is created.
+        for context in changed_contexts:
+            if context.state == "present" and not context.volume_detail:
+                try:
+                    context.check_storage_pool_sufficiency()
+                except DeferredFailure as error:
+                    results[context.name].update(dict(failed=True, msg=error.msg))
+
+        deletion_tasks = OrderedDict()
+        deletions = [context for context in changed_contexts if context.state == "absent" and not results[context.name]["failed"]]
+        if deletions:
+            deletion_tasks = self.get_deletion_plan(deletions, array_state["graph"])
+            if not self.delete_dependencies:
+                for context in deletions:
+                    dependencies = sorted(set([task["type"] for task in deletion_tasks.values()
+                                               if task["volume"] == context.name and task["type"] != "volume"]))
+                    if dependencies:
+                        results[context.name].update(dict(failed=True, msg="Volume [%s] has dependent objects [%s]. Set delete_dependencies to delete"
+                                                                           " them. Array [%s]." % (context.name, ", ".join(dependencies), self.ssid)))
+            deletion_tasks = OrderedDict((key, task) for key, task in deletion_tasks.items() if not results[task["volume"]]["failed"])
+            for context in deletions:
+                context.plan["delete"]["dependencies"] = [dict(type=task["type"], id=task["id"], path=task["path"])
+                                                          for task in deletion_tasks.values() if task["volume"] == context.name and task["type"] != "volume"]
+
+        capacity_contexts = [context for context in changed_contexts if not results[context.name]["failed"]]
+        for name, msg in self.check_capacity(capacity_contexts, array_state, [context for context in capacity_contexts if context.state == "absent"]).items():
+            results[name].update(dict(failed=True, msg=msg))
+
+        return dict(change=change,
+                    contexts=[context for context in changed_contexts if not results[context.name]["failed"] and context.state != "absent"],
+                    workload_change=workload_change,
+                    workloads=workloads,
+                    deletion_tasks=deletion_tasks,
+                    results=results)
+
+    def apply_volumes(self):
+        """Reconcile every volume in the volumes list using a single retrieval of the storage array state.
+
+        The change plan for every volume is determined before any change is applied and is returned with the results.
+
+        :raise AnsibleExitJson when all volumes are successfully reconciled.
+        :raise AnsibleFailJson when any volume fails to be reconciled.
+        """
+        array_state = self.get_array_state()
+        plan = self.plan_volumes(array_state)
+        change = plan["change"]
+        changed_contexts = plan["contexts"]
+        results = plan["results"]
+
+        if plan["workload_change"] and not self.module.check_mode:
+            workload_change, workload_ids = self.reconcile_workloads(plan["workloads"], array_state["workload_tags"])
+
+            # Newly created workload tag ids are only known once created so the plans that reference them are determined again.
+            for context in changed_contexts:
+                if context.workload_name and context.workload_id != workload_ids[context.workload_name]:
+                    context.workload_id = workload_ids[context.workload_name]
+                    context.plan = results[context.name]["plan"] = context.plan_volume()
+
+        deleted_objects = list()
+        if plan["deletion_tasks"] and not self.module.check_mode:
+            deleted_objects = self.delete_volumes(plan["deletion_tasks"], results)
+
+        if changed_contexts and not self.module.check_mode:
+            outcomes = run_concurrently(NetAppESeriesVolume.apply_change, [(context,) for context in changed_contexts], self.concurrency)
+            for context, outcome in zip(changed_contexts, outcomes):
+                if isinstance(outcome, Exception):
+                    results[context.name].update(dict(failed=True, msg=outcome.msg if isinstance(outcome, DeferredFailure) else to_native(outcome)))
+                else:
+                    results[context.name]["msg"] = outcome
+
+            self.expand_volumes([context for context in changed_contexts if context.expansion_pending and not results[context.name]["failed"]], results)
+
+            tracker = VolumeProgressTracker(self)
+            for context in changed_contexts:
+                if not results[context.name]["failed"] and context.state == "present" and context.wait_for_initialization and context.volume_detail:
+                    tracker.watch(context.volume_detail)
+                    context.operation = None
+            if tracker.volumes:
+                self.module.log("Waiting for volume operations to complete.")
+                try:
+                    tracker.wait()
+                except Exception as error:
+                    self.module.fail_json(msg="Failed to get volume operation progress. Array [%s]. Error[%s]." % (self.ssid, to_native(error)),
+                                          changed=change, volumes=list(results.values()))
+                self.module.log("Volume operations are complete.")
+
+        operations = [context.operation for context in changed_contexts if context.operation]
+        results = list(results.values())
+        failed = [result["name"] for result in results if result["failed"]]
+        if failed:
+            self.module.fail_json(msg="Failed to reconcile volumes [%s]. Array [%s]." % (", ".join(failed), self.ssid), changed=change, volumes=results,
+                                  deleted_objects=deleted_objects, operations=operations)
+
+        self.module.exit_json(msg="Reconciled %s volumes." % len(results), changed=change, volumes=results, deleted_objects=deleted_objects,
+                              operations=operations)
+
+    def apply(self):
+        """Determine and apply any changes necessary to satisfy the specified criteria.
+
+        :raise AnsibleExitJson when completes successfully"""
+        if self.volumes is not None:
+            self.apply_volumes()
+
+        self.volume_detail = self.get_volume()
+        self.pool_detail = self.get_storage_pool()
 
-        self.module.exit_json(msg=(msg % self.name if msg and "%s" in msg else msg), changed=change)
+        change, msg = self.reconcile_volume()
+        self.module.exit_json(msg=msg, changed=change, plan=self.plan, operations=[self.operation] if self.operation else [])
 
 
 def main():
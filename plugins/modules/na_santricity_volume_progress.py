@@ -0,0 +1,177 @@
+#!/usr/bin/python
+
+# (c) 2020, NetApp, Inc
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+DOCUMENTATION = """
+---
+module: na_santricity_volume_progress
+short_description: NetApp E-Series retrieve the progress of volume operations
+description:
+    - Retrieve the progress of volume creations and expansions submitted by M(na_santricity_volume).
+    - The progress of every operation is determined from a single request to the storage system.
+author:
+    - Nathan Swartz (@ndswartz)
+extends_documentation_fragment:
+    - netapp_eseries.santricity.santricity.santricity_doc
+options:
+    operations:
+        description:
+            - Operation handles returned by M(na_santricity_volume) in I(operations).
+            - Handles for other storage systems are ignored so the handles from several storage systems may be provided.
+        type: list
+        elements: dict
+        required: true
+        suboptions:
+            volume_ref:
+                description: Volume reference of the volume whose operation is tracked.
+                type: str
+                required: true
+            ssid:
+                description: Storage system identifier of the volume.
+                type: str
+                required: false
+            name:
+                description: Name of the volume.
+                type: str
+                required: false
+            action:
+                description: Operation that was submitted.
+                type: str
+                required: false
+            start_time:
+                description: Time the operation was submitted in seconds since the epoch.
+                type: int
+                required: false
+    wait:
+        description:
+            - Whether to wait for every operation to complete.
+        type: bool
+        default: false
+        required: false
+    wait_timeout:
+        description:
+            - Maximum number of seconds to wait for the operations to complete when I(wait=true).
+            - Waits indefinitely when not specified.
+        type: int
+        required: false
+notes:
+    - Check mode is supported.
+    - This module does not change the storage system.
+"""
+EXAMPLES = """
+- name: Create volumes without waiting for their initialization
+  na_santricity_volume:
+    ssid: "{{ ssid }}"
+    api_url: "{{ netapp_api_url }}"
+    api_username: "{{ netapp_api_username }}"
+    api_password: "{{ netapp_api_password }}"
+    validate_certs: "{{ netapp_api_validate_certs }}"
+    storage_pool_name: storage_pool
+    size: 10
+    size_unit: tb
+    volumes:
+      - name: volume1
+      - name: volume2
+  register: volumes
+
+- name: Wait for the volume initializations to complete
+  na_santricity_volume_progress:
+    ssid: "{{ ssid }}"
+    api_url: "{{ netapp_api_url }}"
+    api_username: "{{ netapp_api_username }}"
+    api_password: "{{ netapp_api_password }}"
+    validate_certs: "{{ netapp_api_validate_certs }}"
+    operations: "{{ volumes['operations'] }}"
+  register: progress
+  until: progress['complete']
+  retries: 120
+  delay: 60
+"""
+RETURN = """
+msg:
+    description: Summary of the operation progress.
+    type: str
+    returned: on success
+    sample: "1 of 2 volume operations are complete."
+complete:
+    description: Whether every operation is complete.
+    type: bool
+    returned: on success
+    sample: false
+operations:
+    description:
+        - Operation handles for the storage system with the current action, percentage complete and elapsed time of each.
+        - The current action is complete when no operation is in progress for the volume.
+    type: list
+    returned: on success
+    sample: [{"ssid": "1", "volume_ref": "02000000600A098000A4B9D1000037315D494C6F", "name": "volume1", "action": "create",
+              "start_time": 1760745600, "current_action": "initializing", "percent_complete": 42, "complete": false,
+              "elapsed_seconds": 1860}]
+"""
+import time
+
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, VolumeProgressTracker
+from ansible.module_utils._text import to_native
+
+
+class NetAppESeriesVolumeProgress(NetAppESeriesModule):
+    def __init__(self):
+        ansible_options = dict(operations=dict(type="list", elements="dict", required=True,
+                                               options=dict(volume_ref=dict(type="str", required=True),
+                                                            ssid=dict(type="str", required=False),
+                                                            name=dict(type="str", required=False),
+                                                            action=dict(type="str", required=False),
+                                                            start_time=dict(type="int", required=False))),
+                               wait=dict(type="bool", default=False, required=False),
+                               wait_timeout=dict(type="int", required=False))
+
+        super(NetAppESeriesVolumeProgress, self).__init__(ansible_options=ansible_options,
+                                                          web_services_version="02.00.0000.0000",
+                                                          supports_check_mode=True)
+        args = self.module.params
+        self.operations = [operation for operation in args["operations"] if operation["ssid"] is None or operation["ssid"] == self.ssid]
+        self.wait = args["wait"]
+        self.wait_timeout = args["wait_timeout"]
+
+    def get_operation_progress(self):
+        """Determine the progress of every operation with a single request to the storage system.
+
+        :return list: operation handles with their current action, percentage complete and elapsed time."""
+        tracker = VolumeProgressTracker(self)
+        for operation in self.operations:
+            tracker.watch(dict(id=operation["volume_ref"]))
+
+        try:
+            progress = tracker.wait(self.wait_timeout) if self.wait else tracker.get_progress()
+        except Exception as error:
+            self.module.fail_json(msg="Failed to get volume operation progress. Array [%s]. Error[%s]." % (self.ssid, to_native(error)))
+
+        now = int(time.time())
+        operations = list()
+        for operation in self.operations:
+            entry = progress[operation["volume_ref"]]
+            operation = dict(operation, current_action=entry["action"], percent_complete=entry["percent_complete"],
+                             complete=entry["action"] == "complete")
+            operation.update(dict(elapsed_seconds=now - operation["start_time"] if operation["start_time"] else None))
+            operations.append(operation)
+        return operations
+
+    def apply(self):
+        """Report the progress of the volume operations."""
+        operations = self.get_operation_progress()
+        completed = [operation for operation in operations if operation["complete"]]
+        self.module.exit_json(msg="%s of %s volume operations are complete." % (len(completed), len(operations)), changed=False,
+                              complete=len(completed) == len(operations), operations=operations)
+
+
+def main():
+    progress = NetAppESeriesVolumeProgress()
+    progress.apply()
+
+
+if __name__ == "__main__":
+    main()
@@ -122,6 +122,7 @@ from ansible.module_utils.basic import AnsibleModule
 
 from ansible.module_utils.urls import open_url
 from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import ObjectResolver
 
 
 def request(url, data=None, headers=None, method='GET', use_proxy=True,
@@ -191,17 +192,18 @@ class SnapshotVolume(object):
         if not self.url.endswith('/'):
             self.url += '/'
 
+        self.resolver = ObjectResolver(self.resolver_request, self.ssid)
+
+    def resolver_request(self, path):
+        return request(self.url + path, headers=HEADERS, url_username=self.user, url_password=self.pwd,
+                       validate_certs=self.certs)
+
     @property
     def pool_id(self):
-        pools = 'storage-systems/%s/storage-pools' % self.ssid
-        url = self.url + pools
-        (rc, data) = request(url, headers=HEADERS, url_username=self.user, url_password=self.pwd,
-                             validate_certs=self.certs)
-
-        for pool in data:
-            if pool['name'] == self.storage_pool_name:
-                self.pool_data = pool
-                return pool['id']
+        pool = self.resolver.resolve('storage_pool', self.storage_pool_name)
+        if pool:
+            self.pool_data = pool
+            return pool['id']
 
         self.module.fail_json(msg="No storage pool with the name: '%s' was found" % self.name)
 
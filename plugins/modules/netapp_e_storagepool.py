@@ -151,11 +151,11 @@ msg:
     type: str
     sample: Json facts for the pool that was created.
 """
-import functools
 from itertools import groupby
 from time import sleep
 from pprint import pformat
 from ansible_collections.netapp_eseries.santricity.plugins.module_utils.netapp import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import clear_memoized, memoize
 from ansible.module_utils._text import to_native
 
 
@@ -168,22 +168,6 @@ def get_most_common_elements(iterator):
     return sorted(grouped, key=lambda x: x[1], reverse=True)
 
 
-def memoize(func):
-    """Generic memoizer for any function with any number of arguments including zero."""
-
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        class MemoizeFuncArgs(dict):
-            def __missing__(self, _key):
-                self[_key] = func(*args, **kwargs)
-                return self[_key]
-
-        key = str((args, kwargs)) if args and kwargs else "no_argument_response"
-        return MemoizeFuncArgs().__getitem__(key)
-
-    return wrapper
-
-
 class NetAppESeriesStoragePool(NetAppESeriesModule):
     EXPANSION_TIMEOUT_SEC = 10
     DEFAULT_DISK_POOL_MINIMUM_DISK_COUNT = 11
@@ -684,6 +668,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                                         % self.ssid, method="POST", data=dict(driveRef=drives_list))
             except Exception as error:
                 self.module.fail_json(msg="Failed to erase all secured drives. Array [%s]" % self.ssid)
+            clear_memoized(self)
 
         return changed
 
@@ -714,6 +699,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                                       % (self.ssid, to_native(error)))
 
         # Update drive and storage pool information
+        clear_memoized(self)
         self.pool_detail = self.storage_pool
 
     def delete_storage_pool(self):
@@ -734,6 +720,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             except Exception as error:
                 self.module.fail_json(msg="Failed to erase drives prior to creating new storage pool. Array [%s]."
                                           " Error [%s]." % (self.ssid, to_native(error)))
+        clear_memoized(self)
 
     def secure_storage_pool(self, check_mode=False):
         """Enable security on an existing storage pool"""
@@ -771,6 +758,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             except Exception as error:
                 self.module.fail_json(msg="Failed to change the raid level of storage pool. Array id [%s]."
                                           "  Error[%s]." % (self.ssid, to_native(error)))
+            clear_memoized(self)
 
         self.pool_detail = self.storage_pool
         return needs_migration
@@ -815,6 +803,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
 
                     self.module.fail_json(msg="Failed to add drives to storage pool. Pool id [%s]. Array id [%s]."
                                               "  Error[%s]." % (self.pool_detail["id"], self.ssid, to_native(error)))
+                clear_memoized(self)
 
                 # Wait for expansion completion unless it is the last request in the candidate list
                 if required_expansion_candidate_list:
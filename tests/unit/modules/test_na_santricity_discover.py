@@ -63,6 +63,23 @@ class AlertsTest(ModuleTestCase):
         self.assertEqual(discover.systems_found, {"012345678901": {"api_urls": ["https://192.168.1.101:8443/devmgr/v2/storage-systems/1/"],
                                                                    "label": "array_label", "addresses": [], "proxy_required": False}})
 
+    def test_merge_systems_found_pass(self):
+        """Verify merge_systems_found combines worker results for the same storage system."""
+        self._set_args()
+        discover = NetAppESeriesDiscover()
+        discover.merge_systems_found([{"012345678901": {"api_urls": ["https://192.168.1.100:8443/devmgr/v2/storage-systems/1/"], "label": "array_label",
+                                                        "addresses": [], "proxy_ssid": "", "proxy_required": False}},
+                                      {},
+                                      {"012345678901": {"api_urls": ["https://192.168.1.101:8443/devmgr/v2/storage-systems/1/"], "label": "array_label",
+                                                        "addresses": [], "proxy_ssid": "", "proxy_required": False},
+                                       "012345678902": {"api_urls": ["https://192.168.1.102:8443/devmgr/v2/storage-systems/1/"], "label": "array_label2",
+                                                        "addresses": [], "proxy_ssid": "", "proxy_required": False}}])
+        self.assertEqual(discover.systems_found, {"012345678901": {"api_urls": ["https://192.168.1.100:8443/devmgr/v2/storage-systems/1/",
+                                                                                "https://192.168.1.101:8443/devmgr/v2/storage-systems/1/"],
+                                                                   "label": "array_label", "addresses": [], "proxy_ssid": "", "proxy_required": False},
+                                                  "012345678902": {"api_urls": ["https://192.168.1.102:8443/devmgr/v2/storage-systems/1/"],
+                                                                   "label": "array_label2", "addresses": [], "proxy_ssid": "", "proxy_required": False}})
+
     def test_no_proxy_discover_pass(self):
         """Verify no_proxy_discover completes successfully."""
         self._set_args()
@@ -153,6 +170,19 @@ class AlertsTest(ModuleTestCase):
                 with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"requestId": "1"})] + [(200, {"discoverProcessRunning": True})] * 300):
                     discover.proxy_discover()
 
+    def test_update_proxy_with_proxy_ssid_pass(self):
+        """Verify update_proxy_with_proxy_ssid sets the proxy ssid for proxy required systems."""
+        self._set_args({"subnet_mask": "192.168.1.0/30", "proxy_url": "https://192.168.1.200", "proxy_username": "admin", "proxy_password": "adminpass"})
+        discover = NetAppESeriesDiscover()
+        discover.systems_found = {"012345678901": {"api_urls": [], "label": "array1", "addresses": [], "proxy_ssid": "", "proxy_required": True},
+                                  "012345678902": {"api_urls": [], "label": "array2", "addresses": [], "proxy_ssid": "", "proxy_required": False},
+                                  "012345678903": {"api_urls": [], "label": "array3", "addresses": [], "proxy_ssid": "", "proxy_required": True}}
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, [{"id": "array1", "chassisSerialNumber": "012345678901"},
+                                                                {"id": "array2", "chassisSerialNumber": "012345678902"}])):
+            discover.update_proxy_with_proxy_ssid()
+        self.assertEqual([discover.systems_found[serial]["proxy_ssid"] for serial in ["012345678901", "012345678902", "012345678903"]],
+                         ["array1", "", ""])
+
     def test_discover_pass(self):
         """Verify discover successfully completes."""
         self._set_args({"subnet_mask": "192.168.1.0/30", "proxy_url": "https://192.168.1.200", "proxy_username": "admin", "proxy_password": "adminpass"})
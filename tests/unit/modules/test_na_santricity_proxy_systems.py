@@ -110,6 +110,23 @@ class StoragePoolTest(ModuleTestCase):
                      "meta_tags": [], "controller_addresses": ["192.168.1.35", "192.168.1.36"], "embedded_available": False, "accept_certificate": False,
                      "current_info": {}, "changes": {}, "updated_required": False, "failed": False, "discovered": True}])
 
+    def test_discover_array_partial_results_pass(self):
+        """Verify discover_array stops polling once all expected systems are reported by a running discovery process."""
+        self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24", "systems": [{"ssid": "1", "serial": "1"}, {"serial": "2"}]})
+        running = {"discoverProcessRunning": True, "storageSystems": [{"serialNumber": "1", "ipAddresses": ["192.168.1.5", "192.168.1.6"],
+                                                                       "supportedManagementPorts": ["https", "symbol"]}]}
+        partial = {"discoverProcessRunning": True, "storageSystems": [{"serialNumber": "1", "ipAddresses": ["192.168.1.5", "192.168.1.6"],
+                                                                       "supportedManagementPorts": ["https", "symbol"]},
+                                                                      {"serialNumber": "2", "ipAddresses": ["192.168.1.15", "192.168.1.16"],
+                                                                       "supportedManagementPorts": ["symbol"]}]}
+        systems = NetAppESeriesProxySystems()
+        with mock.patch(self.TIME_FUNC, return_value=None):
+            with mock.patch(self.REQUEST_FUNC, side_effect=[(200, {"requestId": "1"}), (200, running), (200, partial)]):
+                systems.discover_array()
+        self.assertEquals([system["discovered"] for system in systems.systems], [True, True])
+        self.assertEquals(systems.systems[1]["controller_addresses"], ["192.168.1.15", "192.168.1.16"])
+        self.assertEquals(systems.undiscovered_systems, [])
+
     def test_discover_array_fail(self):
         """Verify discover_array method throws expected exceptions."""
         self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24", "add_discovered_systems": True})
@@ -189,6 +206,7 @@ class StoragePoolTest(ModuleTestCase):
         self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24",
                         "systems": [{"ssid": "1", "serial": "1"}, {"addresses": ["192.168.1.36"]}, {"serial": "2"}, {"serial": "5"}]})
         systems = NetAppESeriesProxySystems()
+        systems.is_reachable = lambda address, port: True
         with mock.patch(self.TIME_FUNC, return_value=None):
             with mock.patch(self._REQUEST_FUNC, return_value=(200, None)):
                 systems.set_password(system)
@@ -197,6 +215,7 @@ class StoragePoolTest(ModuleTestCase):
         self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24",
                         "systems": [{"ssid": "1", "serial": "1"}, {"addresses": ["192.168.1.36"]}, {"serial": "2"}, {"serial": "5"}]})
         systems = NetAppESeriesProxySystems()
+        systems.is_reachable = lambda address, port: True
         with mock.patch(self.TIME_FUNC, return_value=None):
             with mock.patch(self._REQUEST_FUNC, return_value=(401, None)):
                 systems.set_password(system)
@@ -210,6 +229,7 @@ class StoragePoolTest(ModuleTestCase):
         self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24",
                         "systems": [{"ssid": "1", "serial": "1"}, {"addresses": ["192.168.1.36"]}, {"serial": "2"}, {"serial": "5"}]})
         systems = NetAppESeriesProxySystems()
+        systems.is_reachable = lambda address, port: True
         with mock.patch(self.TIME_FUNC, return_value=None):
             with mock.patch(self._REQUEST_FUNC, return_value=Exception()):
                 systems.set_password(system)
@@ -221,11 +241,55 @@ class StoragePoolTest(ModuleTestCase):
         self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24",
                         "systems": [{"ssid": "1", "serial": "1"}, {"addresses": ["192.168.1.36"]}, {"serial": "2"}, {"serial": "5"}]})
         systems = NetAppESeriesProxySystems()
+        systems.is_reachable = lambda address, port: True
         with mock.patch(self.TIME_FUNC, return_value=None):
             with mock.patch(self._REQUEST_FUNC, side_effect=[(200, None), Exception(), Exception(), Exception()]):
                 systems.set_password(system)
                 self.assertTrue(system["failed"])
 
+    def test_set_password_unreachable_fail(self):
+        """Verify set_password does not issue requests to unreachable storage systems."""
+        system = {"ssid": "1", "serial": "1", "password": "password", "password_valid": None, "password_set": None, "stored_password_valid": None,
+                  "meta_tags": [], "controller_addresses": ["192.168.1.5", "192.168.1.6"], "embedded_available": True, "accept_certificate": True,
+                  "current_info": {}, "changes": {}, "updated_required": False, "failed": False, "discovered": True}
+        self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24", "systems": [{"ssid": "1", "serial": "1"}]})
+        systems = NetAppESeriesProxySystems()
+        systems.is_reachable = lambda address, port: False
+        with mock.patch(self._REQUEST_FUNC, return_value=(200, None)) as request:
+            systems.set_password(system)
+        self.assertTrue(system["failed"])
+        self.assertEquals(request.call_count, 0)
+
+    def test_bootstrap_passwords_pass(self):
+        """Verify bootstrap_passwords checks every storage system since a valid proxy password does not mean the admin password is set."""
+        self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24", "systems": [{"ssid": "1", "serial": "1"}]})
+        systems = NetAppESeriesProxySystems()
+        bootstrapped = []
+        systems.set_password = lambda system: bootstrapped.append(system["ssid"])
+        systems.bootstrap_passwords([{"ssid": "1", "serial": "1", "controller_addresses": [], "stored_password_valid": True, "password_set": None},
+                                     {"ssid": "2", "serial": "2", "controller_addresses": [], "stored_password_valid": None, "password_set": None},
+                                     {"ssid": "3", "serial": "3", "controller_addresses": ["192.168.1.25"], "stored_password_valid": None,
+                                      "password_set": None}])
+        self.assertEquals(sorted(bootstrapped), ["1", "2", "3"])
+
+    def test_set_password_probes_lazily_pass(self):
+        """Verify set_password probes an endpoint only when the previous endpoints failed to respond."""
+        self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24", "systems": [{"ssid": "1", "serial": "1"}]})
+        systems = NetAppESeriesProxySystems()
+        system = {"ssid": "1", "serial": "1", "password": "password", "password_set": None, "embedded_available": True, "failed": False,
+                  "controller_addresses": ["192.168.1.25", "192.168.1.26"]}
+        probed = []
+
+        def is_reachable(address, port):
+            probed.append((address, port))
+            return True
+
+        systems.is_reachable = is_reachable
+        with mock.patch(self._REQUEST_FUNC, return_value=(401, None)):
+            systems.set_password(system)
+        self.assertTrue(system["password_set"])
+        self.assertEquals(probed, [("192.168.1.25", 8443)])
+
     def test_update_system_changes_pass(self):
         """Verify system changes."""
         system = {"ssid": "1", "serial": "1", "password": "password", "password_valid": None, "password_set": None, "stored_password_valid": None,
@@ -326,6 +390,30 @@ class StoragePoolTest(ModuleTestCase):
             with mock.patch(self.REQUEST_FUNC, side_effect=[(200, None), Exception()]):
                 systems.add_system(system)
 
+    def test_validate_passwords_pass(self):
+        """Validate validate_passwords polls all pending systems together until validated."""
+        self._set_args({"password": "password", "subnet_mask": "192.168.1.0/24", "systems": [{"ssid": "1", "serial": "1"}, {"serial": "2"}]})
+        systems = NetAppESeriesProxySystems()
+        attempts = {"1": 0, "2": 0}
+
+        def validate_password(system):
+            attempts[system["ssid"]] += 1
+            if system["ssid"] == "2" and attempts["2"] == 1:
+                raise Exception("password state unknown")
+
+        systems.validate_password = validate_password
+        with mock.patch(self.TIME_FUNC, return_value=None) as sleep:
+            systems.validate_passwords([{"ssid": "1"}, {"ssid": "2"}])
+        self.assertEquals(sleep.call_count, 2)
+        self.assertEquals(attempts, {"1": 1, "2": 2})
+        self.assertEquals(sorted(systems.system_timings.keys()), ["1", "2"])
+
+    def test_concurrency_option_fail(self):
+        """Validate invalid concurrency options throw expected exceptions."""
+        self._set_args({"password": "password", "concurrency": {"add": 0}})
+        with self.assertRaisesRegexp(AnsibleFailJson, "Concurrency must be a positive number."):
+            NetAppESeriesProxySystems()
+
     def test_update_system_pass(self):
         """Validate update_system method."""
         system = {"ssid": "1", "changes": {}}
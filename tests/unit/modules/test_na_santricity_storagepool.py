@@ -5,6 +5,7 @@ __metaclass__ = type
 
 from units.modules.utils import AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_storagepool import NetAppESeriesStoragePool
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import DriveIndex, StoragePoolProgressTracker
 from units.compat.mock import patch, PropertyMock
 
 
@@ -368,6 +369,7 @@ class StoragePoolTest(ModuleTestCase):
     NETAPP_REQUEST_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.NetAppESeriesModule.request"
     DRIVES_PROPERTY = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_storagepool.NetAppESeriesStoragePool.drives"
     STORAGE_POOL_PROPERTY = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_storagepool.NetAppESeriesStoragePool.storage_pool"
+    SLEEP_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.time.sleep"
 
     def _set_args(self, args=None):
         module_args = self.REQUIRED_PARAMS.copy()
@@ -392,6 +394,21 @@ class StoragePoolTest(ModuleTestCase):
             with self.assertRaisesRegexp(AnsibleFailJson, "Failed to fetch disk drives."):
                 drives = storagepool.drives
 
+    def test_drives_snapshot(self):
+        """Verify drives are retrieved once until the snapshot is invalidated."""
+        with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
+            netapp_request.return_value = (200, self.DRIVES_DATA)
+            storagepool = self._initialize_dummy_instance()
+            self.assertEqual(storagepool.drives, self.DRIVES_DATA)
+            self.assertEqual(len(storagepool.available_drives), 15)
+            self.assertEqual(storagepool.available_drive_types[0], "hdd")
+            self.assertEqual(len(storagepool.get_available_drive_capacities()), 1)
+            self.assertEqual(netapp_request.call_count, 1)
+
+            storagepool.invalidate_snapshot()
+            self.assertEqual(storagepool.drives, self.DRIVES_DATA)
+            self.assertEqual(netapp_request.call_count, 2)
+
     def test_available_drives(self):
         """Verify all drives returned are available"""
         with patch(self.DRIVES_PROPERTY, new_callable=PropertyMock) as drives:
@@ -545,6 +562,33 @@ class StoragePoolTest(ModuleTestCase):
             self.assertAlmostEqual(storagepool.get_ddp_capacity(self.EXPANSION_DDP_DRIVES_LIST), 6038680353645,
                                    places=-2)  # Allows for python version/architecture computational differences
 
+    def test_capacity_model(self):
+        """Verify the capacity model evaluates drive sets and plans each drive type without requests."""
+        with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
+            with patch(self.DRIVES_PROPERTY, new_callable=PropertyMock) as drives:
+                drives.return_value = self.DRIVES_DATA
+
+                storagepool = self._initialize_dummy_instance(
+                    {"state": "present", "name": "pool", "criteria_drive_count": "12", "raid_level": "raidDiskPool"})
+                model = storagepool.capacity_model
+                evaluations = model.evaluate("raidDiskPool", [self.EXPANSION_DDP_DRIVES_LIST, self.EXPANSION_DDP_DRIVES_LIST[:11]])
+                self.assertAlmostEqual(evaluations[0]["usable_capacity"], storagepool.get_ddp_capacity(self.EXPANSION_DDP_DRIVES_LIST), places=-2)
+                self.assertEqual(evaluations[1]["drive_count"], 11)
+                self.assertEqual(evaluations[1]["drive_usable_capacity"], 299463129088)
+
+                self.assertEqual(model.plan("raid6"), [
+                    {"drive_media_type": "hdd", "drive_interface_type": "sas", "drive_usable_capacity": 299463129088,
+                     "available_drive_count": 10, "drive_count": 10, "usable_capacity": 8 * 299463129088},
+                    {"drive_media_type": "ssd", "drive_interface_type": "sas", "drive_usable_capacity": 299463129088,
+                     "available_drive_count": 4, "drive_count": 4, "usable_capacity": None},
+                    {"drive_media_type": "ssd", "drive_interface_type": "sata", "drive_usable_capacity": 299463129088,
+                     "available_drive_count": 1, "drive_count": 1, "usable_capacity": None}])
+
+                plan = storagepool.get_capacity_plan()
+                self.assertEqual([entry["drive_count"] for entry in plan], [12, 12, 12])
+                self.assertAlmostEqual(plan[0]["usable_capacity"], model.get_ddp_capacity(12, 299463129088), places=-2)
+                self.assertEqual(netapp_request.call_count, 0)
+
     def test_get_candidate_drives(self):
         """Verify correct candidate list is returned."""
         with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
@@ -591,6 +635,129 @@ class StoragePoolTest(ModuleTestCase):
                      'spindleSpeedMatch': True, 'driveBlockFormat': 'allNative', 'usableCapacity': '1796778774528',
                      'wastedCapacity': '0'}])
 
+    def test_get_candidate_drives_each_drive_type(self):
+        """Verify volume candidates are requested for every drive interface and media type combination."""
+        with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
+            netapp_request.return_value = (200, self.RAID6_CANDIDATE_DRIVES)
+            with patch(self.DRIVES_PROPERTY, new_callable=PropertyMock) as drives:
+                drives.return_value = self.DRIVES_DATA
+
+                storagepool = self._initialize_dummy_instance(
+                    {"state": "present", "name": "raid6_vg", "criteria_drive_count": "6", "raid_level": "raid6"})
+                self.assertEqual(storagepool.get_candidate_drives()["driveCount"], 6)
+                self.assertEqual(netapp_request.call_count, 4)
+                self.assertEqual(sorted((call[1]["data"]["phyDriveType"], call[1]["data"]["driveMediaType"]) for call in netapp_request.call_args_list),
+                                 [("sas", "hdd"), ("sas", "ssd"), ("sata", "hdd"), ("sata", "ssd")])
+
+        with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
+            netapp_request.side_effect = Exception()
+            with patch(self.DRIVES_PROPERTY, new_callable=PropertyMock) as drives:
+                drives.return_value = self.DRIVES_DATA
+
+                storagepool = self._initialize_dummy_instance(
+                    {"state": "present", "name": "raid6_vg", "criteria_drive_count": "6", "raid_level": "raid6"})
+                with self.assertRaisesRegexp(AnsibleFailJson, "Failed to retrieve volume candidates."):
+                    storagepool.get_candidate_drives()
+
+    def test_get_candidate_drives_memoized(self):
+        """Verify volume candidates are retrieved again only after changes to the storage system."""
+        with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
+            netapp_request.return_value = (200, self.RAID6_CANDIDATE_DRIVES)
+            with patch(self.DRIVES_PROPERTY, new_callable=PropertyMock) as drives:
+                drives.return_value = self.DRIVES_DATA
+
+                storagepool = self._initialize_dummy_instance(
+                    {"state": "present", "name": "raid6_vg", "criteria_drive_count": "6", "raid_level": "raid6"})
+                candidate = storagepool.get_candidate_drives()
+                request_count = netapp_request.call_count
+
+                candidate["driveRefList"]["driveRef"].pop()
+                self.assertEqual(len(storagepool.get_candidate_drives()["driveRefList"]["driveRef"]), 6)
+                self.assertEqual(netapp_request.call_count, request_count)
+
+                storagepool.invalidate_snapshot()
+                storagepool.get_candidate_drives()
+                self.assertEqual(netapp_request.call_count, request_count * 2)
+
+    def test_get_candidate_drives_ddp_usable_capacity(self):
+        """Verify disk pool candidates are evaluated with the smallest available drive like disk pool expansions."""
+        smaller_drive = self.EXPANSION_DDP_DRIVES_LIST[0]
+        drives_data = [dict(drive, usableCapacity="199463129088") if drive["id"] == smaller_drive else drive for drive in self.DRIVES_DATA]
+        candidate = {"driveCount": 11, "driveRefList": {"driveRef": self.EXPANSION_DDP_DRIVES_LIST[1:12]}, "usableSize": str(10 * 1024 ** 4),
+                     "trayLossProtection": False, "drawerLossProtection": False}
+
+        with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
+            netapp_request.return_value = (200, {"volumeCandidate": [candidate]})
+            with patch(self.DRIVES_PROPERTY, new_callable=PropertyMock) as drives:
+                drives.return_value = drives_data
+
+                storagepool = self._initialize_dummy_instance({"state": "present", "name": "pool", "raid_level": "raidDiskPool"})
+                usable_capacity = storagepool.get_ddp_capacity(candidate["driveRefList"]["driveRef"])
+                storagepool.criteria_min_usable_capacity = usable_capacity
+                self.assertEqual(storagepool.get_candidate_drives(), candidate)
+
+                storagepool = self._initialize_dummy_instance({"state": "present", "name": "pool", "raid_level": "raidDiskPool"})
+                storagepool.criteria_min_usable_capacity = usable_capacity + 1
+                with self.assertRaisesRegexp(AnsibleFailJson, "Not enough drives to meet the specified criteria."):
+                    storagepool.get_candidate_drives()
+
+                # the minimum drive size is compared with the candidate's own drives
+                storagepool = self._initialize_dummy_instance({"state": "present", "name": "pool", "raid_level": "raidDiskPool"})
+                storagepool.criteria_drive_min_size = 299463129088
+                self.assertEqual(storagepool.get_candidate_drives(), candidate)
+
+    def test_expand_storage_pool(self):
+        """Verify each expansion step is submitted once the previous expansion completes."""
+        pool = dict(self.STORAGE_POOL_DATA[0], raidLevel="raid6")
+        candidates = {"candidates": [{"drives": ["010000005000C500551E7F2B0000000000000000", "010000005000C500551E99230000000000000000"],
+                                      "usableCapacity": "1"},
+                                     {"drives": ["010000005000C500551E9ED30000000000000000", "010000005000C500551EA29F0000000000000000"],
+                                      "usableCapacity": "1"}]}
+        in_progress = [{"volumeRef": "volume1", "currentAction": "remappingDce", "progressPercentage": 50, "estimatedTimeToCompletion": 5}]
+        action_progress = [[], in_progress, [], in_progress]
+        submitted = list()
+
+        def request(url, method="GET", data=None, **kwargs):
+            if "getVolumeGroupExpansionCandidates" in url:
+                return 200, candidates
+            if url.endswith("capabilities"):
+                return 200, {"featureParameters": {"maxDCEDrives": 2}}
+            if url.endswith("volumes"):
+                return 200, [{"id": "volume1", "volumeGroupRef": pool["volumeGroupRef"]}]
+            if url.endswith("storage-pools"):
+                return 200, [pool]
+            if url.endswith("action-progress"):
+                return 200, action_progress.pop(0)
+            submitted.append((len(action_progress), data["driveRef"]))
+            return 200, {}
+
+        with patch(self.NETAPP_REQUEST_FUNC, side_effect=request):
+            with patch(self.DRIVES_PROPERTY, new_callable=PropertyMock) as drives:
+                drives.return_value = self.DRIVES_DATA
+                with patch(self.SLEEP_FUNC) as sleep:
+                    storagepool = self._initialize_dummy_instance({"state": "present", "name": "pool", "raid_level": "raid6"})
+                    storagepool.pool_detail = pool
+                    storagepool.criteria_drive_count = len(storagepool.storage_pool_drives) + 4
+
+                    self.assertEqual(storagepool.expand_storage_pool(), (True, 5))
+                    self.assertEqual(submitted, [(3, ["010000005000C500551E7F2B0000000000000000", "010000005000C500551E99230000000000000000"]),
+                                                 (1, ["010000005000C500551E9ED30000000000000000", "010000005000C500551EA29F0000000000000000"])])
+                    self.assertEqual(sleep.call_count, 1)
+
+                # An expansion that does not complete within the timeout fails rather than waiting indefinitely.
+                action_progress.extend([in_progress] * 10)
+                submitted = list()
+                with patch(self.SLEEP_FUNC) as sleep:
+                    storagepool = self._initialize_dummy_instance({"state": "present", "name": "pool", "raid_level": "raid6",
+                                                                   "wait_for_completion_timeout": 3})
+                    storagepool.pool_detail = pool
+                    storagepool.criteria_drive_count = len(storagepool.storage_pool_drives) + 4
+                    with self.assertRaisesRegexp(AnsibleFailJson, "Timed out waiting for the storage pool expansion to complete before adding"
+                                                                  " drives. Step \\[1 of 2\\]. Percent complete \\[50\\]."):
+                        storagepool.expand_storage_pool()
+                    self.assertEqual(submitted, [])
+                    self.assertEqual(sum(call[0][0] for call in sleep.call_args_list), 3)
+
     def test_get_maximum_reserve_drive_count(self):
         """Ensure maximum reserve drive count is accurately calculated."""
         with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
@@ -713,3 +880,157 @@ class StoragePoolTest(ModuleTestCase):
                     storagepool.secure_storage_pool = lambda check_mode: False
                     storagepool.set_reserve_drive_count = lambda check_mode: True
                     storagepool.apply()
+
+    def test_apply_storage_pools(self):
+        """Verify storage pools are planned against one drive inventory without choosing the same drives twice."""
+        storage_pools = list()
+        created = list()
+        drive_requests = list()
+
+        def request(url, method="GET", data=None, ignore_errors=False):
+            if url.endswith("drives"):
+                drive_requests.append(url)
+                return 200, self.DRIVES_DATA
+            if url.endswith("storage-pools"):
+                return 200, list(storage_pools)
+            if "getVolumeCandidates" in url:
+                drives = [drive["id"] for drive in self.DRIVES_DATA if drive["id"] in data["candidateSelectionType"]["driveRefList"]["driveRef"] and
+                          drive["phyDriveType"] == data["phyDriveType"] and drive["driveMediaType"] == data["driveMediaType"]]
+                return 200, {"volumeCandidate": [{"driveCount": count, "driveRefList": {"driveRef": drives[:count]}, "usableSize": "1",
+                                                  "drawerLossProtection": False, "trayLossProtection": False}
+                                                 for count in [3, 6] if len(drives) >= count]}
+            if "createVolumeGroup" in url:
+                created.append(data)
+                storage_pools.append({"name": data["label"], "id": data["label"], "volumeGroupRef": data["label"], "securityType": "none",
+                                      "raidLevel": "raid5"})
+                return 200, {}
+            raise Exception("Unexpected request. Url [%s]." % url)
+
+        self._set_args({"raid_level": "raid5", "erase_secured_drives": False,
+                        "storage_pools": [{"name": "vg1", "criteria_drive_count": 3}, {"name": "vg2", "criteria_drive_count": 6}]})
+        storagepool = NetAppESeriesStoragePool()
+        with self.assertRaises(AnsibleExitJson) as result:
+            with patch(self.NETAPP_REQUEST_FUNC, side_effect=request):
+                storagepool.apply()
+
+        results = dict((entry["name"], entry) for entry in result.exception.args[0]["storage_pools"])
+        self.assertTrue(result.exception.args[0]["changed"])
+        self.assertEqual(results["vg1"]["msg"], "Storage pool [vg1] was created.")
+        self.assertEqual(results["vg2"]["msg"], "Storage pool [vg2] was created.")
+        self.assertEqual(len(results["vg1"]["drives"]), 3)
+        self.assertEqual(len(results["vg2"]["drives"]), 6)
+        self.assertFalse(set(results["vg1"]["drives"]) & set(results["vg2"]["drives"]))
+        self.assertEqual(sorted((entry["label"], entry["candidate"]["driveRefList"]["driveRef"]) for entry in created),
+                         [("vg1", results["vg1"]["drives"]), ("vg2", results["vg2"]["drives"])])
+        self.assertEqual(len(drive_requests), 1)
+
+    def test_reprovision_drives(self):
+        """Verify secured drives are erased together and the drives that cannot be erased are reported."""
+        drives = ["010000005000C500551ED1FF0000000000000000", "010000005000C500551E7F2B0000000000000000", "010000005000C500551EC9270000000000000000"]
+
+        with patch(self.NETAPP_REQUEST_FUNC, return_value=(200, {})) as netapp_request:
+            storagepool = self._initialize_dummy_instance()
+            self.assertEqual(storagepool.reprovision_drives(drives), dict())
+            self.assertEqual(netapp_request.call_count, 1)
+
+        def request(url, method="GET", data=None):
+            if len(data["driveRef"]) > 1 or data["driveRef"] == [drives[1]]:
+                raise Exception("reprovision failed")
+            return 200, {}
+
+        with patch(self.NETAPP_REQUEST_FUNC, side_effect=request) as netapp_request:
+            storagepool = self._initialize_dummy_instance()
+            self.assertEqual(storagepool.reprovision_drives(drives), {drives[1]: "reprovision failed"})
+            self.assertEqual(netapp_request.call_count, 4)
+
+        with patch(self.NETAPP_REQUEST_FUNC, side_effect=request):
+            with patch(self.DRIVES_PROPERTY, new_callable=PropertyMock) as drives_property:
+                drives_property.return_value = [dict(self.DRIVES_DATA[0], id=drive, fdeEnabled=True) for drive in drives]
+                storagepool = self._initialize_dummy_instance()
+                with self.assertRaisesRegexp(AnsibleFailJson, "Failed to erase all secured drives. Array \\[1\\]. Drives \\[%s\\]." % drives[1]):
+                    storagepool.erase_all_available_secured_drives()
+
+    def test_storage_pool_progress_tracker(self):
+        """Verify storage pool action progress is aggregated and waited on with growing poll intervals."""
+        pool1 = [{"volumeRef": "volume1", "currentAction": "remappingDce", "progressPercentage": 40, "estimatedTimeToCompletion": 10},
+                 {"volumeRef": "volume2", "currentAction": "initializing", "progressPercentage": 10, "estimatedTimeToCompletion": 30},
+                 {"volumeRef": "volume3", "currentAction": "none", "progressPercentage": 0, "estimatedTimeToCompletion": 0}]
+        pool2 = [{"volumeRef": "volume4", "currentAction": "remappingDce", "progressPercentage": 80, "estimatedTimeToCompletion": 2}]
+
+        with patch(self.NETAPP_REQUEST_FUNC) as netapp_request:
+            storagepool = self._initialize_dummy_instance()
+            tracker = StoragePoolProgressTracker(storagepool)
+            tracker.watch("pool1", actions=["remappingDce"])
+            tracker.watch("pool2")
+
+            netapp_request.side_effect = lambda url, **kwargs: (200, pool1 if "pool1" in url else pool2)
+            progress = tracker.get_progress()
+            self.assertEqual(progress["pool1"]["percent_complete"], 40)
+            self.assertEqual(progress["pool1"]["estimated_time_to_completion"], 10)
+            self.assertEqual(StoragePoolProgressTracker.aggregate(progress),
+                             {"in_progress": 2, "percent_complete": 40, "estimated_time_to_completion": 10})
+
+            tracker.watch("pool1")
+            self.assertEqual(StoragePoolProgressTracker.aggregate(tracker.get_progress()),
+                             {"in_progress": 2, "percent_complete": 10, "estimated_time_to_completion": 30})
+
+            with patch(self.SLEEP_FUNC) as sleep:
+                progress = tracker.wait(timeout=10)
+                self.assertTrue(progress["pool1"]["in_progress"])
+                self.assertEqual([call[0][0] for call in sleep.call_args_list], [1, 2, 4, 3])
+
+            responses = [(200, pool2), (200, []), (404, {})]
+            netapp_request.side_effect = lambda url, **kwargs: responses.pop(0)
+            tracker.unwatch("pool1")
+            with patch(self.SLEEP_FUNC) as sleep:
+                self.assertFalse(tracker.wait()["pool2"]["in_progress"])
+                self.assertEqual(sleep.call_count, 1)
+                self.assertEqual(tracker.get_progress()["pool2"], {"in_progress": False, "actions": [], "percent_complete": None,
+                                                                   "estimated_time_to_completion": 0})
+
+    def test_drive_index(self):
+        """Verify the drive index groups the drive inventory and answers queries in inventory order."""
+        drives = [dict(self.DRIVES_DATA[0], id="drive1", driveMediaType="ssd", fdeEnabled=True),
+                  dict(self.DRIVES_DATA[0], id="drive2", status="failed"),
+                  dict(self.DRIVES_DATA[0], id="drive3", phyDriveType="sata"),
+                  dict(self.DRIVES_DATA[1], id="drive4"),
+                  dict(self.DRIVES_DATA[1], id="drive5", hotSpare=True, fdeEnabled=True),
+                  dict(self.DRIVES_DATA[0], id="drive6", usableCapacity="599463129088")]
+        index = DriveIndex(drives)
+
+        self.assertEqual(index.get_most_common("media_type"), ["hdd", "ssd"])
+        self.assertEqual(index.get_most_common("interface_type"), ["sas", "sata"])
+        self.assertEqual(index.get_available_drive_ids(), ["drive1", "drive3", "drive6"])
+        self.assertEqual(index.get_available_drive_ids(exclude=set(["drive3"])), ["drive1", "drive6"])
+        self.assertEqual(index.get_drive_ids(available=True, media_type="hdd", interface_type="sas"), ["drive2", "drive6"])
+        self.assertEqual(index.get_drive_ids(usable_capacity=299463129088, optimal=True, available=True), ["drive1", "drive3"])
+        self.assertEqual(index.get_drive_ids(fde_enabled=True), ["drive1", "drive5"])
+        self.assertEqual(index.get_drive_ids(da_capable=False), [])
+        self.assertEqual(index.get_drive_ids(media_type="nvme"), [])
+
+        volume_group = self.DRIVES_DATA[1]["currentVolumeGroupRef"]
+        self.assertEqual([drive["id"] for drive in index.get_volume_group_drives(volume_group)], ["drive4"])
+        self.assertEqual([drive["id"] for drive in index.get_volume_group_drives(volume_group, include_hot_spares=True)], ["drive4", "drive5"])
+        self.assertEqual(index.get_drive("drive4"), drives[3])
+        self.assertIsNone(index.get_drive("drive7"))
+
+    def test_storage_pools_options(self):
+        """Verify storage pool list entries fall back to the top-level options and are validated individually."""
+        self._set_args({"storage_pools": [{"name": "vg1", "raid_level": "raid5", "criteria_drive_count": 3}, {"name": "vg2", "state": "absent"}]})
+        storagepool = NetAppESeriesStoragePool()
+        self.assertEqual([(entry["name"], entry["state"], entry["raid_level"]) for entry in storagepool.storage_pools],
+                         [("vg1", "present", "raid5"), ("vg2", "absent", "raidDiskPool")])
+
+        options = dict(storagepool.module.params, name="vg3", raid_level=None)
+        with self.assertRaisesRegexp(AnsibleFailJson, "raid_level is required when state is present. Storage pool \\[vg3\\]."):
+            storagepool.get_storage_pool_spec(options)
+        options.update(state="absent")
+        self.assertEqual(storagepool.get_storage_pool_spec(options)["name"], "vg3")
+
+        self._set_args({"storage_pools": [{"name": "vg1"}, {"name": "vg2"}, {"name": "vg1", "state": "absent"}]})
+        with self.assertRaisesRegexp(AnsibleFailJson, "Storage pool names must be unique. Duplicates \\[vg1\\]."):
+            NetAppESeriesStoragePool()
+
+        self._set_args({"storage_pools": [{"name": "vg1"}], "concurrency": 0})
+        with self.assertRaisesRegexp(AnsibleFailJson, "Concurrency must be a positive number. concurrency \\[0\\]. Array \\[1\\]."):
+            NetAppESeriesStoragePool()
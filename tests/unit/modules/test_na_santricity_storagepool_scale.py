@@ -0,0 +1,201 @@
+# (c) 2020, NetApp, Inc
+# BSD-3 Clause (see COPYING or https://opensource.org/licenses/BSD-3-Clause)
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import threading
+from collections import Counter
+
+from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_storagepool import NetAppESeriesStoragePool
+from units.modules.utils import AnsibleExitJson, ModuleTestCase, set_module_args
+from units.compat.mock import patch
+
+
+class SyntheticStorageSystem(object):
+    """Local stand-in for the storage system endpoints used to plan storage pools.
+
+    Drives are arranged in shelves of SHELF_DRIVE_COUNT drives with the media type alternating between shelves. Existing
+    storage pools are assigned drives from the first shelves and every request is counted by endpoint.
+    """
+    SHELF_DRIVE_COUNT = 60
+    MEDIA_TYPES = [("hdd", 3999688294400), ("ssd", 1599784443904)]
+    RAID_MINIMUM_DRIVE_COUNT = {"raid0": 1, "raid1": 2, "raid5": 3, "raid6": 5, "raidDiskPool": 11}
+    RAID_MAXIMUM_DRIVE_COUNT = 30
+    FREE = "0000000000000000000000000000000000000000"
+
+    def __init__(self, drive_count=480, pool_count=0, pool_drive_count=10, pool_raid_level="raid6", candidate_limit=128):
+        """
+        :param int drive_count: number of drives in the storage system.
+        :param int pool_count: number of existing storage pools.
+        :param int pool_drive_count: number of drives in each existing storage pool.
+        :param str pool_raid_level: raid level of the existing storage pools.
+        :param int candidate_limit: maximum number of candidates returned by each candidate request.
+        """
+        self.candidate_limit = candidate_limit
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+        self.drives = list()
+        for index in range(drive_count):
+            media_type, capacity = self.MEDIA_TYPES[(index // self.SHELF_DRIVE_COUNT) % len(self.MEDIA_TYPES)]
+            self.drives.append({"id": "01%038X" % index, "available": True, "status": "optimal", "currentVolumeGroupRef": self.FREE,
+                                "driveMediaType": media_type, "phyDriveType": "sas", "hotSpare": False, "fdeCapable": True,
+                                "fdeEnabled": False, "usableCapacity": str(capacity), "rawCapacity": str(capacity),
+                                "protectionInformationCapabilities": {"protectionInformationCapable": True, "protectionType": "type2Protection"},
+                                "physicalLocation": {"trayRef": "0E%038X" % (index // self.SHELF_DRIVE_COUNT), "slot": index % self.SHELF_DRIVE_COUNT}})
+
+        self.storage_pools = list()
+        self.volumes = list()
+        for index in range(pool_count):
+            pool_id = "04%038X" % index
+            drives = self.drives[index * pool_drive_count:(index + 1) * pool_drive_count]
+            for drive in drives:
+                drive.update({"available": False, "currentVolumeGroupRef": pool_id})
+            self.storage_pools.append({"name": "pool%s" % index, "id": pool_id, "volumeGroupRef": pool_id, "raidLevel": pool_raid_level,
+                                       "securityType": "capable", "driveMediaType": drives[0]["driveMediaType"],
+                                       "totalRaidedSpace": str(int(drives[0]["usableCapacity"]) * len(drives)),
+                                       "protectionInformationCapabilities": {"protectionInformationCapable": True},
+                                       "volumeGroupData": {"type": "diskPool" if pool_raid_level == "raidDiskPool" else "unknown",
+                                                           "diskPoolData": {"reconstructionReservedDriveCount": 1}}})
+            self.volumes.append({"id": "02%038X" % index, "volumeGroupRef": pool_id})
+
+    def get_endpoint(self, url):
+        """Determine the endpoint of a storage-systems relative url."""
+        path = url.split("?")[0].split("/")
+        return path[-1] if path[2] == "symbol" or len(path) == 3 else "/".join([path[2], "{id}"] + path[4:])
+
+    def request(self, url, method="GET", data=None, ignore_errors=False, **kwargs):
+        """Respond to a storage pool planning request."""
+        endpoint = self.get_endpoint(url)
+        with self.lock:
+            self.calls[endpoint] += 1
+
+        if endpoint == "drives":
+            return 200, self.drives
+        if endpoint == "storage-pools":
+            return 200, self.storage_pools
+        if endpoint == "volumes":
+            return 200, self.volumes
+        if endpoint == "capabilities":
+            return 200, {"featureParameters": {"maxDCEDrives": 2}}
+        if endpoint == "getSystemAttributeDefaults":
+            return 200, {"defaults": {"diskPoolDefaultAttributes": {"minimumDriveCount": 11}}}
+        if endpoint == "getVolumeCandidates":
+            return 200, self.get_volume_candidates(data)
+        if endpoint in ["getVolumeGroupExpansionCandidates", "getDiskPoolExpansionCandidates"]:
+            return 200, self.get_expansion_candidates(data, disk_pool=endpoint == "getDiskPoolExpansionCandidates")
+        raise Exception("Unexpected request. Url [%s]." % url)
+
+    def get_volume_candidates(self, criteria):
+        """Determine the volume candidates for each drive count from the drives in the request."""
+        requested = set(criteria["candidateSelectionType"]["driveRefList"]["driveRef"])
+        drives = [drive for drive in self.drives if drive["id"] in requested and drive["phyDriveType"] == criteria["phyDriveType"] and
+                  drive["driveMediaType"] == criteria["driveMediaType"]]
+
+        maximum = len(drives) if criteria["raidLevel"] == "raidDiskPool" else min(len(drives), self.RAID_MAXIMUM_DRIVE_COUNT)
+        candidates = list()
+        for count in range(self.RAID_MINIMUM_DRIVE_COUNT[criteria["raidLevel"]], maximum + 1)[:self.candidate_limit]:
+            candidates.append({"raidLevel": criteria["raidLevel"], "driveCount": str(count), "driveMediaType": criteria["driveMediaType"],
+                               "driveRefList": {"driveRef": [drive["id"] for drive in drives[:count]]},
+                               "usableSize": str(sum(int(drive["usableCapacity"]) for drive in drives[:count])),
+                               "trayLossProtection": False, "drawerLossProtection": False})
+        return {"volumeCandidate": candidates}
+
+    def get_expansion_candidates(self, storage_pool_id, disk_pool=False):
+        """Determine the expansion candidates for a storage pool from the available drives of the same media type."""
+        pool = [pool for pool in self.storage_pools if pool["id"] == storage_pool_id][0]
+        drives = [drive for drive in self.drives if drive["available"] and drive["driveMediaType"] == pool["driveMediaType"]]
+
+        candidates = list()
+        for count in range(1, min(len(drives), self.candidate_limit) + 1):
+            expansion = drives[:count] if disk_pool else drives[count - 1:count]
+            candidates.append({"drives": [drive["id"] for drive in expansion],
+                               "usableCapacity": str(sum(int(drive["usableCapacity"]) for drive in expansion))})
+        return {"candidates": candidates}
+
+
+class StoragePoolScaleTest(ModuleTestCase):
+    """Measure storage pool planning in check mode against synthetic storage systems of increasing scale.
+
+    Each scenario asserts the number of requests per endpoint, which must not grow with the drive count.
+    """
+    REQUIRED_PARAMS = {"api_username": "username",
+                       "api_password": "password",
+                       "api_url": "http://localhost/devmgr/v2",
+                       "ssid": "1",
+                       "validate_certs": "no"}
+    NETAPP_REQUEST_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.NetAppESeriesModule.request"
+    DRIVE_COUNTS = [60, 240, 480]
+
+    def _set_args(self, args=None):
+        module_args = self.REQUIRED_PARAMS.copy()
+        if args is not None:
+            module_args.update(args)
+        set_module_args(module_args)
+
+    def _plan(self, storage_system, args):
+        """Apply the module arguments in check mode against the synthetic storage system.
+
+        :return dict, Counter: the module result and requests by endpoint.
+        """
+        self._set_args(args)
+        storagepool = NetAppESeriesStoragePool()
+        storagepool.module.check_mode = True
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            with patch(self.NETAPP_REQUEST_FUNC, side_effect=storage_system.request):
+                storagepool.apply()
+        return result.exception.args[0], storage_system.calls
+
+    def test_plan_new_storage_pools(self):
+        """Verify new storage pools are planned with one candidate request per drive type for each storage pool."""
+        for drive_count in self.DRIVE_COUNTS:
+            pool_count = drive_count // 20
+            storage_system = SyntheticStorageSystem(drive_count=drive_count)
+            result, calls = self._plan(storage_system, {"raid_level": "raid6", "erase_secured_drives": False,
+                                                        "storage_pools": [{"name": "pool%s" % index, "criteria_drive_count": 10}
+                                                                          for index in range(pool_count)]})
+
+            drive_types = len(set(drive["driveMediaType"] for drive in storage_system.drives))
+            self.assertEqual(dict(calls), {"drives": 1, "storage-pools": 1, "getVolumeCandidates": pool_count * drive_types})
+            self.assertTrue(all(entry["changed"] and len(entry["drives"]) == 10 for entry in result["storage_pools"]))
+            self.assertEqual(len(set(drive for entry in result["storage_pools"] for drive in entry["drives"])), pool_count * 10)
+
+    def test_plan_storage_pool_expansions(self):
+        """Verify existing storage pools are planned with a single expansion candidate request for each storage pool."""
+        for drive_count in self.DRIVE_COUNTS:
+            pool_count = drive_count // 20
+            storage_system = SyntheticStorageSystem(drive_count=drive_count, pool_count=pool_count, pool_drive_count=10)
+            result, calls = self._plan(storage_system, {"raid_level": "raid6", "erase_secured_drives": False,
+                                                        "storage_pools": [{"name": "pool%s" % index, "criteria_drive_count": 12}
+                                                                          for index in range(pool_count)]})
+
+            self.assertEqual(dict(calls), {"drives": 1, "storage-pools": 1, "capabilities": 1, "getVolumeGroupExpansionCandidates": pool_count})
+            self.assertTrue(all(entry["changed"] and len(entry["drives"]) == 2 for entry in result["storage_pools"]))
+            self.assertEqual(len(set(drive for entry in result["storage_pools"] for drive in entry["drives"])), pool_count * 2)
+
+    def test_plan_disk_pool_expansion(self):
+        """Verify a disk pool expansion across every available drive is planned with a single candidate request."""
+        for drive_count in self.DRIVE_COUNTS:
+            storage_system = SyntheticStorageSystem(drive_count=drive_count, pool_count=1, pool_drive_count=11, pool_raid_level="raidDiskPool",
+                                                    candidate_limit=drive_count)
+            media_drive_count = len([drive for drive in storage_system.drives if drive["driveMediaType"] == "hdd"])
+            result, calls = self._plan(storage_system, {"state": "present", "name": "pool0", "raid_level": "raidDiskPool",
+                                                        "criteria_drive_count": media_drive_count, "erase_secured_drives": False})
+
+            self.assertTrue(result["changed"])
+            self.assertEqual(dict(calls), {"drives": 1, "storage-pools": 1, "getSystemAttributeDefaults": 1, "getDiskPoolExpansionCandidates": 1})
+
+    def test_plan_mixed_storage_pools(self):
+        """Verify a mix of existing, new and removed storage pools at the largest scale retrieves each collection once."""
+        storage_system = SyntheticStorageSystem(drive_count=max(self.DRIVE_COUNTS), pool_count=12, pool_drive_count=10)
+        storage_pools = [{"name": "pool%s" % index, "criteria_drive_count": 12} for index in range(8)]
+        storage_pools.extend([{"name": "pool%s" % index, "state": "absent"} for index in range(8, 12)])
+        storage_pools.extend([{"name": "new%s" % index, "criteria_drive_count": 6} for index in range(24)])
+        result, calls = self._plan(storage_system, {"raid_level": "raid6", "erase_secured_drives": False, "storage_pools": storage_pools})
+
+        self.assertEqual(dict(calls), {"drives": 1, "storage-pools": 1, "capabilities": 1, "getVolumeGroupExpansionCandidates": 8,
+                                       "getVolumeCandidates": 24 * 2})
+        results = dict((entry["name"], entry) for entry in result["storage_pools"])
+        self.assertTrue(all(results["pool%s" % index]["changed"] for index in range(12)))
+        self.assertEqual(sum(len(entry["drives"]) for entry in result["storage_pools"]), 8 * 2 + 24 * 6)
@@ -3,8 +3,12 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import copy
+from collections import OrderedDict
+
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_volume import NetAppESeriesVolume
-from units.modules.utils import AnsibleFailJson, ModuleTestCase, set_module_args
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import ObjectResolver, VolumeProgressTracker
+from units.modules.utils import AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args
 from units.compat import mock
 
 
@@ -270,19 +274,30 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
 
     def test_get_volume_pass(self):
         """Evaluate the get_volume method."""
-        with mock.patch(self.REQUEST_FUNC,
-                        side_effect=[(200, self.VOLUME_GET_RESPONSE), (200, self.THIN_VOLUME_RESPONSE)]):
+        def fallback_request(path, **kwargs):
+            if "graph/xpath-filter" in path:
+                raise Exception("Unsupported.")
+            return 200, self.VOLUME_GET_RESPONSE if path.endswith("/volumes") else self.THIN_VOLUME_RESPONSE
+
+        with mock.patch(self.REQUEST_FUNC, side_effect=fallback_request):
             self._set_args({"state": "present", "name": "Matthew", "storage_pool_name": "pool", "size": 100})
             volume_object = NetAppESeriesVolume()
             self.assertEqual(volume_object.get_volume(),
                              [entry for entry in self.VOLUME_GET_RESPONSE if entry["name"] == "Matthew"][0])
 
-        with mock.patch(self.REQUEST_FUNC,
-                        side_effect=[(200, self.VOLUME_GET_RESPONSE), (200, self.THIN_VOLUME_RESPONSE)]):
+        with mock.patch(self.REQUEST_FUNC, side_effect=fallback_request):
             self._set_args({"state": "present", "name": "NotAVolume", "storage_pool_name": "pool", "size": 100})
             volume_object = NetAppESeriesVolume()
             self.assertEqual(volume_object.get_volume(), {})
 
+        # graph filtered lookup only retrieves the matching thin volume
+        with mock.patch(self.REQUEST_FUNC, side_effect=[(200, []), (200, [self.THIN_VOLUME_RESPONSE[0]["id"]]),
+                                                        (200, self.THIN_VOLUME_RESPONSE[0])]) as request:
+            self._set_args({"state": "present", "name": "thin_volume", "storage_pool_name": "pool", "size": 100})
+            volume_object = NetAppESeriesVolume()
+            self.assertEqual(volume_object.get_volume(), self.THIN_VOLUME_RESPONSE[0])
+            self.assertEqual(request.call_args_list[2][0][0], "storage-systems/1/thin-volumes/%s" % self.THIN_VOLUME_RESPONSE[0]["id"])
+
     def test_get_volume_fail(self):
         """Evaluate the get_volume exception paths."""
         with self.assertRaisesRegexp(AnsibleFailJson, "Failed to obtain list of thick volumes."):
@@ -292,19 +307,51 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
                 volume_object.get_volume()
 
         with self.assertRaisesRegexp(AnsibleFailJson, "Failed to obtain list of thin volumes."):
-            with mock.patch(self.REQUEST_FUNC, side_effect=[(200, self.VOLUME_GET_RESPONSE), Exception()]):
-                self._set_args({"state": "present", "name": "Matthew", "storage_pool_name": "pool", "size": 100})
+            with mock.patch(self.REQUEST_FUNC, side_effect=[Exception(), (200, self.VOLUME_GET_RESPONSE), Exception()]):
+                self._set_args({"state": "present", "name": "NotAVolume", "storage_pool_name": "pool", "size": 100})
                 volume_object = NetAppESeriesVolume()
                 volume_object.get_volume()
 
+    def test_object_resolver_pass(self):
+        """Ensure the name index is retrieved once when the graph filter is unavailable and rebuilt after invalidation."""
+        requests = []
+
+        def request(path):
+            requests.append(path)
+            if "graph/xpath-filter" in path:
+                return 404, {"errorMessage": "Unsupported."}
+            return 200, self.STORAGE_POOL_GET_RESPONSE
+
+        resolver = ObjectResolver(request, "1")
+        self.assertEqual(resolver.resolve("storage_pool", "employee_data_storage_pool"), self.STORAGE_POOL_GET_RESPONSE[0])
+        self.assertEqual(resolver.resolve("storage_pool", "database_storage_pool"), self.STORAGE_POOL_GET_RESPONSE[1])
+        self.assertEqual(resolver.resolve("storage_pool", "NotAStoragePool"), None)
+        self.assertEqual(requests, ["storage-systems/1/graph/xpath-filter?query=/volumeGroup%5Blabel%3D%27employee_data_storage_pool%27%5D/volumeGroupRef",
+                                    "storage-systems/1/storage-pools"])
+
+        resolver.invalidate()
+        resolver.resolve("storage_pool", "database_storage_pool")
+        self.assertEqual(requests.count("storage-systems/1/storage-pools"), 2)
+
+    def _long_lived_operations_request(self, operations, events=None):
+        """Create a request side effect that returns the long-lived operations in order and the storage system events."""
+        operations = list(operations)
+
+        def request(path, **kwargs):
+            if path.startswith("storage-systems/1/events"):
+                return 200, events if events is not None else []
+            return 200, operations.pop(0)
+        return request
+
     def tests_wait_for_volume_availability_pass(self):
         """Ensure wait_for_volume_availability completes as expected."""
         self._set_args({"state": "present", "name": "NewVolume", "storage_pool_name": "employee_data_storage_pool", "size": 100,
                         "wait_for_initialization": True})
         volume_object = NetAppESeriesVolume()
         with mock.patch(self.SLEEP_FUNC, return_value=None):
-            with mock.patch(self.GET_VOLUME_FUNC, side_effect=[False, False, True]):
-                volume_object.wait_for_volume_availability()
+            with mock.patch(self.REQUEST_FUNC, side_effect=self._long_lived_operations_request([])):
+                with mock.patch(self.GET_VOLUME_FUNC, side_effect=[False, False, True]):
+                    volume_object.wait_for_volume_availability()
 
     def tests_wait_for_volume_availability_fail(self):
         """Ensure wait_for_volume_availability throws the expected exceptions."""
@@ -314,7 +361,8 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
         volume_object.get_volume = lambda: False
         with self.assertRaisesRegexp(AnsibleFailJson, "Timed out waiting for the volume"):
             with mock.patch(self.SLEEP_FUNC, return_value=None):
-                volume_object.wait_for_volume_availability()
+                with mock.patch(self.REQUEST_FUNC, return_value=Exception()):
+                    volume_object.wait_for_volume_availability()
 
     def tests_wait_for_volume_action_pass(self):
         """Ensure wait_for_volume_action completes as expected."""
@@ -324,10 +372,7 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
         volume_object.volume_detail = {"id": "02000000600A098000A4B9D1000037315D494C6F",
                                        "storageVolumeRef": "02000000600A098000A4B9D1000037315DXXXXXX"}
         with mock.patch(self.SLEEP_FUNC, return_value=None):
-            with mock.patch(self.REQUEST_FUNC, side_effect=[(200, self.GET_LONG_LIVED_OPERATION_RESPONSE[0]),
-                                                            (200, self.GET_LONG_LIVED_OPERATION_RESPONSE[1]),
-                                                            (200, self.GET_LONG_LIVED_OPERATION_RESPONSE[2]),
-                                                            (200, self.GET_LONG_LIVED_OPERATION_RESPONSE[3])]):
+            with mock.patch(self.REQUEST_FUNC, side_effect=self._long_lived_operations_request(self.GET_LONG_LIVED_OPERATION_RESPONSE)):
                 volume_object.wait_for_volume_action()
 
         self._set_args({"state": "present", "name": "NewVolume", "storage_pool_name": "employee_data_storage_pool", "size": 100,
@@ -336,10 +381,8 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
         volume_object.volume_detail = {"id": "02000000600A098000A4B9D1000037315DXXXXXX",
                                        "storageVolumeRef": "02000000600A098000A4B9D1000037315D494C6F"}
         with mock.patch(self.SLEEP_FUNC, return_value=None):
-            with mock.patch(self.REQUEST_FUNC, side_effect=[(200, self.GET_LONG_LIVED_OPERATION_RESPONSE[0]),
-                                                            (200, self.GET_LONG_LIVED_OPERATION_RESPONSE[1]),
-                                                            (200, self.GET_LONG_LIVED_OPERATION_RESPONSE[2]),
-                                                            (200, self.GET_LONG_LIVED_OPERATION_RESPONSE[3])]):
+            with mock.patch(self.REQUEST_FUNC, side_effect=self._long_lived_operations_request(self.GET_LONG_LIVED_OPERATION_RESPONSE,
+                                                                                               [{"eventNumber": "1"}])):
                 volume_object.wait_for_volume_action()
 
     def tests_wait_for_volume_action_fail(self):
@@ -358,6 +401,25 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
                 with mock.patch(self.REQUEST_FUNC, return_value=(200, self.GET_LONG_LIVED_OPERATION_RESPONSE[0])):
                     volume_object.wait_for_volume_action(timeout=300)
 
+    def test_volume_progress_tracker_pass(self):
+        """Ensure a single progress tracker follows many volumes with one request per progress check."""
+        self._set_args({"state": "present", "name": "NewVolume", "storage_pool_name": "employee_data_storage_pool", "size": 100})
+        volume_object = NetAppESeriesVolume()
+        tracker = VolumeProgressTracker(volume_object)
+        tracker.watch({"id": "02000000600A098000A4B9D1000037315D494C6F"})
+        tracker.watch({"id": "02000000600A098000A4B28D00003D2C5DXXXXXX", "storageVolumeRef": "02000000600A098000A4B28D00003D2C5D494C87"})
+
+        request = self._long_lived_operations_request(self.GET_LONG_LIVED_OPERATION_RESPONSE, [{"eventNumber": "5"}])
+        with mock.patch(self.SLEEP_FUNC, return_value=None):
+            with mock.patch(self.REQUEST_FUNC, side_effect=request) as request_mock:
+                progress = tracker.wait()
+
+        self.assertEqual(dict((volume_id, entry["action"]) for volume_id, entry in progress.items()),
+                         {"02000000600A098000A4B9D1000037315D494C6F": "complete", "02000000600A098000A4B28D00003D2C5DXXXXXX": "complete"})
+        operation_requests = [call for call in request_mock.call_args_list if "getLongLivedOpsProgress" in call[0][0]]
+        self.assertEqual(len(operation_requests), 4)
+        self.assertEqual(tracker.last_known_event, 5)
+
     def test_get_storage_pool_pass(self):
         """Evaluate the get_storage_pool method."""
         with mock.patch(self.REQUEST_FUNC, return_value=(200, self.STORAGE_POOL_GET_RESPONSE)):
@@ -484,6 +546,29 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
             with mock.patch(self.REQUEST_FUNC, side_effect=[(200, self.WORKLOAD_GET_RESPONSE), Exception()]):
                 volume_object.update_workload_tags()
 
+    def test_reconcile_workloads_pass(self):
+        """Validate workload tags are reconciled together from a single retrieval of the storage array workload tags."""
+        self._set_args({"state": "present", "name": "Matthew", "storage_pool_name": "pool", "size": 100,
+                        "workload_name": "newWorkload", "metadata": {"for_testing": "yes"}})
+        volume_object = NetAppESeriesVolume()
+        with mock.patch(self.REQUEST_FUNC, side_effect=[(200, copy.deepcopy(self.WORKLOAD_GET_RESPONSE)), (200, {"id": "4200000005"})]) as request:
+            self.assertTrue(volume_object.update_workload_tags(check_mode=True))
+            self.assertTrue(volume_object.update_workload_tags())
+            self.assertFalse(volume_object.update_workload_tags(check_mode=True))
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(volume_object.workload_id, "4200000005")
+
+        workloads = OrderedDict([("employee_data", None),
+                                 ("customer_database", [{"key": "use", "value": "customer_information"}]),
+                                 ("newWorkload", [{"key": "for_testing", "value": "yes"}])])
+        with mock.patch(self.REQUEST_FUNC, side_effect=[(200, {}), (200, {"id": "4200000005"})]) as request:
+            change, workload_ids = volume_object.reconcile_workloads(workloads, copy.deepcopy(self.WORKLOAD_GET_RESPONSE))
+        self.assertTrue(change)
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(workload_ids, {"employee_data": "4200000002000000000000000000000000000000",
+                                        "customer_database": "4200000003000000000000000000000000000000",
+                                        "newWorkload": "4200000005"})
+
     def test_get_volume_property_changes_pass(self):
         """Verify correct dictionary is returned"""
 
@@ -693,6 +778,30 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
         with mock.patch(self.REQUEST_FUNC, return_value=(200, {})):
             volume_object.create_volume()
 
+    def test_create_volume_properties_pass(self):
+        """Verify properties accepted by the creation request do not require a subsequent update request."""
+        self._set_args({"state": "present", "name": "Matthew", "storage_pool_name": "pool", "size": 100, "owning_controller": "B",
+                        "workload_name": "employee_data", "volume_metadata": {"owner": "hr"}})
+        volume_object = NetAppESeriesVolume()
+        volume_object.pool_detail = {"id": "12345", "freeSpace": str(1024 ** 4), "diskPool": True}
+        volume_object.workload_id = "4200000002000000000000000000000000000000"
+        volume_object.workload_reconciled = True
+        requests = []
+
+        def request(path, method="GET", data=None, **kwargs):
+            requests.append((method, path, data))
+            return 200, {"id": "02000000600A098000A4B9D100000F095C2F7F31", "segmentSize": 131072, "flashCached": False,
+                         "preferredManager": data["owningControllerId"], "metadata": data["metaTags"], "thinProvisioned": False,
+                         "cacheSettings": {"readCacheEnable": True, "writeCacheEnable": True, "readAheadMultiplier": 1, "cwob": False}}
+
+        with mock.patch(self.REQUEST_FUNC, side_effect=request):
+            self.assertEqual(volume_object.apply_change(), "Volume [Matthew] has been created.")
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0][2]["owningControllerId"], "070000000000000000000002")
+        self.assertEqual(requests[0][2]["metaTags"], [{"key": "owner~0", "value": "hr"},
+                                                      {"key": "workloadId", "value": "4200000002000000000000000000000000000000"},
+                                                      {"key": "volumeTypeId", "value": "volume"}])
+
     def test_create_volume_fail(self):
         """Verify exceptions thrown."""
         self._set_args(
@@ -862,3 +971,251 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
         with self.assertRaisesRegexp(AnsibleFailJson, "Failed to delete thin volume."):
             with mock.patch(self.REQUEST_FUNC, return_value=Exception()):
                 volume_object.delete_volume()
+
+    def test_apply_volumes_pass(self):
+        """Verify a list of volumes is reconciled from a single retrieval of the storage array state."""
+        created_volume = {"id": "02000000600A098000A4B9D100000F105C2F7F55", "name": "NewVolume", "segmentSize": 131072,
+                          "flashCached": False, "metadata": [], "preferredManager": "070000000000000000000001",
+                          "thinProvisioned": False, "capacity": str(100 * 1024 ** 3),
+                          "cacheSettings": {"readCacheEnable": True, "writeCacheEnable": True, "readAheadMultiplier": 1, "cwob": False}}
+        requests = []
+
+        def request(path, method="GET", data=None, **kwargs):
+            requests.append((method, path))
+            if method == "GET" and path.endswith("/thin-volumes"):
+                return 200, self.THIN_VOLUME_RESPONSE
+            elif method == "GET" and path.endswith("/volumes"):
+                return 200, self.VOLUME_GET_RESPONSE
+            elif method == "GET" and path.endswith("/storage-pools"):
+                return 200, self.STORAGE_POOL_GET_RESPONSE
+            elif method == "POST" and path.endswith("/volumes"):
+                return 200, created_volume
+            return 200, {}
+
+        self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 100,
+                        "volumes": [{"name": "Matthew", "state": "absent"}, {"name": "NewVolume"}, {"name": "Micah", "state": "absent"},
+                                    {"name": "Mark", "storage_pool_name": "missing_pool"}]})
+        volume_object = NetAppESeriesVolume()
+        with self.assertRaisesRegexp(AnsibleFailJson, r"Failed to reconcile volumes \[Mark\]") as result:
+            with mock.patch(self.REQUEST_FUNC, side_effect=request):
+                volume_object.apply()
+
+        results = dict((volume["name"], volume) for volume in result.exception.args[0]["volumes"])
+        self.assertTrue(results["Matthew"]["changed"])
+        self.assertTrue(results["NewVolume"]["changed"])
+        self.assertEqual(results["NewVolume"]["msg"], "Volume [NewVolume] has been created.")
+        self.assertEqual([(operation["name"], operation["action"], operation["volume_ref"]) for operation in result.exception.args[0]["operations"]],
+                         [("NewVolume", "create", created_volume["id"])])
+        self.assertTrue(results["Mark"]["failed"])
+        self.assertEqual(requests.count(("GET", "storage-systems/1/volumes")), 1)
+        self.assertEqual(requests.count(("GET", "storage-systems/1/storage-pools")), 1)
+        self.assertEqual(len([request for request in requests if request[0] == "DELETE"]), 2)
+
+    def test_plan_volumes_pass(self):
+        """Verify the change plan is determined from a storage array snapshot without contacting the storage array."""
+        volumes = dict((volume["name"], volume) for volume in copy.deepcopy(self.VOLUME_GET_RESPONSE))
+        volumes["Matthew"]["cacheSettings"]["cwob"] = False
+        array_state = dict(volumes=volumes, workload_tags=copy.deepcopy(self.WORKLOAD_GET_RESPONSE), graph=dict(),
+                           storage_pools=dict((storage_pool["name"], storage_pool) for storage_pool in self.STORAGE_POOL_GET_RESPONSE))
+        self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 100,
+                        "volumes": [{"name": "NewVolume"}, {"name": "Micah", "state": "absent"}, {"name": "Missing", "state": "absent"}]})
+        volume_object = NetAppESeriesVolume()
+        with mock.patch(self.REQUEST_FUNC, side_effect=Exception("unexpected request")) as request:
+            plan = volume_object.plan_volumes(array_state)
+        self.assertEqual(request.call_count, 0)
+
+        self.assertTrue(plan["change"])
+        self.assertEqual([context.name for context in plan["contexts"]], ["NewVolume"])
+        self.assertEqual(plan["results"]["NewVolume"]["plan"]["action"], "create")
+        self.assertEqual(plan["results"]["NewVolume"]["plan"]["create"]["path"], "storage-systems/1/volumes")
+        self.assertEqual(plan["results"]["NewVolume"]["plan"]["create"]["body"]["size"], 100 * 1024 ** 3)
+        self.assertEqual(plan["results"]["Micah"]["plan"]["action"], "delete")
+        self.assertEqual(plan["results"]["Micah"]["plan"]["delete"]["dependencies"], [])
+        self.assertEqual(plan["results"]["Missing"]["plan"]["action"], None)
+        self.assertEqual(list(plan["deletion_tasks"].keys()), [("volume", volumes["Micah"]["id"])])
+
+        self._set_args({"state": "present", "name": "Matthew", "storage_pool_name": "employee_data_storage_pool", "size": 300,
+                        "_ansible_check_mode": True})
+        volume_object = NetAppESeriesVolume()
+        volume_object.get_volume = lambda: copy.deepcopy(volumes["Matthew"])
+        volume_object.get_storage_pool = lambda: self.STORAGE_POOL_GET_RESPONSE[0]
+        with self.assertRaises(AnsibleExitJson) as result:
+            with mock.patch(self.REQUEST_FUNC, side_effect=Exception("unexpected request")):
+                volume_object.apply()
+        self.assertEqual(result.exception.args[0]["plan"]["action"], "update")
+        self.assertEqual(result.exception.args[0]["plan"]["expand"]["body"], {"sizeUnit": "bytes", "expansionSize": 300 * 1024 ** 3})
+
+    def test_check_capacity_pass(self):
+        """Verify volume creations and expansions are allocated together against each storage pool's free capacity."""
+        array_state = dict(volumes=dict(), workload_tags=list(), graph=dict(),
+                           storage_pools=dict((storage_pool["name"], storage_pool) for storage_pool in self.STORAGE_POOL_GET_RESPONSE))
+        self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 700,
+                        "volumes": [{"name": "NewVolume1"}, {"name": "NewVolume2"}, {"name": "NewVolume3", "storage_pool_name": "database_storage_pool",
+                                                                                   "size": 100}]})
+        volume_object = NetAppESeriesVolume()
+        plan = volume_object.plan_volumes(array_state)
+        self.assertRegexpMatches(plan["results"]["NewVolume1"]["msg"], "Not enough storage pool free space available for all volume creations")
+        self.assertTrue(plan["results"]["NewVolume2"]["failed"])
+        self.assertFalse(plan["results"]["NewVolume3"]["failed"])
+        self.assertEqual([context.name for context in plan["contexts"]], ["NewVolume3"])
+
+        self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 700,
+                        "volumes": [{"name": "NewVolume1"}, {"name": "NewThinVolume", "thin_provision": True, "size": 2000, "thin_volume_repo_size": 32,
+                                                              "thin_volume_max_repo_size": 1000, "thin_volume_expansion_policy": "automatic"}]})
+        volume_object = NetAppESeriesVolume()
+        with mock.patch.object(volume_object.module, "warn") as warn:
+            plan = volume_object.plan_volumes(array_state)
+        self.assertEqual([context.name for context in plan["contexts"]], ["NewVolume1", "NewThinVolume"])
+        self.assertEqual(warn.call_count, 1)
+        self.assertIn("cannot accommodate every thin volume repository", warn.call_args[0][0])
+
+        self._set_args({"storage_pool_name": "database_storage_pool", "size": 100, "volumes": [{"name": "NewThinVolume", "thin_provision": True,
+                                                                                               "thin_volume_repo_size": 32}]})
+        volume_object = NetAppESeriesVolume()
+        plan = volume_object.plan_volumes(array_state)
+        self.assertEqual(plan["results"]["NewThinVolume"]["msg"], "Thin provisioned volumes can only be created on raid disk pools.")
+
+    def test_delete_volumes_pass(self):
+        """Verify dependent objects are deleted before their volumes and are otherwise reported."""
+        matthew = "02000000600A098000A4B9D100000F095C2F7F31"
+        micah = "02000000600A098000A4B9D100000F0B5C2F7F40"
+        graph = {"storagePoolBundle": {"lunMapping": [{"lunMappingRef": "880000000001", "volumeRef": matthew},
+                                                      {"lunMappingRef": "880000000002", "volumeRef": "0200000000000000000000000000000000000000"}]},
+                 "volumeCopy": [{"volcopyRef": "180000000001", "sourceVolume": micah, "targetVolume": "0200000000000000000000000000000000000000"}],
+                 "highLevelVolBundle": {"pitView": [{"viewRef": "350000000001", "baseVol": matthew}],
+                                        "pitGroup": [{"pitGroupRef": "330000000001", "baseVolume": matthew}],
+                                        "asyncMirrorGroupMember": [{"memberRef": "8B0000000001", "mirrorGroup": "8A0000000001", "localVolumeRef": micah}]}}
+        requests = []
+
+        def request(path, method="GET", data=None, **kwargs):
+            requests.append((method, path))
+            if method == "GET" and path.endswith("/thin-volumes"):
+                return 200, self.THIN_VOLUME_RESPONSE
+            elif method == "GET" and path.endswith("/volumes"):
+                return 200, self.VOLUME_GET_RESPONSE
+            elif method == "GET" and path.endswith("/storage-pools"):
+                return 200, self.STORAGE_POOL_GET_RESPONSE
+            elif method == "GET" and path.endswith("/graph"):
+                return 200, graph
+            return 200, {}
+
+        self._set_args({"volumes": [{"name": "Matthew", "state": "absent"}, {"name": "Micah", "state": "absent"}]})
+        volume_object = NetAppESeriesVolume()
+        with self.assertRaisesRegexp(AnsibleFailJson, r"Failed to reconcile volumes \[Matthew, Micah\]") as result:
+            with mock.patch(self.REQUEST_FUNC, side_effect=request):
+                volume_object.apply()
+        results = dict((volume["name"], volume) for volume in result.exception.args[0]["volumes"])
+        self.assertIn("lun_mapping, snapshot_group, snapshot_volume", results["Matthew"]["msg"])
+        self.assertIn("mirror_group_member, volume_copy_pair", results["Micah"]["msg"])
+        self.assertEqual([request for request in requests if request[0] == "DELETE"], [])
+
+        requests = []
+        self._set_args({"volumes": [{"name": "Matthew", "state": "absent"}, {"name": "Micah", "state": "absent"}], "delete_dependencies": True})
+        volume_object = NetAppESeriesVolume()
+        with self.assertRaises(AnsibleExitJson) as result:
+            with mock.patch(self.REQUEST_FUNC, side_effect=request):
+                volume_object.apply()
+        deletions = [request[1] for request in requests if request[0] == "DELETE"]
+        self.assertEqual(len(deletions), 7)
+        self.assertEqual(requests.count(("GET", "storage-systems/1/graph")), 1)
+        self.assertLess(deletions.index("storage-systems/1/volume-mappings/880000000001"), deletions.index("storage-systems/1/volumes/%s" % matthew))
+        self.assertLess(deletions.index("storage-systems/1/snapshot-volumes/350000000001"), deletions.index("storage-systems/1/snapshot-groups/330000000001"))
+        self.assertLess(deletions.index("storage-systems/1/snapshot-groups/330000000001"), deletions.index("storage-systems/1/volumes/%s" % matthew))
+        self.assertLess(deletions.index("storage-systems/1/volume-copy-jobs/180000000001"), deletions.index("storage-systems/1/volumes/%s" % micah))
+        self.assertLess(deletions.index("storage-systems/1/async-mirrors/8A0000000001/pairs/8B0000000001"),
+                        deletions.index("storage-systems/1/volumes/%s" % micah))
+        self.assertNotIn("storage-systems/1/volume-mappings/880000000002", deletions)
+        self.assertEqual(len(result.exception.args[0]["deleted_objects"]), 7)
+
+    def test_apply_volumes_fail(self):
+        """Verify volume list entries are validated before the storage array is contacted."""
+        self._set_args({"volumes": [{"name": "vol1", "storage_pool_name": "pool", "size": 100}, {"name": "vol1", "state": "absent"}]})
+        with self.assertRaisesRegexp(AnsibleFailJson, "Volume names must be unique"):
+            NetAppESeriesVolume()
+
+        self._set_args({"volumes": [{"name": "vol1", "storage_pool_name": "pool"}]})
+        with self.assertRaisesRegexp(AnsibleFailJson, "Both storage_pool_name and size are required when state is present"):
+            NetAppESeriesVolume()
+
+        self._set_args({"volumes": [{"name": "vol1", "storage_pool_name": "pool", "size": 100, "thin_provision": True}]})
+        with self.assertRaisesRegexp(AnsibleFailJson, r"thin_volume_repo_size is required when thin_provision is true. Volume \[vol1\]"):
+            NetAppESeriesVolume()
+
+    def test_expand_volumes_pass(self):
+        """Verify volume list expansions are limited per storage pool and verified against the storage pool capacity first."""
+        volumes = [{"id": "02000000600A098000A4B9D10000000%s5C2F7F31" % index, "name": "vol%s" % index, "segmentSize": 131072, "flashCached": False,
+                    "metadata": [], "thinProvisioned": False, "capacity": str(100 * 1024 ** 3), "totalSizeInBytes": str(100 * 1024 ** 3),
+                    "volumeGroupRef": "04000000600A098000A4B9D100000F085C2F7F26",
+                    "cacheSettings": {"readCacheEnable": True, "writeCacheEnable": True, "readAheadMultiplier": 1, "cwob": False}}
+                   for index in range(3)]
+        requests = []
+
+        def request(path, method="GET", data=None, **kwargs):
+            requests.append((method, path))
+            if path.endswith("/thin-volumes"):
+                return 200, []
+            elif path.endswith("/volumes"):
+                return 200, volumes
+            elif path.endswith("/storage-pools"):
+                return 200, self.STORAGE_POOL_GET_RESPONSE
+            elif path.endswith("getLongLivedOpsProgress"):
+                return 200, {"longLivedOpsProgress": []}
+            return 200, {}
+
+        self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 200, "expansion_concurrency": 1,
+                        "volumes": [{"name": "vol0"}, {"name": "vol1"}, {"name": "vol2"}]})
+        volume_object = NetAppESeriesVolume()
+        with self.assertRaisesRegexp(AnsibleExitJson, "Reconciled 3 volumes."):
+            with mock.patch(self.REQUEST_FUNC, side_effect=request):
+                volume_object.apply()
+        expansions = [path for method, path in requests if path.endswith("/expand")]
+        self.assertEqual(len(expansions), 3)
+        self.assertEqual(len([path for method, path in requests if path.endswith("getLongLivedOpsProgress")]), 2)
+
+        # all expansions in the storage pool are rejected when the storage pool cannot satisfy them together
+        requests = []
+        self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 600,
+                        "volumes": [{"name": "vol0"}, {"name": "vol1"}, {"name": "vol2"}]})
+        volume_object = NetAppESeriesVolume()
+        with self.assertRaisesRegexp(AnsibleFailJson, r"Failed to reconcile volumes \[vol0, vol1, vol2\]"):
+            with mock.patch(self.REQUEST_FUNC, side_effect=request):
+                volume_object.apply()
+        self.assertFalse([method for method, path in requests if method != "GET"])
+
+    def test_expand_volumes_fail(self):
+        """Verify queued volume list expansions fail once the expansions in progress exceed expansion_timeout."""
+        volumes = [{"id": "02000000600A098000A4B9D10000000%s5C2F7F31" % index, "name": "vol%s" % index, "segmentSize": 131072, "flashCached": False,
+                    "metadata": [], "thinProvisioned": False, "capacity": str(100 * 1024 ** 3), "totalSizeInBytes": str(100 * 1024 ** 3),
+                    "volumeGroupRef": "04000000600A098000A4B9D100000F085C2F7F26",
+                    "cacheSettings": {"readCacheEnable": True, "writeCacheEnable": True, "readAheadMultiplier": 1, "cwob": False}}
+                   for index in range(2)]
+        operations = {"longLivedOpsProgress": [{"volAction": "expanding", "reconstruct": None, "volExpansion": {"volumeRef": volumes[0]["id"],
+                                                                                                                "percentComplete": 10}}]}
+        requests = []
+
+        def request(path, method="GET", data=None, **kwargs):
+            requests.append((method, path))
+            if path.endswith("/thin-volumes"):
+                return 200, []
+            elif path.endswith("/volumes"):
+                return 200, volumes
+            elif path.endswith("/storage-pools"):
+                return 200, self.STORAGE_POOL_GET_RESPONSE
+            elif path.endswith("getLongLivedOpsProgress"):
+                return 200, operations
+            elif "/events" in path:
+                raise Exception("events unavailable")
+            return 200, {}
+
+        self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 200, "expansion_concurrency": 1, "expansion_timeout": 10,
+                        "volumes": [{"name": "vol0"}, {"name": "vol1"}]})
+        volume_object = NetAppESeriesVolume()
+        with self.assertRaisesRegexp(AnsibleFailJson, r"Timed out waiting for volume expansions to complete.*Queued \[vol1\]") as result:
+            with mock.patch(self.REQUEST_FUNC, side_effect=request):
+                with mock.patch(self.SLEEP_FUNC, return_value=None) as sleep:
+                    volume_object.apply()
+        self.assertTrue(result.exception.args[0]["changed"])
+        results = dict((volume["name"], volume) for volume in result.exception.args[0]["volumes"])
+        self.assertEqual(results["vol0"]["progress"], {"action": "expanding", "percent_complete": 10})
+        self.assertEqual(len([path for method, path in requests if path.endswith("/expand")]), 1)
+        self.assertEqual(sum([call[0][0] for call in sleep.call_args_list]), 12)
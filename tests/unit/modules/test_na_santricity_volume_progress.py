@@ -0,0 +1,59 @@
+# (c) 2020, NetApp, Inc
+# BSD-3 Clause (see COPYING or https://opensource.org/licenses/BSD-3-Clause)
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_volume_progress import NetAppESeriesVolumeProgress
+from units.modules.utils import AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args
+from units.compat import mock
+
+
+class NetAppESeriesVolumeProgressTest(ModuleTestCase):
+    REQUIRED_PARAMS = {"api_username": "username",
+                       "api_password": "password",
+                       "api_url": "http://localhost/devmgr/v2",
+                       "ssid": "1",
+                       "validate_certs": "no"}
+    REQUEST_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_volume_progress.NetAppESeriesVolumeProgress.request"
+    OPERATIONS = [{"ssid": "1", "volume_ref": "02000000600A098000A4B9D1000037315D494C6F", "name": "volume1", "action": "create", "start_time": 1000},
+                  {"ssid": "1", "volume_ref": "02000000600A098000A4B28D00003D2C5D494C87", "name": "volume2", "action": "expand", "start_time": 1000},
+                  {"ssid": "2", "volume_ref": "02000000600A098000A4B28D00003D2C5D494C99", "name": "volume3", "action": "create", "start_time": 1000}]
+    LONG_LIVED_OPERATION_RESPONSE = {
+        "returnCode": "ok",
+        "longLivedOpsProgress": [
+            {"volAction": "initializing", "reconstruct": None, "volExpansion": None, "volAndCapExpansion": None,
+             "init": {"volumeRef": "02000000600A098000A4B9D1000037315D494C6F", "pending": False, "percentComplete": 42, "timeToCompletion": 20},
+             "format": None, "volCreation": None, "volDeletion": None}]}
+
+    def _set_args(self, args=None):
+        module_args = self.REQUIRED_PARAMS.copy()
+        if args is not None:
+            module_args.update(args)
+        set_module_args(module_args)
+
+    def test_apply_pass(self):
+        """Verify the progress of every operation handle for the storage system is reported from a single request."""
+        self._set_args({"operations": self.OPERATIONS})
+        progress = NetAppESeriesVolumeProgress()
+        with self.assertRaises(AnsibleExitJson) as result:
+            with mock.patch(self.REQUEST_FUNC, return_value=(200, self.LONG_LIVED_OPERATION_RESPONSE)) as request:
+                progress.apply()
+        self.assertEqual(request.call_count, 1)
+        self.assertFalse(result.exception.args[0]["changed"])
+        self.assertFalse(result.exception.args[0]["complete"])
+
+        operations = dict((operation["name"], operation) for operation in result.exception.args[0]["operations"])
+        self.assertEqual(sorted(operations.keys()), ["volume1", "volume2"])
+        self.assertEqual(operations["volume1"]["current_action"], "initializing")
+        self.assertEqual(operations["volume1"]["percent_complete"], 42)
+        self.assertFalse(operations["volume1"]["complete"])
+        self.assertTrue(operations["volume2"]["complete"])
+        self.assertTrue(operations["volume2"]["elapsed_seconds"] > 0)
+
+    def test_apply_fail(self):
+        """Verify a failure to retrieve the operation progress is reported."""
+        self._set_args({"operations": self.OPERATIONS})
+        progress = NetAppESeriesVolumeProgress()
+        with self.assertRaisesRegexp(AnsibleFailJson, "Failed to get volume operation progress."):
+            with mock.patch(self.REQUEST_FUNC, return_value=Exception()):
+                progress.apply()